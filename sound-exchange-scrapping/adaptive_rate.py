@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+🎵 Adaptive Rate - SoundExchange
+================================
+
+Control adaptativo (AIMD) de concurrencia y ritmo de peticiones.
+
+Mientras la latencia y la tasa de éxito se mantienen sanas, el controlador
+sube la concurrencia y baja el delay de forma aditiva. Ante un 429, cualquier
+5xx, un desafío de Cloudflare, un timeout o un pico de latencia, reduce la
+concurrencia y aumenta el delay de forma multiplicativa. Las demás respuestas
+que no son 2xx no cuentan como éxito. Así las corridas en
+lote se acercan solas al máximo ritmo sostenible sin ajustar `--delay` a mano.
+"""
+
+import time
+import threading
+from contextlib import contextmanager
+import logging
+from typing import Dict, Optional
+
+from config import ADAPTIVE_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# Códigos HTTP que indican que SoundExchange está limitando el ritmo (además de cualquier 5xx)
+THROTTLE_STATUS_CODES = (429,)
+
+
+def is_overload_status(status_code: Optional[int]) -> bool:
+    """True si la respuesta indica que el servidor limita el ritmo o está sobrecargado (429 o 5xx)"""
+    return status_code is not None and (status_code in THROTTLE_STATUS_CODES or status_code >= 500)
+
+
+class AIMDController:
+    """Controlador de concurrencia y delay con aumento aditivo y reducción multiplicativa"""
+    
+    def __init__(self, initial_delay: float = ADAPTIVE_CONFIG['initial_delay'],
+                 min_delay: float = ADAPTIVE_CONFIG['min_delay'],
+                 max_delay: float = ADAPTIVE_CONFIG['max_delay'],
+                 max_concurrency: int = ADAPTIVE_CONFIG['max_concurrency'],
+                 delay_step: float = ADAPTIVE_CONFIG['delay_step'],
+                 decrease_factor: float = ADAPTIVE_CONFIG['decrease_factor'],
+                 successes_per_increase: int = ADAPTIVE_CONFIG['successes_per_increase'],
+                 latency_spike_factor: float = ADAPTIVE_CONFIG['latency_spike_factor'],
+                 min_spike_latency: float = ADAPTIVE_CONFIG['min_spike_latency'],
+                 cooldown: float = ADAPTIVE_CONFIG['cooldown']):
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.max_concurrency = max_concurrency
+        self.delay_step = delay_step
+        self.decrease_factor = decrease_factor
+        self.successes_per_increase = successes_per_increase
+        self.latency_spike_factor = latency_spike_factor
+        self.min_spike_latency = min_spike_latency
+        self.cooldown = cooldown
+        
+        self.delay = min(max(initial_delay, min_delay), max_delay)
+        self.concurrency = 1
+        self.in_flight = 0
+        self.latency_ewma: Optional[float] = None
+        
+        self._condition = threading.Condition()
+        self._next_start = 0.0
+        self._streak = 0
+        self._last_decrease = 0.0
+        
+        # Métricas acumuladas
+        self.requests = 0
+        self.successes = 0
+        self.throttled = 0
+        self.challenges = 0
+        self.errors = 0
+        self.latency_spikes = 0
+        self.increases = 0
+        self.decreases = 0
+    
+    @contextmanager
+    def slot(self):
+        """Espera un lugar libre y el turno según el delay actual"""
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                if self.in_flight < self.concurrency and now >= self._next_start:
+                    break
+                timeout = max(self._next_start - now, 0) if self.in_flight < self.concurrency else None
+                self._condition.wait(timeout)
+            self.in_flight += 1
+            self._next_start = time.monotonic() + self.delay
+        try:
+            yield
+        finally:
+            with self._condition:
+                self.in_flight -= 1
+                self._condition.notify_all()
+    
+    def record(self, latency: float, status_code: Optional[int] = None,
+               challenge: bool = False, error: bool = False):
+        """Registra el resultado de una petición y ajusta concurrencia y delay"""
+        with self._condition:
+            self.requests += 1
+            
+            spike = (
+                self.latency_ewma is not None
+                and latency > self.min_spike_latency
+                and latency > self.latency_ewma * self.latency_spike_factor
+            )
+            
+            if challenge:
+                self.challenges += 1
+                self._decrease('desafío Cloudflare')
+            elif is_overload_status(status_code):
+                self.throttled += 1
+                self._decrease(f'HTTP {status_code}')
+            elif error:
+                self.errors += 1
+                self._decrease('error/timeout')
+            elif status_code is not None and not 200 <= status_code < 300:
+                # Un 403/404 no indica sobrecarga, pero tampoco es una respuesta sana
+                self.errors += 1
+                self._streak = 0
+            elif spike:
+                self.latency_spikes += 1
+                self._decrease(f'pico de latencia ({latency:.2f}s)')
+            else:
+                self.successes += 1
+                self._streak += 1
+                if self._streak >= self.successes_per_increase:
+                    self._increase()
+                    
+            # La latencia de referencia solo se alimenta con respuestas 2xx completas
+            healthy = status_code is None or 200 <= status_code < 300
+            if healthy and not challenge and not error and not spike:
+                self.latency_ewma = latency if self.latency_ewma is None else 0.8 * self.latency_ewma + 0.2 * latency
+                
+            self._condition.notify_all()
+    
+    def _increase(self):
+        """Aumento aditivo: un lugar más de concurrencia y un paso menos de delay"""
+        self._streak = 0
+        changed = False
+        if self.concurrency < self.max_concurrency:
+            self.concurrency += 1
+            changed = True
+        if self.delay > self.min_delay:
+            self.delay = max(self.min_delay, self.delay - self.delay_step)
+            changed = True
+        if changed:
+            self.increases += 1
+            logger.debug(f"📈 Ritmo aumentado: concurrencia {self.concurrency}, delay {self.delay:.2f}s")
+    
+    def _decrease(self, reason: str):
+        """Reducción multiplicativa, como máximo una vez por período de enfriamiento"""
+        self._streak = 0
+        now = time.monotonic()
+        if now - self._last_decrease < self.cooldown:
+            return
+        self._last_decrease = now
+        self.concurrency = max(1, int(self.concurrency * self.decrease_factor))
+        self.delay = min(self.max_delay, self.delay / self.decrease_factor)
+        self._next_start = now + self.delay
+        self.decreases += 1
+        logger.warning(f"📉 Ritmo reducido por {reason}: concurrencia {self.concurrency}, delay {self.delay:.2f}s")
+    
+    def metrics(self) -> Dict:
+        """Retorna el estado actual del controlador"""
+        with self._condition:
+            return {
+                'concurrency': self.concurrency,
+                'delay': round(self.delay, 3),
+                'in_flight': self.in_flight,
+                'latency_ewma': round(self.latency_ewma, 3) if self.latency_ewma is not None else None,
+                'requests': self.requests,
+                'successes': self.successes,
+                'throttled': self.throttled,
+                'challenges': self.challenges,
+                'errors': self.errors,
+                'latency_spikes': self.latency_spikes,
+                'increases': self.increases,
+                'decreases': self.decreases
+            }
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+🎵 Artist Input - SoundExchange
+===============================
+
+Entrada de artistas en streaming para catálogos grandes.
+
+Lee los nombres desde un archivo de texto, la entrada estándar o una columna
+de un CSV/Parquet sin cargarlos antes en memoria, descarta repetidos
+comparando los nombres normalizados (nunca se pierde un artista distinto) y
+los entrega al scraper a través de una cola acotada que se llena en un hilo
+aparte. Así una corrida empieza a buscar apenas se lee la primera línea.
+"""
+
+import csv
+import sys
+import queue
+import threading
+import logging
+from typing import Iterable, Iterator, Optional
+
+from config import INPUT_CONFIG
+from artist_scraper import normalize_artist_name
+
+logger = logging.getLogger(__name__)
+
+# Marca de fin de la cola de entrada
+_INPUT_END = object()
+
+
+def iter_text_artists(filepath: str) -> Iterator[str]:
+    """Recorre un archivo de texto (o la entrada estándar con '-') con un artista por línea"""
+    if filepath == '-':
+        for line in sys.stdin:
+            if line.strip():
+                yield line.strip()
+        return
+        
+    with open(filepath, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield line.strip()
+
+
+def iter_csv_column(filepath: str, column: str) -> Iterator[str]:
+    """Recorre una columna de un CSV"""
+    with open(filepath, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.DictReader(f)
+        if column not in (reader.fieldnames or []):
+            raise ValueError(f"La columna '{column}' no existe en {filepath}")
+        for row in reader:
+            value = (row.get(column) or '').strip()
+            if value:
+                yield value
+
+
+def iter_parquet_column(filepath: str, column: str) -> Iterator[str]:
+    """Recorre una columna de un archivo Parquet por lotes"""
+    import pyarrow.parquet as pq
+    
+    parquet_file = pq.ParquetFile(filepath)
+    for batch in parquet_file.iter_batches(columns=[column], batch_size=INPUT_CONFIG['parquet_batch_size']):
+        for value in batch.column(0).to_pylist():
+            if value and str(value).strip():
+                yield str(value).strip()
+
+
+def iter_artist_source(source: str, column: Optional[str] = None) -> Iterator[str]:
+    """Recorre los artistas de un archivo de texto, '-', o una columna de un CSV/Parquet"""
+    suffix = source.lower().rsplit('.', 1)[-1] if '.' in source else ''
+    if suffix == 'csv':
+        return iter_csv_column(source, column or INPUT_CONFIG['default_column'])
+    if suffix == 'parquet':
+        return iter_parquet_column(source, column or INPUT_CONFIG['default_column'])
+    return iter_text_artists(source)
+
+
+def unique_artists(artists: Iterable[str]) -> Iterator[str]:
+    """Descarta artistas repetidos (por nombre normalizado)"""
+    # Comparación exacta: una auditoría no puede descartar un artista nuevo por un falso positivo
+    seen = set()
+    duplicates = 0
+    for artist in artists:
+        key = normalize_artist_name(artist)
+        if not key:
+            continue
+        if key in seen:
+            duplicates += 1
+            continue
+        seen.add(key)
+        yield artist
+    if duplicates:
+        logger.info(f"🔁 {duplicates} artistas repetidos descartados")
+
+
+def prefetch(artists: Iterable[str], maxsize: int = INPUT_CONFIG['queue_size']) -> Iterator[str]:
+    """Lee la entrada en un hilo aparte y la entrega a través de una cola acotada; un error de lectura corta la entrada"""
+    buffer = queue.Queue(maxsize=maxsize)
+    errors = []
+    
+    def reader():
+        try:
+            for artist in artists:
+                buffer.put(artist)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            buffer.put(_INPUT_END)
+            
+    threading.Thread(target=reader, name='artist-input', daemon=True).start()
+    
+    delivered = 0
+    while True:
+        artist = buffer.get()
+        if artist is _INPUT_END:
+            break
+        delivered += 1
+        yield artist
+        
+    # No se relanza: los resultados de lo ya leído tienen que llegar a guardarse
+    if errors:
+        logger.error(f"❌ Error leyendo la entrada después de {delivered} artistas; se corta la lectura: {errors[0]}")
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+🎵 Artist Result - SoundExchange
+================================
+
+Registro compacto con los resultados de un artista.
+
+Guarda los resultados de cada categoría como tuplas de strings internados y
+genera las columnas del CSV/Google Sheets (conteos, resultados unidos con
+'; ', estado) recién cuando se piden. Se comporta como un diccionario de solo
+lectura, así que los consumidores existentes (`record['total_results']`,
+`record.get(field)`, `csv.DictWriter`) siguen funcionando sin cambios.
+"""
+
+import sys
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+CATEGORY_CODES = ('UA', 'PUA', 'UP', 'USRO')
+
+# Estados de la búsqueda de un artista en una categoría
+STATUS_OK = 'ok'
+STATUS_EMPTY = 'empty'
+STATUS_HTTP_ERROR = 'http_error'
+STATUS_PARSE_ERROR = 'parse_error'
+STATUS_TIMEOUT = 'timeout'
+# Búsqueda omitida porque el filtro Bloom descarta el artista en la categoría
+STATUS_SKIPPED = 'skipped'
+
+FAILED_STATUSES = frozenset((STATUS_HTTP_ERROR, STATUS_PARSE_ERROR, STATUS_TIMEOUT))
+
+CSV_FIELDNAMES = [
+    'artist_name', 'timestamp', 'total_results', 'categories_with_results',
+    'UA_count', 'PUA_count', 'UP_count', 'USRO_count',
+    'UA_results', 'PUA_results', 'UP_results', 'USRO_results', 'status'
+]
+
+RESULTS_SEPARATOR = '; '
+
+_FIELD_SET = frozenset(CSV_FIELDNAMES)
+
+
+def unverified_categories(status: str) -> List[str]:
+    """Categorías sin resultado verificado según la columna de estado (errores, búsquedas fallidas u omitidas)"""
+    status = str(status or '')
+    if status.startswith('Error'):
+        return list(CATEGORY_CODES)
+    if status.startswith('Incomplete:'):
+        # 'Incomplete: UA timeout, PUA http_error'
+        failed = {part.split()[0] for part in status.partition(':')[2].split(',') if part.strip()}
+        return [code for code in CATEGORY_CODES if code in failed]
+    if '(skipped:' in status:
+        # 'Not Found (skipped: UA, PUA)'
+        skipped = {code.strip() for code in status.partition('(skipped:')[2].rstrip(')').split(',')}
+        return [code for code in CATEGORY_CODES if code in skipped]
+    return []
+
+
+def _intern_items(items: Iterable[str]) -> Tuple[str, ...]:
+    """Convierte una lista de resultados en una tupla de strings internados"""
+    # Los elementos vacíos se conservan: los conteos tienen que coincidir con la hoja de origen
+    return tuple(sys.intern('' if item is None else str(item)) for item in items)
+
+
+class SearchOutcome(NamedTuple):
+    """Resultado de buscar un artista en una categoría, con su estado explícito"""
+    status: str
+    items: List[str]
+    detail: str = ''
+    
+    @property
+    def failed(self) -> bool:
+        return self.status in FAILED_STATUSES
+
+
+class ArtistResult(Mapping):
+    """Resultado de un artista con almacenamiento compacto y columnas perezosas"""
+    
+    __slots__ = ('artist_name', 'timestamp', 'results', 'outcomes', '_status')
+    
+    def __init__(self, artist_name: str, timestamp: str,
+                 results: Tuple[Tuple[str, ...], ...], status: Optional[str] = None,
+                 outcomes: Optional[Tuple[str, ...]] = None):
+        self.artist_name = sys.intern(artist_name)
+        self.timestamp = timestamp
+        self.results = results
+        # Estado de cada categoría (None si el registro no lo conoce, p. ej. leído de un CSV)
+        self.outcomes = outcomes
+        self._status = status
+    
+    @classmethod
+    def from_results(cls, artist: str, results: Dict[str, List[str]],
+                     timestamp: Optional[str] = None, status: Optional[str] = None) -> 'ArtistResult':
+        """Crea el registro a partir del diccionario categoría -> resultados"""
+        return cls(
+            artist,
+            timestamp or datetime.now().isoformat(),
+            tuple(_intern_items(results.get(code, ())) for code in CATEGORY_CODES),
+            status
+        )
+    
+    @classmethod
+    def from_outcomes(cls, artist: str, outcomes: Dict[str, SearchOutcome],
+                      timestamp: Optional[str] = None) -> 'ArtistResult':
+        """Crea el registro a partir de los resultados con estado de cada categoría"""
+        return cls(
+            artist,
+            timestamp or datetime.now().isoformat(),
+            tuple(_intern_items(outcomes[code].items) if code in outcomes else () for code in CATEGORY_CODES),
+            outcomes=tuple(sys.intern(outcomes[code].status) if code in outcomes else STATUS_EMPTY
+                           for code in CATEGORY_CODES)
+        )
+    
+    @classmethod
+    def from_record(cls, record: Dict) -> 'ArtistResult':
+        """Crea el registro desde una fila del CSV/Google Sheets"""
+        cells = (str(record.get(f'{code}_results', '') or '') for code in CATEGORY_CODES)
+        # Solo una celda vacía significa "sin resultados"; "a; ; b" son tres resultados
+        results = tuple(_intern_items(cell.split(RESULTS_SEPARATOR)) if cell else () for cell in cells)
+        status = record.get('status') or None
+        # 'Found'/'Not Found' se recalculan; otros estados (errores) se conservan
+        if status in ('Found', 'Not Found'):
+            status = None
+        return cls(str(record.get('artist_name', '')), str(record.get('timestamp', '')), results, status)
+    
+    @classmethod
+    def error(cls, artist: str, message: str) -> 'ArtistResult':
+        """Crea un registro de error sin resultados"""
+        return cls(artist, datetime.now().isoformat(), ((),) * len(CATEGORY_CODES), f'Error: {message[:100]}')
+    
+    def category(self, code: str) -> Tuple[str, ...]:
+        """Retorna los resultados de una categoría"""
+        return self.results[CATEGORY_CODES.index(code)]
+    
+    def failed_categories(self) -> List[str]:
+        """Retorna las categorías cuya búsqueda falló"""
+        if not self.outcomes:
+            return []
+        return [code for code, status in zip(CATEGORY_CODES, self.outcomes) if status in FAILED_STATUSES]
+    
+    def skipped_categories(self) -> List[str]:
+        """Retorna las categorías que no se buscaron (descartadas por filtro Bloom)"""
+        if not self.outcomes:
+            return []
+        return [code for code, status in zip(CATEGORY_CODES, self.outcomes) if status == STATUS_SKIPPED]
+    
+    def with_outcome(self, code: str, outcome: SearchOutcome) -> 'ArtistResult':
+        """Retorna una copia con el resultado de una categoría reemplazado"""
+        index = CATEGORY_CODES.index(code)
+        results = list(self.results)
+        results[index] = _intern_items(outcome.items)
+        outcomes = list(self.outcomes or (STATUS_OK,) * len(CATEGORY_CODES))
+        outcomes[index] = sys.intern(outcome.status)
+        return ArtistResult(self.artist_name, self.timestamp, tuple(results), self._status, tuple(outcomes))
+    
+    @property
+    def total_results(self) -> int:
+        return sum(len(items) for items in self.results)
+    
+    @property
+    def categories_with_results(self) -> int:
+        return sum(1 for items in self.results if items)
+    
+    @property
+    def status(self) -> str:
+        if self._status is not None:
+            return self._status
+        failed = self.failed_categories()
+        if failed:
+            # Una búsqueda fallida nunca se reporta como 'Not Found'
+            details = ', '.join(f"{code} {self.outcomes[CATEGORY_CODES.index(code)]}" for code in failed)
+            return f'Incomplete: {details}'
+        found = 'Found' if self.total_results > 0 else 'Not Found'
+        skipped = self.skipped_categories()
+        if skipped:
+            # Una categoría omitida no se buscó: el resultado no es un 'Not Found' verificado
+            return f"{found} (skipped: {', '.join(skipped)})"
+        return found
+    
+    def __getitem__(self, field: str):
+        if field == 'artist_name':
+            return self.artist_name
+        if field == 'timestamp':
+            return self.timestamp
+        if field == 'total_results':
+            return self.total_results
+        if field == 'categories_with_results':
+            return self.categories_with_results
+        if field == 'status':
+            return self.status
+        if field in _FIELD_SET:
+            code, _, kind = field.partition('_')
+            items = self.category(code)
+            return len(items) if kind == 'count' else RESULTS_SEPARATOR.join(items)
+        raise KeyError(field)
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(CSV_FIELDNAMES)
+    
+    def __len__(self) -> int:
+        return len(CSV_FIELDNAMES)
+    
+    def __repr__(self) -> str:
+        return f"ArtistResult({self.artist_name!r}, {self.timestamp!r}, status={self.status!r})"
+    
+    def to_dict(self) -> Dict:
+        """Convierte el registro al diccionario de 13 columnas del CSV"""
+        return {field: self[field] for field in CSV_FIELDNAMES}
+    
+    def to_row(self, headers: List[str]) -> List[str]:
+        """Convierte el registro a una fila de Google Sheets con el orden de los headers"""
+        return [str(self[header]) if header in _FIELD_SET else "" for header in headers]
@@ -8,6 +8,7 @@ Busca en todas las categorías y muestra los resultados de forma clara.
 
 Uso:
     python artist_scraper.py "nombre del artista"
+    python artist_scraper.py "nombre del artista" --snapshot resultados.snap
     
 Ejemplos:
     python artist_scraper.py "nicki nicole"
@@ -30,21 +31,34 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
 
+from artist_result import (
+    CATEGORY_CODES, SearchOutcome, STATUS_OK, STATUS_EMPTY, STATUS_HTTP_ERROR, STATUS_PARSE_ERROR, STATUS_TIMEOUT
+)
+from logging_setup import setup_logging, PER_REQUEST
+from http_transport import HttpTransport, create_transport
+
 SEARCH_PAGE = "https://www.soundexchange.com/what-we-do/for-artists-labels-and-producers/"
 AJAX_ENDPOINT = "https://www.soundexchange.com/wp-admin/admin-ajax.php"
 
-# Configurar logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('artist_scraper.log'),
-        logging.StreamHandler()
-    ]
-)
+# Headers del navegador para las búsquedas AJAX; accept-encoding lo define el transporte
+SEARCH_HEADERS = {
+    'accept': 'application/json, text/javascript, */*; q=0.01',
+    'accept-language': 'es-419,es;q=0.7',
+    'content-type': 'application/x-www-form-urlencoded; charset=UTF-8',
+    'origin': 'https://www.soundexchange.com',
+    'referer': SEARCH_PAGE,
+    'x-requested-with': 'XMLHttpRequest',
+    'user-agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/137.0.0.0 Safari/537.36',
+}
+
 logger = logging.getLogger(__name__)
 
 
+def normalize_artist_name(artist: str) -> str:
+    """Normaliza un nombre de artista para comparaciones (minúsculas, espacios simples)"""
+    return ' '.join(artist.lower().split())
+
+
 def setup_driver(headless: bool = True):
     """Configura el driver de Chrome"""
     options = Options()
@@ -87,8 +101,56 @@ def get_cf_cookie() -> dict | None:
             pass
 
 
-def search_artist(session: requests.Session, artist: str, category: str) -> List[str]:
-    """Busca un artista en una categoría específica"""
+def is_cloudflare_challenge(response) -> bool:
+    """Detecta si la respuesta es un desafío de Cloudflare en lugar del JSON esperado"""
+    if response.headers.get('cf-mitigated') == 'challenge':
+        return True
+    if response.status_code in (403, 503):
+        body = response.content[:4096]
+        return b'challenge-platform' in body or b'Just a moment' in body
+    return False
+
+
+def _post_search(session: HttpTransport, data: dict, controller=None):
+    """Envía la búsqueda, respetando y alimentando el controlador adaptativo si hay uno"""
+    # El timeout lo pone el transporte (TRANSPORT_CONFIG['timeout'])
+    if controller is None:
+        return session.post(AJAX_ENDPOINT, data=data)
+    
+    with controller.slot():
+        start = time.monotonic()
+        try:
+            response = session.post(AJAX_ENDPOINT, data=data)
+        except Exception:
+            controller.record(time.monotonic() - start, error=True)
+            raise
+        controller.record(
+            time.monotonic() - start,
+            status_code=response.status_code,
+            challenge=is_cloudflare_challenge(response)
+        )
+        return response
+
+
+def parse_search_response(content: bytes) -> List[str]:
+    """Extrae los resultados del HTML que viene dentro del JSON de respuesta"""
+    try:
+        data = json.loads(content.decode('utf-8'))
+    except (UnicodeDecodeError, json.JSONDecodeError):
+        # Intentar latin-1
+        data = json.loads(content.decode('latin-1'))
+    
+    if not isinstance(data, dict):
+        raise ValueError(f"Respuesta inesperada: {str(data)[:100]}")
+    
+    html = data.get('html', '')
+    soup = BeautifulSoup(html, 'html.parser')
+    return [el.get_text(strip=True) for el in soup.select('.uli-search-item') if el.get_text(strip=True)]
+
+
+def search_category(session: HttpTransport, artist: str, category: str, controller=None,
+                    archive=None) -> SearchOutcome:
+    """Busca un artista en una categoría y retorna los resultados con su estado"""
     data = {
         'action': 'ulists_get_query',
         'ul_cate': category,
@@ -96,35 +158,43 @@ def search_artist(session: requests.Session, artist: str, category: str) -> List
         'ul_type': ''
     }
     
+    start = time.monotonic()
     try:
-        response = session.post(AJAX_ENDPOINT, data=data, timeout=30)
-        logger.info(f"🔍 {category}: HTTP {response.status_code}")
-        
-        if response.status_code == 200:
-            # Intentar parsear JSON
-            try:
-                data = json.loads(response.content.decode('utf-8'))
-                html = data.get('html', '')
-                soup = BeautifulSoup(html, 'html.parser')
-                items = [el.get_text(strip=True) for el in soup.select('.uli-search-item') if el.get_text(strip=True)]
-                return items
-            except json.JSONDecodeError:
-                # Intentar latin-1
-                try:
-                    data = json.loads(response.content.decode('latin-1'))
-                    html = data.get('html', '')
-                    soup = BeautifulSoup(html, 'html.parser')
-                    items = [el.get_text(strip=True) for el in soup.select('.uli-search-item') if el.get_text(strip=True)]
-                    return items
-                except:
-                    return []
-        else:
-            logger.error(f"❌ {category}: HTTP {response.status_code}")
-            return []
-            
+        response = _post_search(session, data, controller)
+        # Formato diferido y muestreado: esta línea se emite en cada petición
+        logger.info("🔍 %s: HTTP %s", category, response.status_code,
+                    extra=dict(PER_REQUEST, artist=artist, category=category,
+                               status_code=response.status_code, latency=round(time.monotonic() - start, 3)))
+    except requests.Timeout as e:
+        logger.error(f"❌ {category}: Timeout - {e}")
+        return SearchOutcome(STATUS_TIMEOUT, [], str(e))
     except Exception as e:
         logger.error(f"❌ {category}: Error - {e}")
-        return []
+        return SearchOutcome(STATUS_HTTP_ERROR, [], str(e))
+    
+    if response.status_code != 200:
+        logger.error(f"❌ {category}: HTTP {response.status_code}")
+        return SearchOutcome(STATUS_HTTP_ERROR, [], f"HTTP {response.status_code}")
+        
+    # El cuerpo crudo se archiva antes de parsear: sirve aunque el parseo falle
+    if archive is not None:
+        try:
+            archive.store(artist, category, response.content)
+        except Exception as e:
+            logger.warning(f"⚠️ {category}: No se pudo archivar la respuesta - {e}")
+    
+    try:
+        items = parse_search_response(response.content)
+    except Exception as e:
+        logger.error(f"❌ {category}: Error parseando respuesta - {e}")
+        return SearchOutcome(STATUS_PARSE_ERROR, [], str(e))
+    
+    return SearchOutcome(STATUS_OK if items else STATUS_EMPTY, items)
+
+
+def search_artist(session: HttpTransport, artist: str, category: str, controller=None) -> List[str]:
+    """Busca un artista en una categoría específica"""
+    return search_category(session, artist, category, controller).items
 
 
 def search_all_categories(artist: str) -> Dict[str, List[str]]:
@@ -145,26 +215,14 @@ def search_all_categories(artist: str) -> Dict[str, List[str]]:
         return results
     
     # Configurar sesión
-    session = requests.Session()
-    session.headers.update({
-        'accept': 'application/json, text/javascript, */*; q=0.01',
-        'accept-encoding': 'gzip, deflate',
-        'accept-language': 'es-419,es;q=0.7',
-        'content-type': 'application/x-www-form-urlencoded; charset=UTF-8',
-        'origin': 'https://www.soundexchange.com',
-        'referer': SEARCH_PAGE,
-        'x-requested-with': 'XMLHttpRequest',
-        'user-agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/137.0.0.0 Safari/537.36',
-    })
-    session.cookies.set(cf_cookie['name'], cf_cookie['value'], domain=cf_cookie['domain'])
-    
-    # Buscar en cada categoría
-    logger.info(f"🚀 Buscando '{artist}' en todas las categorías...")
-    
-    for code, name in categories.items():
-        logger.info(f"🔍 Buscando en {name} ({code})...")
-        results[code] = search_artist(session, artist, code)
-        time.sleep(1)  # Pausa entre búsquedas
+    with create_transport(SEARCH_HEADERS, cf_cookie) as session:
+        # Buscar en cada categoría
+        logger.info(f"🚀 Buscando '{artist}' en todas las categorías...")
+        
+        for code, name in categories.items():
+            logger.info(f"🔍 Buscando en {name} ({code})...")
+            results[code] = search_artist(session, artist, code)
+            time.sleep(1)  # Pausa entre búsquedas
     
     return results
 
@@ -234,12 +292,21 @@ def save_results(artist: str, results: Dict[str, List[str]]):
 
 def main():
     """Función principal"""
+    setup_logging('artist_scraper.log')
     print("🎵 ARTIST SCRAPER - SoundExchange")
     print("=" * 40)
     
+    # Separar la opción --snapshot del nombre del artista
+    args = sys.argv[1:]
+    snapshot_file = None
+    if '--snapshot' in args:
+        index = args.index('--snapshot')
+        snapshot_file = args[index + 1] if index + 1 < len(args) else None
+        del args[index:index + 2]
+        
     # Verificar argumentos
-    if len(sys.argv) < 2:
-        print("❌ Uso: python artist_scraper.py \"nombre del artista\"")
+    if not args:
+        print("❌ Uso: python artist_scraper.py \"nombre del artista\" [--snapshot archivo.snap]")
         print("\nEjemplos:")
         print("  python artist_scraper.py \"nicki nicole\"")
         print("  python artist_scraper.py \"emilia\"")
@@ -247,11 +314,23 @@ def main():
         print("  python artist_scraper.py \"airbag\"")
         sys.exit(1)
     
-    artist = sys.argv[1].strip()
+    artist = args[0].strip()
     
     if not artist:
         print("❌ El nombre del artista no puede estar vacío")
         sys.exit(1)
+        
+    # Consultar primero el snapshot local, sin abrir el navegador ni la red
+    if snapshot_file:
+        from entry_snapshot import EntrySnapshot
+        with EntrySnapshot(snapshot_file) as snapshot:
+            cached = snapshot.get(artist)
+            # Solo se usan resultados completos; errores y búsquedas incompletas se repiten
+            if cached is not None and cached.status in ('Found', 'Not Found'):
+                print(f"📦 Resultado del snapshot {snapshot_file} ({cached.timestamp})")
+                display_results(artist, {code: list(cached.category(code)) for code in CATEGORY_CODES})
+                return
+        print(f"📦 '{artist}' no está en el snapshot, buscando en SoundExchange...")
     
     print(f"🔍 Buscando: {artist}")
     print("⏳ Esto puede tomar unos segundos...")
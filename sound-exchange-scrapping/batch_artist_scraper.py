@@ -15,14 +15,16 @@ Uso:
 import json
 import time
 import sys
+import random
 import csv
 import argparse
+import itertools
 from datetime import datetime
 import logging
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Iterable, Iterator, Tuple
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, Executor, Future
 
-import requests
 from bs4 import BeautifulSoup
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
@@ -30,17 +32,15 @@ from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
 
 # Importar funciones del scraper original
-from artist_scraper import setup_driver, get_cf_cookie, search_artist
+from artist_scraper import setup_driver, get_cf_cookie, search_category, SEARCH_HEADERS
+from artist_result import ArtistResult, SearchOutcome, CSV_FIELDNAMES, STATUS_HTTP_ERROR, STATUS_SKIPPED
+from config import RETRY_CONFIG, BLOOM_CONFIG, HISTORY_CONFIG, ARCHIVE_CONFIG
+from adaptive_rate import AIMDController
+from name_variants import expand_variants, merge_outcomes
+from logging_setup import setup_logging, PER_REQUEST
+from artist_input import iter_artist_source, unique_artists, prefetch
+from http_transport import create_transport, TimingStats
 
-# Configurar logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('batch_artist_scraper.log'),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger(__name__)
 
 SEARCH_PAGE = "https://www.soundexchange.com/what-we-do/for-artists-labels-and-producers/"
@@ -50,11 +50,40 @@ AJAX_ENDPOINT = "https://www.soundexchange.com/wp-admin/admin-ajax.php"
 class BatchArtistScraper:
     """Clase para procesar múltiples artistas en lote"""
     
-    def __init__(self, headless: bool = True, delay: float = 2.0):
+    def __init__(self, headless: bool = True, delay: float = 2.0, adaptive: bool = False,
+                 bloom_filter: Optional[str] = None, verify_rate: float = BLOOM_CONFIG['verify_rate'],
+                 variants: bool = False, archive: Optional[str] = None):
         self.headless = headless
         self.delay = delay
+        # Inicio de la última búsqueda: el delay separa peticiones, no se suma después de cada una
+        self._last_request = float('-inf')
         self.session = None
+        self.transport_stats = TimingStats()
         self.cf_cookie = None
+        # Sesión configurándose en segundo plano (start_session)
+        self._session_ready: Optional[Future] = None
+        # Con modo adaptativo el controlador reemplaza al delay fijo
+        self.controller = AIMDController(initial_delay=delay) if adaptive else None
+        # Con variantes, cada forma de búsqueda se consulta una sola vez por corrida
+        self.variants = variants
+        self.variant_cache: Dict[str, Dict[str, SearchOutcome]] = {}
+        self.variant_stats = {'searched': 0, 'shared': 0}
+        self.filters = None
+        self.verify_rate = verify_rate
+        self.bloom_stats = {'skipped': 0, 'verified': 0, 'stale_hits': 0}
+        if bloom_filter:
+            from bloom_filter import CategoryFilters
+            self.filters = CategoryFilters.load(bloom_filter)
+            logger.info(f"🧮 Filtros Bloom cargados: {bloom_filter} ({self.filters.age_days():.1f} días)")
+            if self.filters.age_days() > BLOOM_CONFIG['max_age_days']:
+                logger.warning(f"⚠️ Los filtros Bloom tienen más de {BLOOM_CONFIG['max_age_days']} días; conviene reconstruirlos")
+        # Respuestas crudas archivadas para volver a parsear sin repetir búsquedas
+        self.archive = None
+        archive = archive or (ARCHIVE_CONFIG['path'] if ARCHIVE_CONFIG['enabled'] else None)
+        if archive:
+            from response_archive import ResponseArchive
+            self.archive = ResponseArchive(archive)
+            logger.info(f"🗃️ Archivando respuestas en {archive}")
         self.categories = {
             'UA': 'Unregistered Artists',
             'PUA': 'Partially Unregistered Artists', 
@@ -73,23 +102,11 @@ class BatchArtistScraper:
                 logger.error("❌ No se pudo obtener cookie Cloudflare")
                 return False
             
-            # Configurar sesión
-            self.session = requests.Session()
-            self.session.headers.update({
-                'accept': 'application/json, text/javascript, */*; q=0.01',
-                'accept-encoding': 'gzip, deflate',
-                'accept-language': 'es-419,es;q=0.7',
-                'content-type': 'application/x-www-form-urlencoded; charset=UTF-8',
-                'origin': 'https://www.soundexchange.com',
-                'referer': SEARCH_PAGE,
-                'x-requested-with': 'XMLHttpRequest',
-                'user-agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/137.0.0.0 Safari/537.36',
-            })
-            self.session.cookies.set(
-                self.cf_cookie['name'], 
-                self.cf_cookie['value'], 
-                domain=self.cf_cookie['domain']
-            )
+            # Configurar sesión: pool, HTTP/2 y compresión según TRANSPORT_CONFIG
+            if self.session:
+                self.session.close()
+            self.session = create_transport(SEARCH_HEADERS, self.cf_cookie)
+            self.session.add_hook(self.transport_stats)
             
             logger.info("✅ Sesión configurada exitosamente")
             return True
@@ -98,56 +115,176 @@ class BatchArtistScraper:
             logger.error(f"❌ Error configurando sesión: {e}")
             return False
     
-    def search_artist(self, artist: str) -> Dict[str, List[str]]:
-        """Busca un artista en todas las categorías"""
+    def start_session(self, executor: Executor) -> Future:
+        """Empieza a configurar la sesión en segundo plano; la primera búsqueda la espera"""
+        self._session_ready = executor.submit(self.setup_session)
+        return self._session_ready
+    
+    def bloom_precheck(self, artist: str) -> Tuple[List[str], List[str]]:
+        """Retorna las categorías a omitir y las descartadas que igual se verificarán"""
+        skipped = []
+        verifying = []
+        if self.filters:
+            for code in self.categories:
+                if self.filters.might_contain(code, artist):
+                    continue
+                if random.random() < self.verify_rate:
+                    verifying.append(code)
+                else:
+                    skipped.append(code)
+        return skipped, verifying
+    
+    def search_outcomes(self, artist: str) -> Dict[str, SearchOutcome]:
+        """Busca un artista en todas las categorías, con el estado de cada búsqueda"""
         if not self.session:
             logger.error("❌ Sesión no configurada")
-            return {}
+            return {code: SearchOutcome(STATUS_HTTP_ERROR, [], 'Sesión no configurada') for code in self.categories}
         
-        results = {}
-        logger.info(f"🔍 Buscando '{artist}' en todas las categorías...")
+        skipped, verifying = self.bloom_precheck(artist)
+        outcomes = {code: SearchOutcome(STATUS_SKIPPED, [], 'Descartado por filtro Bloom') for code in skipped}
+        self.bloom_stats['skipped'] += len(skipped)
+        pending = [code for code in self.categories if code not in outcomes]
+        logger.info("🔍 Buscando '%s' en %d categorías...", artist, len(pending), extra=PER_REQUEST)
         
-        for code, name in self.categories.items():
-            logger.info(f"🔍 Buscando en {name} ({code})...")
-            results[code] = search_artist(self.session, artist, code)
-            time.sleep(self.delay)  # Pausa entre búsquedas
+        if self.controller:
+            # Las categorías se consultan en paralelo; el controlador limita la concurrencia real
+            with ThreadPoolExecutor(max_workers=self.controller.max_concurrency) as executor:
+                futures = {
+                    code: executor.submit(search_category, self.session, artist, code, self.controller, self.archive)
+                    for code in pending
+                }
+                outcomes.update({code: future.result() for code, future in futures.items()})
+        else:
+            for code in pending:
+                logger.info("🔍 Buscando en %s (%s)...", self.categories[code], code, extra=PER_REQUEST)
+                self._pace()
+                outcomes[code] = search_category(self.session, artist, code, archive=self.archive)
         
-        return results
+        # Un descarte verificado con resultados indica que el filtro quedó desactualizado
+        for code in verifying:
+            self.bloom_stats['verified'] += 1
+            if outcomes[code].items:
+                self.bloom_stats['stale_hits'] += 1
+                logger.warning(f"⚠️ El filtro Bloom descartó '{artist}' en {code} pero hay resultados; reconstruir los filtros")
+        
+        return {code: outcomes[code] for code in self.categories}
+    
+    def _pace(self):
+        """Espera lo que falte del delay desde la búsqueda anterior (con --adaptive decide el controlador)"""
+        if self.controller:
+            return
+        wait = self._last_request + self.delay - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+        self._last_request = time.monotonic()
     
-    def process_artist(self, artist: str) -> Dict:
+    def search_artist(self, artist: str) -> Dict[str, List[str]]:
+        """Busca un artista en todas las categorías"""
+        return {code: outcome.items for code, outcome in self.search_outcomes(artist).items()}
+    
+    def variant_outcomes(self, form: str) -> Dict[str, SearchOutcome]:
+        """Busca una forma de nombre, reutilizando el resultado si ya se buscó en la corrida"""
+        if form in self.variant_cache:
+            self.variant_stats['shared'] += 1
+            logger.info("♻️ Reutilizando resultados de '%s'", form, extra=PER_REQUEST)
+            return self.variant_cache[form]
+            
+        outcomes = self.search_outcomes(form)
+        self.variant_stats['searched'] += 1
+        # Las formas con búsquedas fallidas no se comparten: se reintentan por artista
+        if not any(outcome.failed for outcome in outcomes.values()):
+            self.variant_cache[form] = outcomes
+        return outcomes
+    
+    def process_artist(self, artist: str) -> ArtistResult:
         """Procesa un artista y retorna los resultados estructurados"""
-        results = self.search_artist(artist)
+        forms = [artist]
+        if self.variants:
+            forms = expand_variants(artist) or [artist]
+            per_form = [self.variant_outcomes(form) for form in forms]
+            outcomes = {code: merge_outcomes([form_outcomes[code] for form_outcomes in per_form])
+                        for code in self.categories}
+        else:
+            outcomes = self.search_outcomes(artist)
+            
+        # Las respuestas se archivan por forma buscada; el archivo necesita saber cuáles forman este artista
+        if self.archive is not None:
+            try:
+                self.archive.store_forms(artist, forms)
+            except Exception as e:
+                logger.warning(f"⚠️ No se pudieron archivar las formas de '{artist}' - {e}")
+        
+        # Registro compacto; las columnas del CSV se generan al escribir
+        return ArtistResult.from_outcomes(artist, outcomes)
+    
+    def retry_category(self, artist: str, code: str) -> SearchOutcome:
+        """Vuelve a buscar una categoría de un artista (en todas sus formas si hay variantes)"""
+        if not self.variants:
+            self._pace()
+            return search_category(self.session, artist, code, self.controller, self.archive)
+            
+        outcomes = []
+        for form in expand_variants(artist) or [artist]:
+            cached = self.variant_cache.get(form)
+            if cached:
+                outcomes.append(cached[code])
+                continue
+            self._pace()
+            outcomes.append(search_category(self.session, form, code, self.controller, self.archive))
+        return merge_outcomes(outcomes)
+    
+    def retry_failed(self, results: List[ArtistResult]) -> List[ArtistResult]:
+        """Vuelve a consultar solo los pares (artista, categoría) que fallaron, con backoff"""
+        pending = [
+            (index, code)
+            for index, result in enumerate(results)
+            if isinstance(result, ArtistResult)
+            for code in result.failed_categories()
+        ]
+        if not pending:
+            return results
         
-        # Calcular totales
-        total_results = sum(len(items) for items in results.values())
-        categories_with_results = sum(1 for items in results.values() if items)
+        logger.info(f"🔁 Reintentando {len(pending)} búsquedas fallidas...")
         
-        # Estructurar datos para CSV
-        artist_data = {
-            'artist_name': artist,
-            'timestamp': datetime.now().isoformat(),
-            'total_results': total_results,
-            'categories_with_results': categories_with_results,
-            'UA_count': len(results.get('UA', [])),
-            'PUA_count': len(results.get('PUA', [])),
-            'UP_count': len(results.get('UP', [])),
-            'USRO_count': len(results.get('USRO', [])),
-            'UA_results': '; '.join(results.get('UA', [])),
-            'PUA_results': '; '.join(results.get('PUA', [])),
-            'UP_results': '; '.join(results.get('UP', [])),
-            'USRO_results': '; '.join(results.get('USRO', [])),
-            'status': 'Found' if total_results > 0 else 'Not Found'
-        }
+        for attempt in range(1, RETRY_CONFIG['max_retries'] + 1):
+            backoff = min(RETRY_CONFIG['backoff_base'] * 2 ** (attempt - 1), RETRY_CONFIG['backoff_max'])
+            logger.info(f"⏳ Reintento {attempt}/{RETRY_CONFIG['max_retries']} en {backoff:.1f}s ({len(pending)} pendientes)")
+            time.sleep(backoff)
+            
+            still_failed = []
+            for index, code in pending:
+                outcome = self.retry_category(results[index].artist_name, code)
+                if outcome.failed:
+                    still_failed.append((index, code))
+                else:
+                    results[index] = results[index].with_outcome(code, outcome)
+            
+            pending = still_failed
+            if not pending:
+                break
+        
+        if pending:
+            logger.warning(f"⚠️ {len(pending)} búsquedas siguen fallando tras los reintentos")
+        else:
+            logger.info("✅ Todas las búsquedas fallidas se recuperaron")
         
-        return artist_data
+        return results
     
-    def process_artists_list(self, artists: List[str]) -> List[Dict]:
-        """Procesa una lista de artistas"""
-        if not self.setup_session():
-            return []
+    def iter_artists(self, artists: Iterable[str]) -> Iterator[ArtistResult]:
+        """Procesa una lista de artistas y entrega cada resultado apenas está listo"""
+        for _, result in self._iter_indexed(artists):
+            yield result
+    
+    def _iter_indexed(self, artists: Iterable[str]) -> Iterator[Tuple[int, ArtistResult]]:
+        """Genera (posición, resultado); los resultados con fallas se entregan tras el reintento"""
+        # La sesión pudo haberse empezado a configurar en paralelo con el resto del arranque
+        session_ready, self._session_ready = self._session_ready, None
+        if not (session_ready.result() if session_ready else self.setup_session()):
+            return
         
-        results = []
-        total_artists = len(artists)
+        pending_retry = []
+        # La entrada puede ser un generador sin largo conocido
+        total_artists = len(artists) if hasattr(artists, '__len__') else '?'
         
         logger.info(f"🚀 Procesando {total_artists} artistas...")
         
@@ -156,37 +293,48 @@ class BatchArtistScraper:
             if not artist:
                 continue
                 
-            logger.info(f"🎵 [{i}/{total_artists}] Procesando: {artist}")
+            logger.info("🎵 [%d/%s] Procesando: %s", i, total_artists, artist)
             
             try:
                 artist_data = self.process_artist(artist)
-                results.append(artist_data)
                 
                 # Mostrar resumen
-                if artist_data['total_results'] > 0:
-                    logger.info(f"✅ {artist}: {artist_data['total_results']} resultados en {artist_data['categories_with_results']} categorías")
+                if artist_data.failed_categories():
+                    logger.warning(f"⚠️ {artist}: {artist_data['status']}")
+                    # Se retiene hasta la pasada de reintentos
+                    pending_retry.append((i, artist_data))
                 else:
-                    logger.info(f"⚠️ {artist}: Sin resultados")
+                    if artist_data['total_results'] > 0:
+                        logger.info("✅ %s: %d resultados en %d categorías", artist,
+                                    artist_data.total_results, artist_data.categories_with_results)
+                    else:
+                        logger.info("⚠️ %s: Sin resultados", artist)
+                    yield i, artist_data
                 
             except Exception as e:
                 logger.error(f"❌ Error procesando {artist}: {e}")
                 # Agregar registro de error
-                error_data = {
-                    'artist_name': artist,
-                    'timestamp': datetime.now().isoformat(),
-                    'total_results': 0,
-                    'categories_with_results': 0,
-                    'UA_count': 0, 'PUA_count': 0, 'UP_count': 0, 'USRO_count': 0,
-                    'UA_results': '', 'PUA_results': '', 'UP_results': '', 'USRO_results': '',
-                    'status': f'Error: {str(e)[:100]}'
-                }
-                results.append(error_data)
-            
-            # Pausa entre artistas
-            if i < total_artists:
-                time.sleep(self.delay)
+                yield i, ArtistResult.error(artist, str(e))
         
-        return results
+        # Reintentar solo lo que falló en lugar de repetir toda la lista
+        if pending_retry:
+            positions = [position for position, _ in pending_retry]
+            retried = self.retry_failed([result for _, result in pending_retry])
+            yield from zip(positions, retried)
+        
+        if self.controller:
+            logger.info(f"📊 Control adaptativo: {self.controller.metrics()}")
+        if self.filters:
+            logger.info(f"🧮 Filtros Bloom: {self.bloom_stats}")
+        if self.variants:
+            logger.info(f"♻️ Variantes: {self.variant_stats['searched']} formas buscadas, {self.variant_stats['shared']} reutilizadas")
+        logger.info(f"🌐 Transporte: {self.transport_stats.summary()}")
+    
+    def process_artists_list(self, artists: Iterable[str]) -> List[ArtistResult]:
+        """Procesa una lista de artistas"""
+        # Los reintentos llegan al final; se restaura el orden de entrada
+        indexed = sorted(self._iter_indexed(artists), key=lambda item: item[0])
+        return [result for _, result in indexed]
     
     def save_to_csv(self, data: List[Dict], filename: Optional[str] = None) -> str:
         """Guarda los resultados en un archivo CSV"""
@@ -200,11 +348,7 @@ class BatchArtistScraper:
             filename = downloads_path / filename
         
         # Definir campos del CSV
-        fieldnames = [
-            'artist_name', 'timestamp', 'total_results', 'categories_with_results',
-            'UA_count', 'PUA_count', 'UP_count', 'USRO_count',
-            'UA_results', 'PUA_results', 'UP_results', 'USRO_results', 'status'
-        ]
+        fieldnames = CSV_FIELDNAMES
         
         try:
             with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
@@ -238,8 +382,10 @@ class BatchArtistScraper:
                     'total_results_found': sum(1 for item in data if item['total_results'] > 0),
                     'total_results_not_found': sum(1 for item in data if item['total_results'] == 0)
                 },
-                'results': data
+                'results': [dict(item) for item in data]
             }
+            if self.controller:
+                json_data['metadata']['rate_controller'] = self.controller.metrics()
             
             with open(filename, 'w', encoding='utf-8') as f:
                 json.dump(json_data, f, ensure_ascii=False, indent=2)
@@ -251,12 +397,49 @@ class BatchArtistScraper:
             logger.error(f"❌ Error guardando JSON: {e}")
             return ""
 
+    
+    def save_to_parquet(self, data: List[Dict], filename: Optional[str] = None) -> str:
+        """Guarda los resultados en un archivo Parquet con columnas de tipo lista"""
+        from columnar_store import write_parquet
+        
+        if not filename:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"batch_artists_results_{timestamp}.parquet"
+        
+        # Guardar por defecto en Descargas
+        downloads_path = Path.home() / "Downloads"
+        if not filename.startswith('/') and not filename.startswith('~'):
+            filename = downloads_path / filename
+        
+        try:
+            metadata = {
+                'total_artists': len(data),
+                'timestamp': datetime.now().isoformat(),
+                'delay': self.delay,
+                'headless': self.headless,
+                'categories': list(self.categories)
+            }
+            return write_parquet(data, filename, metadata)
+            
+        except Exception as e:
+            logger.error(f"❌ Error guardando Parquet: {e}")
+            return ""
+    
+    def save_to_history(self, data: List[Dict], directory: str = HISTORY_CONFIG['directory']) -> List[str]:
+        """Agrega los resultados al historial en Parquet particionado por fecha"""
+        from result_history import append_history
+        
+        try:
+            return append_history(data, directory)
+            
+        except Exception as e:
+            logger.error(f"❌ Error agregando al historial: {e}")
+            return []
 
-def load_artists_from_file(filepath: str) -> List[str]:
-    """Carga la lista de artistas desde un archivo de texto"""
+def load_artists_from_file(filepath: str, column: Optional[str] = None) -> List[str]:
+    """Carga la lista de artistas desde un archivo de texto o una columna de un CSV/Parquet"""
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            artists = [line.strip() for line in f if line.strip()]
+        artists = list(iter_artist_source(filepath, column))
         
         logger.info(f"📁 Cargados {len(artists)} artistas desde {filepath}")
         return artists
@@ -299,6 +482,7 @@ def interactive_mode():
 
 def main():
     """Función principal"""
+    setup_logging('batch_artist_scraper.log')
     parser = argparse.ArgumentParser(
         description="Batch Artist Scraper para SoundExchange",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -308,6 +492,9 @@ Ejemplos de uso:
   python batch_artist_scraper.py --file artists_list.txt
   python batch_artist_scraper.py --interactive
   python batch_artist_scraper.py --artists "bad bunny" --delay 3.0
+  python batch_artist_scraper.py --file catalogo.csv --column artist_name --max-artists 5000
+  cat artists_list.txt | python batch_artist_scraper.py --file -
+  python batch_artist_scraper.py --file artists_list.txt --archive
         """
     )
     
@@ -319,7 +506,17 @@ Ejemplos de uso:
     parser.add_argument(
         '--file', 
         type=str, 
-        help='Archivo de texto con un artista por línea'
+        help="Archivo de texto con un artista por línea, '-' para la entrada estándar, o catálogo CSV/Parquet"
+    )
+    parser.add_argument(
+        '--column', 
+        type=str, 
+        help='Columna con los artistas en catálogos CSV/Parquet (por defecto: artist_name)'
+    )
+    parser.add_argument(
+        '--max-artists', 
+        type=int, 
+        help='Procesar como máximo N artistas distintos'
     )
     parser.add_argument(
         '--interactive', 
@@ -343,6 +540,31 @@ Ejemplos de uso:
         type=str, 
         help='Nombre del archivo de salida (sin extensión)'
     )
+    parser.add_argument(
+        '--adaptive', 
+        action='store_true', 
+        help='Ajustar concurrencia y delay automáticamente según la respuesta de SoundExchange'
+    )
+    parser.add_argument(
+        '--parquet', 
+        action='store_true', 
+        help='Guardar también los resultados en formato Parquet'
+    )
+    parser.add_argument(
+        '--bloom-filter', 
+        type=str, 
+        help='Archivo de filtros Bloom para omitir búsquedas que seguro no tienen resultados'
+    )
+    parser.add_argument(
+        '--variants', 
+        action='store_true', 
+        help='Buscar también variantes del nombre (sin "feat.", sin acentos, sin sufijos societarios)'
+    )
+    parser.add_argument(
+        '--archive', 
+        action='store_true', 
+        help='Archivar las respuestas crudas para poder volver a parsearlas (response_archive.py)'
+    )
     
     args = parser.parse_args()
     
@@ -352,57 +574,51 @@ Ejemplos de uso:
         print("\n❌ Debes especificar al menos un modo de entrada")
         sys.exit(1)
     
-    # Obtener lista de artistas
-    artists = []
-    
+    # Obtener artistas: los archivos se leen en streaming, sin cargarlos antes
     if args.artists:
         artists = [artist.strip() for artist in args.artists.split(',') if artist.strip()]
-        print(f"🎵 Artistas especificados: {len(artists)}")
+        source = f"{len(artists)} artistas especificados"
         
     elif args.file:
-        if not Path(args.file).exists():
+        if args.file != '-' and not Path(args.file).exists():
             print(f"❌ El archivo {args.file} no existe")
             sys.exit(1)
-        artists = load_artists_from_file(args.file)
-        if not artists:
-            print(f"❌ No se pudieron cargar artistas desde {args.file}")
-            sys.exit(1)
+        artists = iter_artist_source(args.file, args.column)
+        source = 'entrada estándar' if args.file == '-' else args.file
             
-    elif args.interactive:
+    else:
         artists = interactive_mode()
         if not artists:
             print("❌ No se ingresaron artistas")
             sys.exit(1)
+        source = f"{len(artists)} artistas ingresados"
     
-    if not artists:
-        print("❌ No hay artistas para procesar")
-        sys.exit(1)
+    artists = unique_artists(artists)
+    if args.max_artists:
+        artists = itertools.islice(artists, args.max_artists)
     
     # Mostrar resumen
     print(f"\n📋 RESUMEN:")
-    print(f"  • Total de artistas: {len(artists)}")
-    print(f"  • Delay entre búsquedas: {args.delay}s")
+    print(f"  • Entrada: {source}")
+    print(f"  • Máximo de artistas: {args.max_artists or 'sin límite'}")
+    print(f"  • Delay entre búsquedas: {args.delay}s{' (adaptativo)' if args.adaptive else ''}")
     print(f"  • Modo headless: {args.headless}")
-    print(f"  • Artistas: {', '.join(artists[:5])}{'...' if len(artists) > 5 else ''}")
-    
-    # Confirmar ejecución
-    if len(artists) > 10:
-        confirm = input(f"\n⚠️ Vas a procesar {len(artists)} artistas. ¿Continuar? (y/N): ")
-        if confirm.lower() != 'y':
-            print("❌ Operación cancelada")
-            sys.exit(0)
     
     # Crear scraper y procesar
     try:
-        scraper = BatchArtistScraper(headless=args.headless, delay=args.delay)
-        results = scraper.process_artists_list(artists)
+        scraper = BatchArtistScraper(headless=args.headless, delay=args.delay, adaptive=args.adaptive,
+                                     bloom_filter=args.bloom_filter, variants=args.variants,
+                                     archive=ARCHIVE_CONFIG['path'] if args.archive else None)
+        results = scraper.process_artists_list(prefetch(artists))
         
         if results:
             # Guardar resultados
-            base_filename = args.output if args.output else f"soundexchange_batch_{len(artists)}_artists"
+            base_filename = args.output if args.output else f"soundexchange_batch_{len(results)}_artists"
             
             csv_file = scraper.save_to_csv(results, f"{base_filename}.csv")
             json_file = scraper.save_to_json(results, f"{base_filename}.json")
+            parquet_file = scraper.save_to_parquet(results, f"{base_filename}.parquet") if args.parquet else None
+            history_files = scraper.save_to_history(results) if HISTORY_CONFIG['enabled'] else []
             
             # Mostrar resumen final
             print(f"\n✅ PROCESAMIENTO COMPLETADO")
@@ -412,6 +628,10 @@ Ejemplos de uso:
             print(f"💾 Archivos generados:")
             print(f"   • CSV: {csv_file}")
             print(f"   • JSON: {json_file}")
+            if parquet_file:
+                print(f"   • Parquet: {parquet_file}")
+            if history_files:
+                print(f"   • Historial: {HISTORY_CONFIG['directory']}")
             
         else:
             print("❌ No se obtuvieron resultados")
@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+🎵 Benchmarks - SoundExchange
+=============================
+
+Micro-benchmarks de los caminos críticos de CPU sobre datos fijos.
+
+Cada medición usa fixtures deterministas (mismas respuestas HTML y mismos
+registros en cada corrida) y se compara con la línea base guardada en
+`BENCHMARK_CONFIG['baseline_file']`. Para que la línea base sirva en otras
+máquinas, los tiempos se normalizan con la mediana de una carga de referencia
+de Python puro que se repite entre mediciones. Como en `timeit`, de cada
+medición se toma la repetición más rápida, y una regresión se vuelve a medir
+antes de darla por confirmada. Si alguna medición queda más lenta que la
+línea base por encima de `threshold`, el comando termina con código 1.
+
+Uso:
+    make bench
+    python benchmarks.py --only parse_html --only check_duplicates
+    python benchmarks.py --sizes 1000,100000 --update-baseline
+"""
+
+import gc
+import sys
+import json
+import time
+import random
+import platform
+import argparse
+import tempfile
+import statistics
+from functools import lru_cache
+from datetime import datetime, timedelta
+from html import escape
+import logging
+from typing import List, Dict, Optional, Callable, NamedTuple
+from pathlib import Path
+
+from config import BENCHMARK_CONFIG
+from artist_result import ArtistResult, SearchOutcome, CATEGORY_CODES, CSV_FIELDNAMES, STATUS_OK, STATUS_EMPTY
+from logging_setup import setup_logging
+
+logger = logging.getLogger(__name__)
+
+FIXTURE_SEED = 20240101
+FIXTURE_START = datetime(2026, 1, 1)
+
+
+class Benchmark(NamedTuple):
+    """Medición registrada: `setup(size, workdir)` prepara los datos y retorna la función a medir"""
+    name: str
+    description: str
+    setup: Callable[[int, Path], Callable[[], object]]
+    per_size: bool = True  # False: se mide una sola vez con BENCHMARK_CONFIG['parse_responses']
+
+
+def _fixture_items(rng: random.Random, artist: str) -> List[str]:
+    """Resultados de una categoría: la mayoría vacías, algunas con pocas entradas y pocas con muchas"""
+    roll = rng.random()
+    if roll < 0.8:
+        return []
+    count = rng.randint(1, 5) if roll < 0.97 else rng.randint(20, 60)
+    return [f"{artist} - Track {index} ({rng.randint(1990, 2026)})" for index in range(count)]
+
+
+def make_outcomes(size: int, seed: int = FIXTURE_SEED, prefix: str = 'artist') -> List[tuple]:
+    """Fixture de búsquedas: (artista, resultados por categoría) para `size` artistas"""
+    rng = random.Random(seed)
+    fixtures = []
+    for index in range(size):
+        artist = f"{prefix} {index:07d}"
+        outcomes = {}
+        for code in CATEGORY_CODES:
+            items = _fixture_items(rng, artist)
+            outcomes[code] = SearchOutcome(STATUS_OK if items else STATUS_EMPTY, items)
+        fixtures.append((artist, outcomes))
+    return fixtures
+
+
+@lru_cache(maxsize=2)
+def make_results(size: int, seed: int = FIXTURE_SEED, prefix: str = 'artist') -> List[ArtistResult]:
+    """Fixture de registros compactos con timestamps fijos; se comparte entre mediciones del mismo tamaño"""
+    return [
+        ArtistResult.from_outcomes(artist, outcomes, timestamp=(FIXTURE_START + timedelta(seconds=index)).isoformat())
+        for index, (artist, outcomes) in enumerate(make_outcomes(size, seed, prefix))
+    ]
+
+
+def make_response_body(items: List[str]) -> bytes:
+    """Respuesta de `ulists_get_query` con el mismo formato que devuelve SoundExchange: JSON con HTML"""
+    html = ''.join(
+        f'<div class="uli-search-item"><span class="uli-name">{escape(item)}</span></div>'
+        for item in items
+    )
+    return json.dumps({'success': True, 'html': f'<div class="uli-search-results">{html}</div>'}).encode('utf-8')
+
+
+def make_response_bodies(count: int, seed: int = FIXTURE_SEED) -> List[bytes]:
+    """Fixture de respuestas HTML con la mezcla de vacías, cortas y largas de una corrida real"""
+    rng = random.Random(seed)
+    return [make_response_body(_fixture_items(rng, f"artist {index:07d}")) for index in range(count)]
+
+
+def _setup_parse_html(size: int, workdir: Path) -> Callable[[], object]:
+    from artist_scraper import parse_search_response
+    
+    bodies = make_response_bodies(size)
+    return lambda: [parse_search_response(body) for body in bodies]
+
+
+def _setup_assemble(size: int, workdir: Path) -> Callable[[], object]:
+    fixtures = make_outcomes(size)
+    return lambda: [ArtistResult.from_outcomes(artist, outcomes) for artist, outcomes in fixtures]
+
+
+def _sheets_sync():
+    """GoogleSheetsSync sin autenticar: los métodos medidos no llaman a la API"""
+    from google_sheets_sync import GoogleSheetsSync
+    return GoogleSheetsSync.__new__(GoogleSheetsSync)
+
+
+def _setup_check_duplicates(size: int, workdir: Path) -> Callable[[], object]:
+    sync = _sheets_sync()
+    existing = make_results(size)
+    rows = [record.to_row(CSV_FIELDNAMES) for record in existing]
+    # Mitad de registros ya presentes en la hoja y mitad nuevos
+    new_data = existing[size // 2:] + make_results(size - size // 2, FIXTURE_SEED + 1, prefix='new artist')
+    return lambda: sync.check_duplicates(rows, CSV_FIELDNAMES, new_data)
+
+
+def _setup_prepare_data(size: int, workdir: Path) -> Callable[[], object]:
+    sync = _sheets_sync()
+    records = make_results(size)
+    return lambda: sync.prepare_data_for_sheets(records, CSV_FIELDNAMES)
+
+
+def _batch_scraper():
+    from batch_artist_scraper import BatchArtistScraper
+    return BatchArtistScraper()
+
+
+def _setup_save_csv(size: int, workdir: Path) -> Callable[[], object]:
+    scraper = _batch_scraper()
+    records = make_results(size)
+    return lambda: scraper.save_to_csv(records, str(workdir / 'bench.csv'))
+
+
+def _setup_save_json(size: int, workdir: Path) -> Callable[[], object]:
+    scraper = _batch_scraper()
+    records = make_results(size)
+    return lambda: scraper.save_to_json(records, str(workdir / 'bench.json'))
+
+
+BENCHMARKS = [
+    Benchmark('parse_html', 'Extracción de .uli-search-item (search_artist)', _setup_parse_html, per_size=False),
+    Benchmark('assemble_records', 'Armado de ArtistResult por artista (process_artist)', _setup_assemble),
+    Benchmark('check_duplicates', 'Índice de la hoja y separación de duplicados', _setup_check_duplicates),
+    Benchmark('prepare_data', 'Filas para Google Sheets (prepare_data_for_sheets)', _setup_prepare_data),
+    Benchmark('save_csv', 'Escritura del CSV (save_to_csv)', _setup_save_csv),
+    Benchmark('save_json', 'Escritura del JSON (save_to_json)', _setup_save_json),
+]
+
+
+def measure(func: Callable[[], object], repeats: int = BENCHMARK_CONFIG['repeats'],
+            min_time: float = BENCHMARK_CONFIG['min_time'], max_time: float = BENCHMARK_CONFIG['max_time']) -> float:
+    """Mejor tiempo por llamada de `repeats` mediciones; las funciones rápidas se repiten hasta `min_time`"""
+    # Como timeit: sin recolector, el tiempo no depende de cuántos objetos tengan vivos las fixtures
+    gc.collect()
+    gc.disable()
+    try:
+        return _timed_runs(func, repeats, min_time, max_time)
+    finally:
+        gc.enable()
+
+
+def _timed_runs(func: Callable[[], object], repeats: int, min_time: float, max_time: float) -> float:
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or number >= 10000:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+        
+    best = elapsed / number
+    total = elapsed
+    for _ in range(repeats - 1):
+        # Con 1M de registros una sola llamada ya es estable; repetirla solo alarga la corrida
+        if total >= max_time:
+            break
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        total += elapsed
+        best = min(best, elapsed / number)
+    return best
+
+
+def calibrate() -> float:
+    """Tiempo de una carga fija de Python puro, para comparar mediciones entre máquinas"""
+    def workload():
+        names = [f"artist {index:07d} - track {index % 97}".upper() for index in range(100000)]
+        names.sort(reverse=True)
+        return json.dumps({name: len(name) for name in names[:20000]})
+    return measure(workload)
+
+
+def run_benchmarks(names: Optional[List[str]] = None, sizes: Optional[List[int]] = None) -> Dict[str, Dict]:
+    """Ejecuta las mediciones elegidas; retorna segundos y calibración de cada una con clave 'nombre[tamaño]'"""
+    selected = [benchmark for benchmark in BENCHMARKS if not names or benchmark.name in names]
+    runs = [(benchmark, BENCHMARK_CONFIG['parse_responses']) for benchmark in selected if not benchmark.per_size]
+    # Por tamaño y después por medición, para armar cada fixture grande una sola vez
+    runs += [(benchmark, size) for size in sizes or BENCHMARK_CONFIG['sizes'] for benchmark in selected
+             if benchmark.per_size]
+    results = {}
+    
+    # Los métodos medidos registran cada llamada en INFO
+    logging.disable(logging.INFO)
+    try:
+        with tempfile.TemporaryDirectory(prefix='soundexchange_bench_') as workdir:
+            calibrations = [calibrate()]
+            for benchmark, size in runs:
+                key = f"{benchmark.name}[{size}]"
+                results[key] = {'seconds': measure(benchmark.setup(size, Path(workdir)))}
+                # La calibración se repite entre mediciones; la mediana resiste una racha de carga
+                calibrations.append(calibrate())
+                print(f"  ⏱️ {key}: {results[key]['seconds']:.4f}s", flush=True)
+    finally:
+        logging.disable(logging.NOTSET)
+        make_results.cache_clear()
+        
+    calibration = statistics.median(calibrations)
+    for result in results.values():
+        result['calibration'] = calibration
+    return results
+
+
+def load_baseline(path: str = BENCHMARK_CONFIG['baseline_file']) -> Dict:
+    """Lee la línea base; vacía si todavía no existe"""
+    if not Path(path).exists():
+        return {'results': {}}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_baseline(results: Dict[str, Dict], path: str = BENCHMARK_CONFIG['baseline_file']):
+    """Guarda las mediciones como línea base, conservando las que no se midieron en esta corrida"""
+    merged = dict(load_baseline(path)['results'])
+    merged.update(results)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'updated': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'results': {key: merged[key] for key in sorted(merged)}
+        }, f, indent=2)
+        f.write('\n')
+
+
+def compare(results: Dict[str, Dict], baseline: Dict,
+            threshold: float = BENCHMARK_CONFIG['threshold']) -> List[Dict]:
+    """Compara cada medición normalizada con la línea base; marca las regresiones sobre el umbral"""
+    comparisons = []
+    for key, result in results.items():
+        base = baseline['results'].get(key)
+        comparison = {'benchmark': key, 'seconds': result['seconds'], 'calibration': result['calibration'],
+                      'baseline': None, 'ratio': None, 'regression': False}
+        if base is not None:
+            ratio = (result['seconds'] / result['calibration']) / (base['seconds'] / base['calibration'])
+            comparison.update(baseline=base['seconds'], ratio=ratio, regression=ratio > 1 + threshold)
+        comparisons.append(comparison)
+    return comparisons
+
+
+def recheck(comparisons: List[Dict], baseline: Dict,
+            threshold: float = BENCHMARK_CONFIG['threshold']) -> List[Dict]:
+    """Vuelve a medir las regresiones para que una racha de carga en la máquina no haga fallar la corrida"""
+    rechecked = []
+    for comparison in comparisons:
+        key = comparison['benchmark']
+        name, size = key.rstrip(']').split('[')
+        for _ in range(BENCHMARK_CONFIG['rechecks']):
+            if not comparison['regression']:
+                break
+            result = run_benchmarks([name], [int(size)])[key]
+            # Igual que dentro de cada medición, cuenta la más rápida (ya normalizada)
+            if comparison['seconds'] / comparison['calibration'] < result['seconds'] / result['calibration']:
+                result = {'seconds': comparison['seconds'], 'calibration': comparison['calibration']}
+            comparison = compare({key: result}, baseline, threshold)[0]
+        rechecked.append(comparison)
+    return rechecked
+
+
+def main():
+    """Función principal"""
+    setup_logging('benchmarks.log')
+    parser = argparse.ArgumentParser(
+        description="Micro-benchmarks de los caminos críticos de CPU con umbral de regresión",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Ejemplos de uso:
+  python benchmarks.py
+  python benchmarks.py --only parse_html --only check_duplicates
+  python benchmarks.py --sizes 1000,100000 --threshold 0.5
+  python benchmarks.py --update-baseline
+        """
+    )
+    
+    parser.add_argument('--only', action='append', choices=[benchmark.name for benchmark in BENCHMARKS],
+                        help='Ejecutar solo esta medición (repetible)')
+    parser.add_argument('--sizes', type=str, help='Tamaños separados por comas (default: 1000,100000,1000000)')
+    parser.add_argument('--threshold', type=float, default=BENCHMARK_CONFIG['threshold'],
+                        help='Lentitud máxima tolerada sobre la línea base (0.25 = 25%%)')
+    parser.add_argument('--baseline', type=str, default=BENCHMARK_CONFIG['baseline_file'],
+                        help='Archivo JSON de la línea base')
+    parser.add_argument('--update-baseline', action='store_true', help='Guardar esta corrida como línea base')
+    
+    args = parser.parse_args()
+    
+    sizes = [int(size) for size in args.sizes.split(',')] if args.sizes else None
+    
+    print(f"🧪 Benchmarks ({platform.python_version()}, {platform.machine()})")
+    results = run_benchmarks(args.only, sizes)
+    
+    if args.update_baseline:
+        save_baseline(results, args.baseline)
+        print(f"💾 Línea base actualizada: {args.baseline} ({len(results)} mediciones)")
+        return
+        
+    baseline = load_baseline(args.baseline)
+    comparisons = compare(results, baseline, args.threshold)
+    if any(comparison['regression'] for comparison in comparisons):
+        print(f"\n🔁 Confirmando las mediciones sobre el umbral...")
+        comparisons = recheck(comparisons, baseline, args.threshold)
+    print(f"\n📊 Comparación con la línea base (umbral +{args.threshold:.0%}):")
+    for comparison in comparisons:
+        if comparison['ratio'] is None:
+            print(f"  🆕 {comparison['benchmark']}: {comparison['seconds']:.4f}s (sin línea base)")
+        else:
+            icon = '❌' if comparison['regression'] else '✅'
+            print(f"  {icon} {comparison['benchmark']}: {comparison['seconds']:.4f}s "
+                  f"(base {comparison['baseline']:.4f}s, {comparison['ratio'] - 1:+.0%} normalizado)")
+    
+    regressions = [comparison for comparison in comparisons if comparison['regression']]
+    if regressions:
+        print(f"\n❌ {len(regressions)} regresiones sobre el umbral")
+        sys.exit(1)
+    print(f"\n✅ Sin regresiones")
+
+
+if __name__ == "__main__":
+    main()
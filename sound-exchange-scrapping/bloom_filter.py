@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+🎵 Bloom Filter - SoundExchange
+===============================
+
+Filtros Bloom por categoría para descartar búsquedas sin resultados seguros.
+
+Cada filtro guarda los tokens (palabras, sin puntuación) de las entradas de
+una categoría (UA, PUA, UP, USRO). Si algún token del nombre buscado no está
+en el filtro, el artista no puede aparecer en esa categoría y la búsqueda se
+omite. Eso solo es cierto si el filtro se construyó con el listado completo
+de la categoría: sin un listado (`--entries`) no se genera filtro, y los
+resultados previos solo complementan un listado. Una fracción configurable de
+los descartes se verifica igual contra SoundExchange para detectar filtros
+desactualizados, y las categorías omitidas quedan indicadas en el estado.
+
+Uso:
+    python bloom_filter.py build filtros.bloom ~/Downloads/ --entries UA=ua.txt
+    python bloom_filter.py check filtros.bloom "bad bunny"
+"""
+
+import re
+import math
+import struct
+import hashlib
+import argparse
+from datetime import datetime
+import logging
+from typing import List, Dict, Iterable, Optional
+from pathlib import Path
+
+from config import BLOOM_CONFIG
+from artist_result import ArtistResult, CATEGORY_CODES
+from artist_scraper import normalize_artist_name
+from logging_setup import setup_logging
+
+logger = logging.getLogger(__name__)
+
+BLOOM_MAGIC = b'SXBLOOM1'
+# Versión 2: tokens sin puntuación y filtros solo de categorías con listado completo
+BLOOM_VERSION = 2
+
+# magic, versión, fecha de construcción (epoch), cantidad de filtros
+HEADER_STRUCT = struct.Struct('<8sIqI')
+# Por filtro: categoría, bits, funciones hash, elementos agregados
+FILTER_STRUCT = struct.Struct('<8sQIQ')
+
+
+def entry_tokens(name: str) -> List[str]:
+    """Retorna las palabras de un nombre en minúsculas, sin puntuación ('Bad Bunny, J Balvin' -> bunny, j)"""
+    return re.findall(r'\w+', normalize_artist_name(name))
+
+
+class BloomFilter:
+    """Filtro Bloom con doble hashing sobre un bytearray"""
+    
+    def __init__(self, num_bits: int, num_hashes: int, count: int = 0, bits: Optional[bytearray] = None):
+        self.num_bits = max(num_bits, 8)
+        self.num_hashes = max(num_hashes, 1)
+        self.count = count
+        self.bits = bits if bits is not None else bytearray((self.num_bits + 7) // 8)
+    
+    @classmethod
+    def for_capacity(cls, capacity: int, error_rate: float = BLOOM_CONFIG['error_rate']) -> 'BloomFilter':
+        """Crea un filtro dimensionado para la capacidad y tasa de falsos positivos indicadas"""
+        capacity = max(capacity, 1)
+        num_bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        num_hashes = round(num_bits / capacity * math.log(2))
+        return cls(num_bits, num_hashes)
+    
+    def _positions(self, item: str) -> Iterable[int]:
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return ((first + i * second) % self.num_bits for i in range(self.num_hashes))
+    
+    def add(self, item: str):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+    
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class CategoryFilters:
+    """Conjunto de filtros Bloom por categoría con su fecha de construcción"""
+    
+    def __init__(self, filters: Dict[str, BloomFilter], built_at: Optional[datetime] = None):
+        self.filters = filters
+        self.built_at = built_at or datetime.now()
+    
+    @classmethod
+    def build(cls, entries: Dict[str, Iterable[str]], complete: Iterable[str],
+              error_rate: float = BLOOM_CONFIG['error_rate']) -> 'CategoryFilters':
+        """Construye los filtros de las categorías con listado completo (complete) a partir de sus entradas"""
+        filters = {}
+        complete = set(complete)
+        for code, names in entries.items():
+            # Con entradas parciales un descarte podría ocultar un artista que sí aparece
+            if code not in complete:
+                logger.warning(f"⚠️ Sin listado completo de {code}; no se genera filtro")
+                continue
+            tokens = {token for name in names for token in entry_tokens(name)}
+            # Sin entradas no hay información: la categoría se sigue buscando siempre
+            if not tokens:
+                logger.warning(f"⚠️ Sin entradas para {code}; no se genera filtro")
+                continue
+            bloom = BloomFilter.for_capacity(len(tokens), error_rate)
+            for token in tokens:
+                bloom.add(token)
+            filters[code] = bloom
+            logger.info(f"🧮 Filtro {code}: {len(tokens)} tokens, {bloom.num_bits // 8} bytes")
+        return cls(filters)
+    
+    def might_contain(self, code: str, artist: str) -> bool:
+        """False solo si el artista seguro no aparece en la categoría"""
+        bloom = self.filters.get(code)
+        if bloom is None:
+            return True
+        return all(token in bloom for token in entry_tokens(artist))
+    
+    def age_days(self) -> float:
+        return (datetime.now() - self.built_at).total_seconds() / 86400
+    
+    def save(self, filepath: str) -> str:
+        """Guarda los filtros y la fecha de construcción en un archivo binario"""
+        filepath = Path(filepath)
+        tmp_file = filepath.with_suffix(filepath.suffix + '.tmp')
+        with open(tmp_file, 'wb') as f:
+            f.write(HEADER_STRUCT.pack(BLOOM_MAGIC, BLOOM_VERSION, int(self.built_at.timestamp()), len(self.filters)))
+            for code, bloom in self.filters.items():
+                f.write(FILTER_STRUCT.pack(code.encode('ascii'), bloom.num_bits, bloom.num_hashes, bloom.count))
+                f.write(bloom.bits)
+        tmp_file.replace(filepath)
+        logger.info(f"💾 Filtros guardados: {filepath}")
+        return str(filepath)
+    
+    @classmethod
+    def load(cls, filepath: str) -> 'CategoryFilters':
+        """Carga los filtros guardados con save()"""
+        with open(filepath, 'rb') as f:
+            data = f.read()
+            
+        magic, version, built_at, count = HEADER_STRUCT.unpack_from(data, 0)
+        if magic != BLOOM_MAGIC or version != BLOOM_VERSION:
+            raise ValueError(f"{filepath} no es un archivo de filtros válido")
+            
+        filters = {}
+        offset = HEADER_STRUCT.size
+        for _ in range(count):
+            code, num_bits, num_hashes, items = FILTER_STRUCT.unpack_from(data, offset)
+            offset += FILTER_STRUCT.size
+            size = (num_bits + 7) // 8
+            filters[code.rstrip(b'\x00').decode('ascii')] = BloomFilter(
+                num_bits, num_hashes, items, bytearray(data[offset:offset + size])
+            )
+            offset += size
+            
+        return cls(filters, datetime.fromtimestamp(built_at))
+
+
+def collect_entries(sources: List[str], entry_files: List[str]) -> Dict[str, List[str]]:
+    """Junta las entradas por categoría desde resultados previos y listados por categoría"""
+    from entry_snapshot import load_records
+    
+    entries = {code: [] for code in CATEGORY_CODES}
+    for record in load_records(sources):
+        if not isinstance(record, ArtistResult):
+            record = ArtistResult.from_record(record)
+        for code in CATEGORY_CODES:
+            entries[code].extend(record.category(code))
+            
+    # Listados completos de una categoría: CODE=archivo.txt, una entrada por línea
+    for entry_file in entry_files:
+        code, _, filepath = entry_file.partition('=')
+        with open(filepath, 'r', encoding='utf-8') as f:
+            entries[code.upper()].extend(line.strip() for line in f if line.strip())
+            
+    return entries
+
+
+def main():
+    """Función principal"""
+    setup_logging('bloom_filter.log')
+    parser = argparse.ArgumentParser(
+        description="Filtros Bloom por categoría para omitir búsquedas sin resultados",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Ejemplos de uso:
+  python bloom_filter.py build filtros.bloom ~/Downloads/ --entries UA=ua.txt
+  python bloom_filter.py build filtros.bloom --entries UA=ua.txt --entries USRO=usro.txt
+  python bloom_filter.py check filtros.bloom "bad bunny" "emilia"
+        """
+    )
+    
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    build_parser = subparsers.add_parser('build', help='Construir los filtros')
+    build_parser.add_argument('filters', type=str, help='Archivo de filtros a generar')
+    build_parser.add_argument('sources', nargs='*', help='Resultados previos (CSV o Parquet) que complementan los listados')
+    build_parser.add_argument('--entries', action='append', default=[],
+                              help='Listado de una categoría como CODE=archivo.txt (repetible)')
+    build_parser.add_argument('--error-rate', type=float, default=BLOOM_CONFIG['error_rate'],
+                              help='Tasa de falsos positivos')
+    
+    check_parser = subparsers.add_parser('check', help='Consultar artistas en los filtros')
+    check_parser.add_argument('filters', type=str, help='Archivo de filtros')
+    check_parser.add_argument('artists', nargs='+', help='Artistas a consultar')
+    
+    args = parser.parse_args()
+    
+    if args.command == 'build':
+        if not args.entries:
+            parser.error("Los filtros requieren el listado completo de al menos una categoría (--entries)")
+        complete = {entry.partition('=')[0].upper() for entry in args.entries}
+        filters = CategoryFilters.build(collect_entries(args.sources, args.entries), complete, args.error_rate)
+        filters.save(args.filters)
+        print(f"✅ Filtros generados: {args.filters}")
+        return
+        
+    filters = CategoryFilters.load(args.filters)
+    print(f"🧮 Filtros del {filters.built_at:%Y-%m-%d %H:%M}")
+    for artist in args.artists:
+        possible = [code for code in CATEGORY_CODES if filters.might_contain(code, artist)]
+        print(f"  • {artist}: {', '.join(possible) if possible else 'descartado en todas las categorías'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+🎵 Columnar Store - SoundExchange
+=================================
+
+Salida en Parquet (Apache Arrow) para los resultados del scraper.
+
+Cada categoría (UA, PUA, UP, USRO) se guarda como una columna de tipo lista,
+los nombres de artistas y estados van codificados como diccionario y los
+metadatos de la corrida quedan en el footer del archivo. Los archivos se
+ordenan por artista para que las estadísticas de cada row group permitan
+filtrar por artista y estado sin leer todo el archivo.
+
+Uso:
+    python columnar_store.py resultados/ --artist "bad bunny" --status Found
+"""
+
+import json
+import argparse
+from datetime import datetime
+import logging
+from typing import List, Dict, Optional, Iterable, Iterator, Union
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from artist_result import ArtistResult, CATEGORY_CODES
+from artist_scraper import normalize_artist_name
+from logging_setup import setup_logging
+
+logger = logging.getLogger(__name__)
+
+# Clave de los metadatos de la corrida en el footer del Parquet
+RUN_METADATA_KEY = b'soundexchange.run'
+
+RESULTS_SCHEMA = pa.schema(
+    [
+        pa.field('artist_name', pa.dictionary(pa.int32(), pa.string())),
+        pa.field('timestamp', pa.timestamp('us')),
+        pa.field('total_results', pa.int32()),
+        pa.field('categories_with_results', pa.int8()),
+    ]
+    + [pa.field(f'{code}_count', pa.int32()) for code in CATEGORY_CODES]
+    + [pa.field(f'{code}_results', pa.list_(pa.string())) for code in CATEGORY_CODES]
+    + [pa.field('status', pa.dictionary(pa.int32(), pa.string()))]
+)
+
+
+def _parse_timestamp(value: str) -> Optional[datetime]:
+    """Convierte un timestamp ISO a datetime (None si no es válido)"""
+    try:
+        return datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+
+
+def results_to_table(records: Iterable[Union[ArtistResult, Dict]],
+                     metadata: Optional[Dict] = None) -> pa.Table:
+    """Convierte los registros del scraper en una tabla Arrow ordenada por artista"""
+    records = [record if isinstance(record, ArtistResult) else ArtistResult.from_record(record)
+               for record in records]
+    
+    columns = {
+        'artist_name': [record.artist_name for record in records],
+        'timestamp': [_parse_timestamp(record.timestamp) for record in records],
+        'total_results': [record.total_results for record in records],
+        'categories_with_results': [record.categories_with_results for record in records],
+    }
+    for index, code in enumerate(CATEGORY_CODES):
+        columns[f'{code}_count'] = [len(record.results[index]) for record in records]
+    for index, code in enumerate(CATEGORY_CODES):
+        columns[f'{code}_results'] = [list(record.results[index]) for record in records]
+    columns['status'] = [record.status for record in records]
+    
+    table = pa.Table.from_pydict(columns, schema=RESULTS_SCHEMA)
+    
+    # Ordenar por artista para que las estadísticas por row group sirvan de índice
+    if table.num_rows:
+        order = pc.sort_indices(table.column('artist_name').cast(pa.string()))
+        table = table.take(order)
+        
+    if metadata:
+        run_metadata = json.dumps(metadata, ensure_ascii=False, default=str).encode('utf-8')
+        table = table.replace_schema_metadata({RUN_METADATA_KEY: run_metadata})
+        
+    return table
+
+
+def write_parquet(records: Iterable[Union[ArtistResult, Dict]], filepath: str,
+                  metadata: Optional[Dict] = None, row_group_size: int = 50000) -> str:
+    """Guarda los registros en un archivo Parquet con los metadatos de la corrida"""
+    table = results_to_table(records, metadata)
+    pq.write_table(
+        table,
+        filepath,
+        compression='zstd',
+        row_group_size=row_group_size,
+        write_statistics=True
+    )
+    logger.info(f"💾 {table.num_rows} registros guardados en Parquet: {filepath}")
+    return str(filepath)
+
+
+def read_run_metadata(filepath: str) -> Dict:
+    """Lee los metadatos de la corrida desde el footer de un archivo Parquet"""
+    schema_metadata = pq.read_schema(filepath).metadata or {}
+    raw = schema_metadata.get(RUN_METADATA_KEY)
+    return json.loads(raw.decode('utf-8')) if raw else {}
+
+
+def read_results(source: Union[str, List[str]], artists: Optional[List[str]] = None,
+                 status: Optional[List[str]] = None, columns: Optional[List[str]] = None) -> pa.Table:
+    """Lee uno o varios archivos/directorios Parquet filtrando por artista y estado"""
+    dataset = ds.dataset(source, format='parquet')
+    
+    expression = None
+    if artists:
+        expression = ds.field('artist_name').isin(artists)
+    if status:
+        status_filter = ds.field('status').isin(status)
+        expression = status_filter if expression is None else expression & status_filter
+        
+    return dataset.to_table(columns=columns, filter=expression)
+
+
+def _row_to_result(record: Dict) -> ArtistResult:
+    """Convierte una fila leída del Parquet en ArtistResult"""
+    timestamp = record['timestamp'].isoformat() if record['timestamp'] else ''
+    results = tuple(tuple(record[f'{code}_results'] or ()) for code in CATEGORY_CODES)
+    status = record['status'] if record['status'] not in ('Found', 'Not Found') else None
+    return ArtistResult(record['artist_name'], timestamp, results, status)
+
+
+def iter_results(source: Union[str, List[str]], batch_size: int = 10000) -> Iterator[ArtistResult]:
+    """Recorre todas las filas de los archivos Parquet por lotes, sin cargarlos completos"""
+    for batch in ds.dataset(source, format='parquet').to_batches(batch_size=batch_size):
+        for record in batch.to_pylist():
+            yield _row_to_result(record)
+
+
+def load_latest_results(source: Union[str, List[str]]) -> Dict[str, ArtistResult]:
+    """Retorna el resultado más reciente de cada artista (normalizado) en los archivos Parquet"""
+    table = read_results(source).sort_by([('timestamp', 'descending')])
+    
+    # Primera fila (la más reciente) de cada artista, sin materializar todo el historial
+    first_rows = {}
+    for index, name in enumerate(table.column('artist_name').to_pylist()):
+        key = normalize_artist_name(name or '')
+        if key and key not in first_rows:
+            first_rows[key] = index
+            
+    latest = {key: _row_to_result(record)
+              for key, record in zip(first_rows, table.take(list(first_rows.values())).to_pylist())}
+        
+    logger.info(f"📊 Último resultado conocido para {len(latest)} artistas en {source}")
+    return latest
+
+def main():
+    """Función principal"""
+    setup_logging('columnar_store.log')
+    parser = argparse.ArgumentParser(
+        description="Consulta de resultados guardados en Parquet",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Ejemplos de uso:
+  python columnar_store.py resultados/
+  python columnar_store.py resultados/ --artist "bad bunny" --status Found
+        """
+    )
+    
+    parser.add_argument('source', type=str, help='Archivo o directorio Parquet')
+    parser.add_argument('--artist', action='append', help='Filtrar por artista (repetible)')
+    parser.add_argument('--status', action='append', help='Filtrar por estado (repetible)')
+    
+    args = parser.parse_args()
+    
+    table = read_results(args.source, artists=args.artist, status=args.status)
+    print(f"📊 Registros: {table.num_rows}")
+    for record in table.slice(0, 20).to_pylist():
+        found = {code: record[f'{code}_results'] for code in CATEGORY_CODES if record[f'{code}_results']}
+        print(f"  • {record['artist_name']} ({record['status']}, {record['timestamp']}): {found or 'sin resultados'}")
+    if table.num_rows > 20:
+        print(f"  ... y {table.num_rows - 20} más")
+
+
+if __name__ == "__main__":
+    main()
@@ -30,6 +30,156 @@ SYNC_CONFIG = {
     'duplicate_key_fields': ['artist_name', 'timestamp'],  # Campos para identificar duplicados
     'update_existing': False,  # Si True, actualiza registros existentes; si False, solo agrega nuevos
     'batch_size': 100,  # Número de registros a procesar por lote
+    'csv_chunk_size': 5000,  # Filas leídas por bloque al sincronizar un CSV existente
+    'pipeline_queue_size': 500,  # Registros en espera entre el scraper y la sincronización
+    'pipeline_flush_seconds': 120,  # Publicar un lote incompleto si pasó este tiempo
+    'read_window_rows': 10000,  # Filas por ventana al leer la hoja existente
+    'read_windows_per_request': 4,  # Ventanas pedidas juntas en cada batchGet
+}
+
+# Particionado del historial en pestañas por período
+PARTITION_CONFIG = {
+    'enabled': False,  # Si True, los resultados se agregan en pestañas por período
+    'tab_prefix': 'Resultados',  # Nombre base de las pestañas ("Resultados 2026-10")
+    'period_format': '%Y-%m',  # Un período por mes
+    'max_rows_per_tab': 100000,  # Al superarlo se abre otra pestaña del mismo período
+    'index_sheet': 'Índice',  # Pestaña con las filas y el rango de timestamps de cada partición
+}
+
+# Filtros Bloom para omitir búsquedas que seguro no tienen resultados
+BLOOM_CONFIG = {
+    'error_rate': 0.01,  # Tasa de falsos positivos de cada filtro
+    'verify_rate': 0.05,  # Fracción de descartes que se busca igual para detectar filtros desactualizados
+    'max_age_days': 30,  # Avisar si el filtro es más antiguo
+}
+
+# Variantes de nombres que se buscan para cada artista
+NAME_VARIANT_CONFIG = {
+    'max_variants': 4,  # Formas de búsqueda por artista, incluyendo el nombre original
+    'feature_markers': ['feat.', 'feat', 'ft.', 'ft', 'featuring'],  # Se corta el nombre desde aquí si sigue otro nombre
+    'company_suffixes': ['llc', 'inc', 'ltd', 'sa', 's.a.', 'srl', 's.r.l.', 'sas', 'corp'],  # Los puntos son opcionales
+    'min_length': 3,  # Las variantes más cortas no se buscan (devuelven listas enormes y ajenas)
+    'stop_words': ['the', 'los', 'las', 'la', 'el', 'lo', 'a', 'and', 'y', 'de', 'del', '&'],  # Variantes solo con estas palabras no se buscan
+}
+
+# Entrada de artistas en streaming
+INPUT_CONFIG = {
+    'default_column': 'artist_name',  # Columna de artistas en catálogos CSV/Parquet
+    'queue_size': 1000,  # Artistas leídos por adelantado
+    'parquet_batch_size': 10000,  # Filas por lote al leer un Parquet
+}
+
+# Historial de resultados en Parquet, particionado por fecha de corrida
+HISTORY_CONFIG = {
+    'enabled': True,  # Agregar los resultados de cada corrida al historial
+    'directory': str(Path.home() / "Downloads" / "soundexchange_history"),
+    'row_group_size': 50000,
+}
+
+# Spool local para sincronizaciones concurrentes con un único escritor
+SPOOL_CONFIG = {
+    'directory': str(Path.home() / "Downloads" / "soundexchange_spool"),
+    'append_batch_rows': 5000,  # Filas por append al vaciar el spool
+    'max_passes': 10,  # Pasadas por vaciado si siguen llegando archivos
+}
+
+# Detección de duplicados con hashes de 64 bits
+DEDUP_CONFIG = {
+    # Regla por campo clave: 'exact', 'strip', 'lower' o 'name' (minúsculas y espacios simples)
+    'key_normalization': {},
+    'rows_per_block': 100000,  # Filas de la hoja hasheadas por bloque
+    'buffer_hashes': 65536,  # Claves agregadas que se acumulan en un buffer antes de fusionarlas con el índice
+}
+
+# Transporte HTTP de las búsquedas
+TRANSPORT_CONFIG = {
+    'backend': 'requests',  # 'requests' o 'httpx' (HTTP/2 multiplexado, requiere httpx[http2])
+    'http2': True,  # Solo con backend 'httpx'
+    'pool_connections': 4,  # Hosts con pool propio
+    'pool_maxsize': 16,  # Conexiones keep-alive por host
+    'keep_alive': True,
+    'max_retries': 0,  # Reintentos de conexión del adapter (los de búsqueda están en RETRY_CONFIG)
+    'timeout': 30,
+    'accept_encoding': None,  # None: anunciar las compresiones instaladas (zstd, br, gzip, deflate)
+}
+
+# Cola de trabajo distribuida entre varias máquinas (work_queue.py)
+WORK_QUEUE_CONFIG = {
+    'database': str(Path.home() / "Downloads" / "soundexchange_work_queue.db"),  # Base SQLite del coordinador
+    'host': '127.0.0.1',  # Para workers remotos: --host 0.0.0.0 (requiere auth_token o --token)
+    'port': 8766,
+    'auth_token': None,  # Si se define, los workers deben enviarlo en el header X-Queue-Token
+    'lease_seconds': 300,  # Duración de un lease; si vence sin resultado la tarea vuelve a la cola
+    'heartbeat_interval': 60,  # Segundos entre renovaciones del lease mientras el worker trabaja
+    'claim_batch': 8,  # Tareas (artista, categoría) por pedido de un worker
+    'max_attempts': 3,  # Intentos por tarea antes de darla por fallida
+    'poll_interval': 10,  # Segundos de espera de un worker cuando la cola está vacía
+    'cookie_ttl': 1200,  # Segundos antes de que un worker renueve su cookie Cloudflare
+}
+
+# Archivo de respuestas crudas para volver a parsear sin repetir búsquedas (response_archive.py)
+ARCHIVE_CONFIG = {
+    'enabled': False,  # Archivar las respuestas de todas las corridas (o --archive por corrida)
+    'path': str(Path.home() / "Downloads" / "soundexchange_archive.db"),
+    'compression_level': 3,  # Nivel de zstd (zlib si pyarrow no trae zstd)
+    'reparse_chunk': 500,  # Respuestas distintas por tarea al re-parsear en paralelo
+}
+
+# Micro-benchmarks de los caminos críticos de CPU (benchmarks.py, make bench)
+BENCHMARK_CONFIG = {
+    'baseline_file': 'benchmark_baselines.json',  # Línea base versionada en el repositorio
+    'sizes': [1000, 100000, 1000000],  # Registros por medición
+    'parse_responses': 1000,  # Respuestas HTML por medición de la extracción
+    'threshold': 0.25,  # Fracción de lentitud sobre la línea base que cuenta como regresión
+    'repeats': 5,  # Se toma la mejor de N mediciones
+    'min_time': 0.2,  # Segundos mínimos por medición (las rápidas se repiten en bucle)
+    'max_time': 10.0,  # Sin más repeticiones si una medición ya superó estos segundos
+    'rechecks': 2,  # Veces que se vuelve a medir una regresión antes de confirmarla
+}
+
+# Reintentos al final del lote para las búsquedas (artista, categoría) que fallaron
+RETRY_CONFIG = {
+    'max_retries': 3,
+    'backoff_base': 5.0,  # Segundos antes del primer reintento; se duplica en cada pasada
+    'backoff_max': 60.0,
+}
+
+# Configuración del control adaptativo de ritmo (--adaptive)
+ADAPTIVE_CONFIG = {
+    'initial_delay': 2.0,  # Delay inicial entre inicios de peticiones
+    'min_delay': 0.25,
+    'max_delay': 30.0,
+    'max_concurrency': 4,  # Peticiones simultáneas como máximo
+    'delay_step': 0.25,  # Reducción aditiva del delay tras una racha sana
+    'decrease_factor': 0.5,  # Factor multiplicativo ante throttling o errores
+    'successes_per_increase': 8,  # Respuestas sanas consecutivas para aumentar el ritmo
+    'latency_spike_factor': 3.0,  # Latencia sobre el promedio que cuenta como pico
+    'min_spike_latency': 2.0,  # Segundos mínimos para considerar un pico
+    'cooldown': 5.0,  # Segundos entre reducciones consecutivas
+}
+
+# Configuración del servicio de consultas (lookup_service.py)
+SERVICE_CONFIG = {
+    'host': '127.0.0.1',
+    'port': 8765,
+    'cookie_ttl': 1200,  # Segundos antes de renovar la cookie Cloudflare
+    'cache_ttl': 3600,  # Segundos que se reutiliza un resultado ya consultado
+    'max_workers': 4,  # Hilos que atienden consultas (el acceso a SoundExchange es secuencial)
+    'request_timeout': 120,  # Segundos máximos de espera en /artist
+    'max_cache_entries': 10000,  # Resultados en cache; al superarlo se descartan los menos usados
+    'job_retention': 3600,  # Segundos que se conservan los jobs terminados
+    'prune_interval': 60,  # Segundos mínimos entre limpiezas de cache y jobs vencidos
+    'adaptive': True,  # Ritmo con el controlador AIMD: las 4 categorías salen en paralelo sin esperar --delay
+}
+
+# Configuración del planificador de re-escaneo (rescan_scheduler.py)
+SCHEDULER_CONFIG = {
+    'state_file': 'rescan_state.json',  # Historial de chequeos por artista
+    'request_budget': 400,  # Peticiones a SoundExchange por corrida (4 por artista)
+    'min_interval_hours': 24,  # Intervalo para artistas que cambian seguido o tienen resultados
+    'max_interval_hours': 24 * 30,  # Intervalo para artistas estables
+    'recent_results_days': 30,  # Artistas con resultados en esta ventana usan el intervalo mínimo
+    'min_priority': 1.0,  # Solo se re-escanean artistas vencidos (antigüedad / intervalo)
 }
 
 # Configuración de logging
@@ -37,4 +187,6 @@ LOGGING_CONFIG = {
     'level': 'INFO',
     'format': '%(asctime)s - %(levelname)s - %(message)s',
     'file': 'google_sheets_sync.log',
+    'json_lines': False,  # Si True, el archivo de log se escribe en JSONL
+    'request_sample_every': 10,  # Mostrar 1 de cada N líneas por petición (1 = todas)
 }
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+🎵 Dedup Engine - SoundExchange
+===============================
+
+Detección de duplicados por lotes con hashes de 64 bits.
+
+En lugar de guardar un string "artista|timestamp" por fila en un set, los
+campos clave de cada bloque de filas se normalizan, se hashean a un entero de
+64 bits por fila y se guardan en un array de NumPy ordenado y sin repetidos.
+Separar registros nuevos de duplicados es un join ordenado de todo el bloque
+contra ese array (`np.searchsorted` sobre las claves nuevas ordenadas): un
+millón de claves ocupan 8 MB en lugar de ~100 MB de strings. Las claves que
+se agregan de a pocas (cada micro-lote sincronizado) van a un buffer ordenado
+chico y se fusionan con el array principal recién cuando el buffer supera
+`DEDUP_CONFIG['buffer_hashes']`, así que agregar y consultar no reordena todo
+el índice en cada lote.
+
+Los hashes usan `hash()` de Python sobre la tupla de campos, que está
+aleatorizado por proceso: el índice vive solo en memoria y nunca se guarda.
+La probabilidad de que dos claves distintas compartan hash es del orden de
+n² / 2⁶⁵ (≈ 3·10⁻⁸ para un millón de filas); en ese caso un registro nuevo
+se tomaría como duplicado.
+
+Uso:
+    python dedup_engine.py --benchmark 1000000
+"""
+
+import sys
+import time
+import argparse
+import logging
+from typing import List, Dict, Optional, Iterable, Sequence, Tuple
+
+import numpy as np
+
+from config import SYNC_CONFIG, DEDUP_CONFIG
+from artist_scraper import normalize_artist_name
+from logging_setup import setup_logging
+
+logger = logging.getLogger(__name__)
+
+# Reglas de normalización por campo clave
+NORMALIZERS = {
+    'exact': None,
+    'strip': str.strip,
+    'lower': lambda value: value.strip().lower(),
+    'name': normalize_artist_name,
+}
+
+
+def normalize_column(values: Sequence[str], rule: str) -> Sequence[str]:
+    """Aplica una regla de normalización a una columna de claves"""
+    if rule not in NORMALIZERS:
+        raise ValueError(f"Regla de normalización desconocida: {rule}")
+    normalizer = NORMALIZERS[rule]
+    return values if normalizer is None else list(map(normalizer, values))
+
+
+def hash_key_columns(columns: List[Sequence[str]]) -> np.ndarray:
+    """Retorna el hash de 64 bits de cada fila a partir de sus columnas clave ya normalizadas"""
+    count = len(columns[0]) if columns else 0
+    return np.fromiter(map(hash, zip(*columns)), dtype=np.int64, count=count).view(np.uint64)
+
+
+class HashedKeyIndex:
+    """Índice de claves de duplicado como array ordenado de hashes de 64 bits"""
+    
+    def __init__(self, key_fields: Optional[List[str]] = None, normalization: Optional[Dict[str, str]] = None):
+        self.key_fields = list(key_fields or SYNC_CONFIG['duplicate_key_fields'])
+        self.normalization = DEDUP_CONFIG['key_normalization'] if normalization is None else normalization
+        self._hashes = np.empty(0, dtype=np.uint64)
+        # Hashes agregados hace poco: ordenados, sin repetidos y ausentes del array principal
+        self._recent = np.empty(0, dtype=np.uint64)
+        # Hashes agregados todavía sin ordenar
+        self._pending: List[np.ndarray] = []
+    
+    def __len__(self) -> int:
+        self._flush_pending()
+        return len(self._hashes) + len(self._recent)
+    
+    @staticmethod
+    def _lookup(existing: np.ndarray, hashes: np.ndarray) -> np.ndarray:
+        """Máscara de los hashes presentes en un array ordenado (join ordenado)"""
+        if not len(existing) or not len(hashes):
+            return np.zeros(len(hashes), dtype=bool)
+        # Ordenar las claves buscadas hace que searchsorted recorra el array en orden
+        order = np.argsort(hashes, kind='stable')
+        wanted = hashes[order]
+        positions = np.searchsorted(existing, wanted)
+        positions[positions == len(existing)] = 0
+        found = np.empty(len(hashes), dtype=bool)
+        found[order] = existing[positions] == wanted
+        return found
+    
+    def _flush_pending(self, buffer_hashes: int = DEDUP_CONFIG['buffer_hashes']):
+        """Incorpora los hashes pendientes: al buffer chico, o al array principal si el buffer se llena"""
+        if not self._pending:
+            return
+        new = np.unique(np.concatenate(self._pending))
+        self._pending = []
+        
+        if len(self._recent) + len(new) > buffer_hashes:
+            # Fusión completa, amortizada sobre al menos buffer_hashes claves agregadas
+            self._hashes = np.union1d(np.union1d(self._hashes, self._recent), new)
+            self._recent = np.empty(0, dtype=np.uint64)
+            return
+            
+        # Insertar en orden en el buffer: O(buffer) en lugar de reordenar todo el índice
+        new = new[~self._lookup(self._hashes, new) & ~self._lookup(self._recent, new)]
+        self._recent = np.insert(self._recent, np.searchsorted(self._recent, new), new)
+    
+    def _sorted(self) -> np.ndarray:
+        """Fusiona el buffer y los pendientes y retorna el array ordenado sin repetidos"""
+        self._flush_pending()
+        if len(self._recent):
+            self._hashes = np.union1d(self._hashes, self._recent)
+            self._recent = np.empty(0, dtype=np.uint64)
+        return self._hashes
+    
+    def hash_records(self, records: Sequence[Dict]) -> np.ndarray:
+        """Calcula los hashes de un bloque de registros (diccionarios o ArtistResult)"""
+        return self._hash_columns({field: [str(record.get(field, "")) for record in records]
+                                   for field in self.key_fields})
+    
+    def _hash_columns(self, columns: Dict[str, List[str]]) -> np.ndarray:
+        """Normaliza cada columna clave según su regla y calcula los hashes por fila"""
+        return hash_key_columns([normalize_column(columns[field], self.normalization.get(field, 'exact'))
+                                 for field in self.key_fields])
+    
+    def add_hashes(self, hashes: np.ndarray):
+        """Agrega hashes ya calculados; se fusionan con el array ordenado en la próxima consulta"""
+        if len(hashes):
+            self._pending.append(hashes.astype(np.uint64, copy=False))
+    
+    def add_records(self, records: Sequence[Dict]):
+        """Agrega las claves de los registros al índice"""
+        if records:
+            self.add_hashes(self.hash_records(records))
+    
+    def add_rows(self, rows: Iterable[List], headers: List[str],
+                 rows_per_block: int = DEDUP_CONFIG['rows_per_block']):
+        """Agrega las claves de filas de la hoja, por bloques para mantener la memoria acotada"""
+        # Los índices de los campos se resuelven una sola vez
+        field_indexes = [headers.index(field) if field in headers else None for field in self.key_fields]
+        block = []
+        
+        def flush():
+            self.add_hashes(self._hash_columns({
+                field: [str(row[field_index]) if field_index is not None and field_index < len(row) else ""
+                        for row in block]
+                for field, field_index in zip(self.key_fields, field_indexes)
+            }))
+            block.clear()
+            
+        for row in rows:
+            # Igual que la versión por strings: las filas más cortas que la clave se ignoran
+            if len(row) >= len(self.key_fields):
+                block.append(row)
+                if len(block) >= rows_per_block:
+                    flush()
+        if block:
+            flush()
+    
+    def contains_hashes(self, hashes: np.ndarray) -> np.ndarray:
+        """Máscara booleana de los hashes que ya están en el índice (join ordenado)"""
+        self._flush_pending()
+        return self._lookup(self._hashes, hashes) | self._lookup(self._recent, hashes)
+    
+    def __contains__(self, record: Dict) -> bool:
+        return bool(self.contains_hashes(self.hash_records([record]))[0])
+    
+    def split(self, records: Sequence[Dict]) -> Tuple[List[Dict], List[Dict]]:
+        """Separa los registros nuevos de los que ya están en el índice, conservando el orden"""
+        if not records:
+            return [], []
+        duplicated = self.contains_hashes(self.hash_records(records))
+        new_records = [record for record, is_duplicate in zip(records, duplicated) if not is_duplicate]
+        duplicate_records = [record for record, is_duplicate in zip(records, duplicated) if is_duplicate]
+        return new_records, duplicate_records
+
+
+def run_benchmark(existing_rows: int, new_rows: int, duplicate_ratio: float = 0.5) -> List[Dict]:
+    """Compara el set de strings con el índice de hashes para distintos tamaños de hoja"""
+    headers = ['artist_name', 'timestamp']
+    rows = [[f"artist {i}", f"2026-{1 + i % 12:02d}-01T00:00:00"] for i in range(existing_rows)]
+    duplicates = int(new_rows * duplicate_ratio)
+    records = [{'artist_name': row[0], 'timestamp': row[1]} for row in rows[:duplicates]]
+    records += [{'artist_name': f"new artist {i}", 'timestamp': "2026-10-01T00:00:00"}
+                for i in range(new_rows - duplicates)]
+                
+    results = []
+    
+    # Versión anterior: un string "campo|campo" por fila en un set
+    start = time.perf_counter()
+    field_indexes = [headers.index(field) for field in headers]
+    existing_keys = set()
+    for row in rows:
+        existing_keys.add("|".join(str(row[field_index]) for field_index in field_indexes))
+    built = time.perf_counter()
+    new_records = [record for record in records
+                   if "|".join(str(record.get(field, "")) for field in headers) not in existing_keys]
+    results.append({'engine': 'set de strings', 'build': built - start,
+                    'split': time.perf_counter() - built, 'new': len(new_records),
+                    'memory_mb': (sys.getsizeof(existing_keys) + sum(map(sys.getsizeof, existing_keys))) / 2**20})
+                    
+    start = time.perf_counter()
+    index = HashedKeyIndex(headers, {})
+    index.add_rows(rows, headers)
+    len(index)
+    built = time.perf_counter()
+    new_records, _ = index.split(records)
+    results.append({'engine': 'hashes uint64', 'build': built - start,
+                    'split': time.perf_counter() - built, 'new': len(new_records),
+                    'memory_mb': index._sorted().nbytes / 2**20})
+    return results
+
+
+def main():
+    """Función principal"""
+    setup_logging('dedup_engine.log')
+    parser = argparse.ArgumentParser(
+        description="Motor de duplicados con hashes de 64 bits",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Ejemplos de uso:
+  python dedup_engine.py --benchmark 1000000
+  python dedup_engine.py --benchmark 2000000 --new-rows 500000
+        """
+    )
+    
+    parser.add_argument('--benchmark', type=int, required=True, help='Filas existentes en la hoja simulada')
+    parser.add_argument('--new-rows', type=int, help='Registros nuevos a verificar (default: la mitad)')
+    
+    args = parser.parse_args()
+    
+    new_rows = args.new_rows or args.benchmark // 2
+    print(f"⏱️ Hoja de {args.benchmark} filas, {new_rows} registros a verificar")
+    for result in run_benchmark(args.benchmark, new_rows):
+        print(f"  • {result['engine']}: índice {result['build']:.2f}s, separación {result['split']:.2f}s, "
+              f"{result['memory_mb']:.0f} MB, {result['new']} nuevos")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+🎵 Entry Snapshot - SoundExchange
+=================================
+
+Snapshot inmutable en disco de los resultados UA/PUA/UP/USRO por artista.
+
+El archivo tiene un header fijo, una tabla de offsets con un registro por
+artista (ordenada por nombre normalizado) y un pool de strings UTF-8. Se abre
+con `mmap` y se consulta con búsqueda binaria directamente sobre los bytes,
+sin deserializar nada al iniciar: la consulta responde apenas arranca el
+proceso y varios procesos comparten las mismas páginas a través del cache
+del sistema operativo.
+
+Uso:
+    python entry_snapshot.py build resultados.snap resultados/ archivo.csv
+    python entry_snapshot.py query resultados.snap "bad bunny" "emilia"
+"""
+
+import os
+import csv
+import mmap
+import struct
+import argparse
+from datetime import datetime
+import logging
+from typing import List, Dict, Optional, Iterable, Iterator, Union
+from pathlib import Path
+
+from artist_result import ArtistResult, CATEGORY_CODES
+from artist_scraper import normalize_artist_name
+from logging_setup import setup_logging
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_MAGIC = b'SXSNAP01'
+# Versión 2: el contenido incluye el estado de cada categoría
+SNAPSHOT_VERSION = 2
+
+# magic, versión, cantidad de registros, fecha de creación (epoch), offset del pool
+HEADER_STRUCT = struct.Struct('<8sIIqQ')
+# Por registro: offset y largo de la clave, offset y largo del contenido (relativos al pool)
+ENTRY_STRUCT = struct.Struct('<QIQI')
+
+# Separadores dentro del contenido de cada registro
+FIELD_SEPARATOR = '\x1e'
+ITEM_SEPARATOR = '\x1f'
+
+
+def _encode_payload(result: ArtistResult) -> bytes:
+    """Codifica nombre, timestamp, estado, estados por categoría y resultados de un registro"""
+    fields = [result.artist_name, result.timestamp, result.status, ITEM_SEPARATOR.join(result.outcomes or ())]
+    fields.extend(ITEM_SEPARATOR.join(items) for items in result.results)
+    return FIELD_SEPARATOR.join(fields).encode('utf-8')
+
+
+def _decode_payload(payload: bytes) -> ArtistResult:
+    """Reconstruye el registro a partir del contenido codificado"""
+    artist_name, timestamp, status, outcomes, *categories = payload.decode('utf-8').split(FIELD_SEPARATOR)
+    results = tuple(tuple(items.split(ITEM_SEPARATOR)) if items else () for items in categories)
+    # 'Found'/'Not Found' se recalculan; otros estados (errores, búsquedas incompletas) se conservan
+    return ArtistResult(artist_name, timestamp, results, None if status in ('Found', 'Not Found') else status,
+                        tuple(outcomes.split(ITEM_SEPARATOR)) if outcomes else None)
+
+
+def write_snapshot(records: Iterable[Union[ArtistResult, Dict]], filepath: str) -> int:
+    """Escribe el snapshot con el resultado más reciente de cada artista; retorna la cantidad de registros"""
+    latest: Dict[bytes, ArtistResult] = {}
+    for record in records:
+        if not isinstance(record, ArtistResult):
+            record = ArtistResult.from_record(record)
+        key = normalize_artist_name(record.artist_name).encode('utf-8')
+        if key and (key not in latest or record.timestamp > latest[key].timestamp):
+            latest[key] = record
+            
+    entries = bytearray()
+    pool = bytearray()
+    for key in sorted(latest):
+        payload = _encode_payload(latest[key])
+        key_offset = len(pool)
+        pool += key
+        payload_offset = len(pool)
+        pool += payload
+        entries += ENTRY_STRUCT.pack(key_offset, len(key), payload_offset, len(payload))
+        
+    pool_offset = HEADER_STRUCT.size + len(entries)
+    header = HEADER_STRUCT.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(latest),
+                                int(datetime.now().timestamp()), pool_offset)
+    
+    # Escribir en un temporal y reemplazar: los lectores nunca ven un archivo a medias
+    filepath = Path(filepath)
+    tmp_file = filepath.with_suffix(filepath.suffix + '.tmp')
+    with open(tmp_file, 'wb') as f:
+        f.write(header)
+        f.write(entries)
+        f.write(pool)
+    os.replace(tmp_file, filepath)
+    
+    logger.info(f"💾 Snapshot guardado: {filepath} ({len(latest)} artistas)")
+    return len(latest)
+
+
+class EntrySnapshot:
+    """Lector de un snapshot mapeado en memoria con búsqueda binaria"""
+    
+    def __init__(self, filepath: str):
+        self.filepath = str(filepath)
+        with open(self.filepath, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            
+        magic, version, self.count, created, self._pool_offset = HEADER_STRUCT.unpack_from(self._mmap, 0)
+        if magic != SNAPSHOT_MAGIC:
+            self._mmap.close()
+            raise ValueError(f"{self.filepath} no es un snapshot válido")
+        if version != SNAPSHOT_VERSION:
+            self._mmap.close()
+            raise ValueError(f"{self.filepath} es un snapshot de la versión {version}; vuelve a generarlo con 'build'")
+        self.created = datetime.fromtimestamp(created)
+    
+    def __enter__(self) -> 'EntrySnapshot':
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def __len__(self) -> int:
+        return self.count
+    
+    def __contains__(self, artist: str) -> bool:
+        return self._find(normalize_artist_name(artist).encode('utf-8')) is not None
+    
+    def close(self):
+        self._mmap.close()
+    
+    def _entry(self, index: int):
+        return ENTRY_STRUCT.unpack_from(self._mmap, HEADER_STRUCT.size + index * ENTRY_STRUCT.size)
+    
+    def _key(self, index: int) -> bytes:
+        key_offset, key_length, _, _ = self._entry(index)
+        start = self._pool_offset + key_offset
+        return self._mmap[start:start + key_length]
+    
+    def _find(self, key: bytes) -> Optional[int]:
+        """Búsqueda binaria de la clave en la tabla de offsets"""
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self._key(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.count and self._key(low) == key:
+            return low
+        return None
+    
+    def get(self, artist: str) -> Optional[ArtistResult]:
+        """Retorna el resultado guardado de un artista (None si no está en el snapshot)"""
+        index = self._find(normalize_artist_name(artist).encode('utf-8'))
+        if index is None:
+            return None
+        _, _, payload_offset, payload_length = self._entry(index)
+        start = self._pool_offset + payload_offset
+        return _decode_payload(self._mmap[start:start + payload_length])
+    
+    def keys(self) -> Iterator[str]:
+        """Recorre los nombres normalizados en orden"""
+        for index in range(self.count):
+            yield self._key(index).decode('utf-8')
+
+
+def load_records(sources: List[str], latest_only: bool = True) -> Iterator[Union[ArtistResult, Dict]]:
+    """Lee los registros de archivos CSV o de archivos/directorios Parquet"""
+    # El snapshot y los filtros Bloom usan solo el último resultado por artista;
+    # la importación al historial (latest_only=False) necesita todas las filas
+    for source in sources:
+        if source.lower().endswith('.csv'):
+            with open(source, 'r', encoding='utf-8', newline='') as f:
+                yield from csv.DictReader(f)
+        elif latest_only:
+            from columnar_store import load_latest_results
+            yield from load_latest_results(source).values()
+        else:
+            from columnar_store import iter_results
+            yield from iter_results(source)
+
+
+def main():
+    """Función principal"""
+    setup_logging('entry_snapshot.log')
+    parser = argparse.ArgumentParser(
+        description="Snapshot mapeado en memoria de los resultados por artista",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Ejemplos de uso:
+  python entry_snapshot.py build resultados.snap ~/Downloads/
+  python entry_snapshot.py build resultados.snap soundexchange_results.csv
+  python entry_snapshot.py query resultados.snap "bad bunny" "emilia"
+        """
+    )
+    
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    build_parser = subparsers.add_parser('build', help='Generar un snapshot desde CSV o Parquet')
+    build_parser.add_argument('snapshot', type=str, help='Archivo de snapshot a generar')
+    build_parser.add_argument('sources', nargs='+', help='Archivos CSV o archivos/directorios Parquet')
+    
+    query_parser = subparsers.add_parser('query', help='Consultar artistas en un snapshot')
+    query_parser.add_argument('snapshot', type=str, help='Archivo de snapshot')
+    query_parser.add_argument('artists', nargs='+', help='Artistas a consultar')
+    
+    args = parser.parse_args()
+    
+    if args.command == 'build':
+        count = write_snapshot(load_records(args.sources), args.snapshot)
+        print(f"✅ Snapshot generado: {args.snapshot} ({count} artistas)")
+        return
+        
+    with EntrySnapshot(args.snapshot) as snapshot:
+        print(f"📦 Snapshot del {snapshot.created:%Y-%m-%d %H:%M} ({len(snapshot)} artistas)")
+        for artist in args.artists:
+            result = snapshot.get(artist)
+            if result is None:
+                print(f"  • {artist}: no está en el snapshot")
+                continue
+            found = {code: list(result.category(code)) for code in CATEGORY_CODES if result.category(code)}
+            print(f"  • {result.artist_name} ({result.status}, {result.timestamp}): {found or 'sin resultados'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,33 +12,33 @@ Uso:
     python google_sheets_sync.py --sync-existing-csv archivo.csv
 """
 
+import csv
 import json
 import time
 import sys
 import argparse
-from datetime import datetime
+import queue
+import threading
+import itertools
+from datetime import datetime, timedelta
 import logging
-from typing import List, Dict, Optional, Set, Tuple
+from typing import List, Dict, Optional, Set, Tuple, Iterable, Iterator, Callable, Union
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, Future
 
-import pandas as pd
 from google.oauth2.service_account import Credentials
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
 # Importar configuraciones y scraper
-from config import GOOGLE_SHEETS_CONFIG, SCRAPER_CONFIG, SYNC_CONFIG, LOGGING_CONFIG
+from config import GOOGLE_SHEETS_CONFIG, SCRAPER_CONFIG, SYNC_CONFIG, PARTITION_CONFIG, LOGGING_CONFIG, HISTORY_CONFIG
 from batch_artist_scraper import BatchArtistScraper
+from artist_result import ArtistResult
+from artist_scraper import normalize_artist_name
+from logging_setup import setup_logging
+from dedup_engine import HashedKeyIndex
+from artist_input import iter_artist_source, unique_artists
 
-# Configurar logging
-logging.basicConfig(
-    level=getattr(logging, LOGGING_CONFIG['level']),
-    format=LOGGING_CONFIG['format'],
-    handlers=[
-        logging.FileHandler(LOGGING_CONFIG['file']),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger(__name__)
 
 
@@ -74,8 +74,8 @@ class GoogleSheetsSync:
                 scopes=SCOPES
             )
             
-            # Construir servicio
-            self.service = build('sheets', 'v4', credentials=self.creds)
+            # Construir servicio con el documento de discovery incluido en la librería (sin pedirlo por red)
+            self.service = build('sheets', 'v4', credentials=self.creds, static_discovery=True)
             
             logger.info("✅ Autenticación exitosa con Google Sheets API")
             
@@ -83,29 +83,66 @@ class GoogleSheetsSync:
             logger.error(f"❌ Error en autenticación: {e}")
             raise
     
+    def _column_bounds(self) -> Tuple[str, str]:
+        """Retorna las columnas inicial y final del rango configurado (p. ej. 'A', 'M')"""
+        first_column, _, last_column = self.range_name.partition(':')
+        return first_column.rstrip('0123456789'), (last_column or first_column).rstrip('0123456789')
+    
+    def get_headers(self, sheet_name: Optional[str] = None) -> List[str]:
+        """Obtiene la fila de headers de la hoja"""
+        first_column, last_column = self._column_bounds()
+        result = self.service.spreadsheets().values().get(
+            spreadsheetId=self.spreadsheet_id,
+            range=f"{sheet_name or self.sheet_name}!{first_column}1:{last_column}1"
+        ).execute()
+        
+        values = result.get('values', [])
+        return values[0] if values else []
+    
+    def iter_existing_rows(self, window_rows: int = SYNC_CONFIG['read_window_rows'],
+                           windows_per_request: int = SYNC_CONFIG['read_windows_per_request'],
+                           sheet_name: Optional[str] = None) -> Iterator[List]:
+        """Recorre las filas de datos (sin headers) por ventanas, con memoria acotada por la ventana"""
+        sheet_name = sheet_name or self.sheet_name
+        first_column, last_column = self._column_bounds()
+        start_row = 2
+        windows_read = 0
+        
+        while True:
+            # Cada batchGet pide varias ventanas consecutivas en una sola petición
+            ranges = []
+            for _ in range(windows_per_request):
+                end_row = start_row + window_rows - 1
+                ranges.append(f"{sheet_name}!{first_column}{start_row}:{last_column}{end_row}")
+                start_row = end_row + 1
+                
+            result = self.service.spreadsheets().values().batchGet(
+                spreadsheetId=self.spreadsheet_id,
+                ranges=ranges
+            ).execute()
+            
+            for value_range in result.get('valueRanges', []):
+                rows = value_range.get('values', [])
+                windows_read += 1
+                yield from rows
+                # Una ventana incompleta marca el final de los datos
+                if len(rows) < window_rows:
+                    logger.debug(f"📖 Lectura por ventanas completada: {windows_read} ventanas de {window_rows} filas")
+                    return
+    
     def get_existing_data(self) -> Tuple[List[List], List[str]]:
         """Obtiene los datos existentes del Google Sheet"""
         try:
             logger.info(f"📊 Obteniendo datos existentes de '{self.sheet_name}'...")
             
-            # Construir rango completo
-            range_name = f"{self.sheet_name}!{self.range_name}"
+            headers = self.get_headers()
             
-            # Obtener datos
-            result = self.service.spreadsheets().values().get(
-                spreadsheetId=self.spreadsheet_id,
-                range=range_name
-            ).execute()
-            
-            values = result.get('values', [])
-            
-            if not values:
+            if not headers:
                 logger.info("📝 Hoja vacía, no hay datos existentes")
                 return [], []
             
-            # Primera fila son los headers
-            headers = values[0]
-            data_rows = values[1:] if len(values) > 1 else []
+            # Leer por ventanas en lugar de pedir todo el rango en una sola llamada
+            data_rows = list(self.iter_existing_rows())
             
             logger.info(f"📊 Datos existentes: {len(data_rows)} filas, {len(headers)} columnas")
             return data_rows, headers
@@ -117,6 +154,19 @@ class GoogleSheetsSync:
             logger.error(f"❌ Error inesperado: {e}")
             raise
     
+    def get_existing_keys(self) -> Tuple[HashedKeyIndex, List[str]]:
+        """Obtiene las claves de duplicado de la hoja sin retener las filas"""
+        logger.info(f"📊 Obteniendo claves existentes de '{self.sheet_name}'...")
+        
+        headers = self.get_headers()
+        if not headers:
+            logger.info("📝 Hoja vacía, no hay datos existentes")
+            return HashedKeyIndex(), []
+            
+        existing_keys = self.build_existing_keys(self.iter_existing_rows(), headers)
+        logger.info(f"📊 Claves existentes: {len(existing_keys)}")
+        return existing_keys, headers
+    
     def check_duplicates(self, existing_data: List[List], headers: List[str], 
                         new_data: List[Dict]) -> Tuple[List[Dict], List[Dict]]:
         """Verifica duplicados y separa registros nuevos de existentes"""
@@ -127,45 +177,80 @@ class GoogleSheetsSync:
         logger.info("🔍 Verificando duplicados...")
         
         # Crear conjunto de claves existentes
-        existing_keys = set()
-        for row in existing_data:
-            if len(row) >= len(SYNC_CONFIG['duplicate_key_fields']):
-                key_parts = []
-                for field in SYNC_CONFIG['duplicate_key_fields']:
-                    if field in headers:
-                        field_index = headers.index(field)
-                        if field_index < len(row):
-                            key_parts.append(str(row[field_index]))
-                        else:
-                            key_parts.append("")
-                    else:
-                        key_parts.append("")
-                existing_keys.add("|".join(key_parts))
+        existing_keys = self.build_existing_keys(existing_data, headers)
         
         # Separar registros nuevos de existentes
-        new_records = []
-        duplicate_records = []
-        
-        for record in new_data:
-            key_parts = []
-            for field in SYNC_CONFIG['duplicate_key_fields']:
-                key_parts.append(str(record.get(field, "")))
-            record_key = "|".join(key_parts)
-            
-            if record_key in existing_keys:
-                duplicate_records.append(record)
-                logger.debug(f"🔄 Duplicado encontrado: {record.get('artist_name', 'N/A')}")
-            else:
-                new_records.append(record)
+        new_records, duplicate_records = self.split_new_records(new_data, existing_keys)
         
         logger.info(f"✅ Verificación completada: {len(new_records)} nuevos, {len(duplicate_records)} duplicados")
         return new_records, duplicate_records
     
+    def build_existing_keys(self, existing_data: Iterable[List], headers: List[str]) -> HashedKeyIndex:
+        """Construye el índice de claves de duplicado (hashes de 64 bits) de las filas existentes"""
+        existing_keys = HashedKeyIndex()
+        existing_keys.add_rows(existing_data, headers)
+        return existing_keys
+    
+    def record_key(self, record: Dict) -> str:
+        """Genera la clave de duplicado de un registro"""
+        return "|".join(str(record.get(field, "")) for field in SYNC_CONFIG['duplicate_key_fields'])
+    
+    def split_new_records(self, new_data: List[Dict], existing_keys: HashedKeyIndex) -> Tuple[List[Dict], List[Dict]]:
+        """Separa los registros nuevos de los que ya existen en el índice de claves"""
+        # Todo el bloque se compara de una vez contra el array ordenado de hashes
+        return existing_keys.split(new_data)
+    
+    def get_latest_results(self, sheet_names: Optional[List[str]] = None) -> Dict[str, ArtistResult]:
+        """Retorna el registro más reciente de cada artista (normalizado) en las hojas indicadas"""
+        latest = {}
+        for sheet_name in (self.sheet_name,) if sheet_names is None else sheet_names:
+            headers = self.get_headers(sheet_name)
+            if 'artist_name' not in headers or 'timestamp' not in headers:
+                continue
+            for _ in self.track_latest(self.iter_existing_rows(sheet_name=sheet_name), headers, latest):
+                pass
+        
+        logger.info(f"📊 Último resultado conocido para {len(latest)} artistas")
+        return {key: ArtistResult.from_record(record) for key, record in latest.items()}
+    
+    def track_latest(self, rows: Iterable[List], headers: List[str], latest: Dict[str, Dict]) -> Iterator[List]:
+        """Recorre las filas sin modificarlas, guardando en `latest` el registro más reciente de cada artista"""
+        if 'artist_name' not in headers or 'timestamp' not in headers:
+            yield from rows
+            return
+            
+        for row in rows:
+            record = dict(zip(headers, row))
+            key = normalize_artist_name(record.get('artist_name', ''))
+            # Los timestamps ISO se ordenan correctamente como texto
+            if key and (key not in latest or record.get('timestamp', '') > latest[key].get('timestamp', '')):
+                latest[key] = record
+            yield row
+    
+    def get_keys_and_latest(self) -> Tuple[HashedKeyIndex, Dict[str, ArtistResult]]:
+        """Lee la hoja una sola vez para armar el índice de claves y el último resultado de cada artista"""
+        logger.info(f"📊 Obteniendo claves y resultados previos de '{self.sheet_name}'...")
+        
+        headers = self.get_headers()
+        if not headers:
+            logger.info("📝 Hoja vacía, no hay datos existentes")
+            return HashedKeyIndex(), {}
+            
+        latest = {}
+        existing_keys = self.build_existing_keys(self.track_latest(self.iter_existing_rows(), headers, latest), headers)
+        logger.info(f"📊 Claves existentes: {len(existing_keys)}, último resultado conocido para {len(latest)} artistas")
+        return existing_keys, {key: ArtistResult.from_record(record) for key, record in latest.items()}
+    
     def prepare_data_for_sheets(self, data: List[Dict], headers: List[str]) -> List[List]:
         """Prepara los datos para insertar en Google Sheets"""
         prepared_data = []
         
         for record in data:
+            # Los registros compactos generan su fila directamente
+            if isinstance(record, ArtistResult):
+                prepared_data.append(record.to_row(headers))
+                continue
+            
             row = []
             for header in headers:
                 value = record.get(header, "")
@@ -177,8 +262,9 @@ class GoogleSheetsSync:
         
         return prepared_data
     
-    def append_data(self, data: List[List], headers: List[str] = None) -> bool:
+    def append_data(self, data: List[List], headers: List[str] = None, sheet_name: Optional[str] = None) -> bool:
         """Agrega nuevos datos al Google Sheet"""
+        sheet_name = sheet_name or self.sheet_name
         if not data:
             logger.info("📝 No hay datos nuevos para agregar")
             return True
@@ -187,12 +273,12 @@ class GoogleSheetsSync:
             logger.info(f"📝 Agregando {len(data)} registros nuevos...")
             
             # Si hay headers y la hoja está vacía, agregar headers primero
-            if headers and not self._has_headers():
+            if headers and not self._has_headers(sheet_name):
                 logger.info("📋 Agregando headers a la hoja...")
-                self._add_headers(headers)
+                self._add_headers(headers, sheet_name)
             
             # Construir rango para append
-            range_name = f"{self.sheet_name}!A:A"
+            range_name = f"{sheet_name}!A:A"
             
             # Preparar datos para append
             body = {
@@ -220,21 +306,15 @@ class GoogleSheetsSync:
             logger.error(f"❌ Error inesperado: {e}")
             return False
     
-    def _has_headers(self) -> bool:
+    def _has_headers(self, sheet_name: Optional[str] = None) -> bool:
         """Verifica si la hoja ya tiene headers"""
         try:
-            result = self.service.spreadsheets().values().get(
-                spreadsheetId=self.spreadsheet_id,
-                range=f"{self.sheet_name}!A1:M1"
-            ).execute()
-            
-            values = result.get('values', [])
-            return len(values) > 0 and len(values[0]) > 0
+            return len(self.get_headers(sheet_name)) > 0
             
         except Exception:
             return False
     
-    def _add_headers(self, headers: List[str]) -> bool:
+    def _add_headers(self, headers: List[str], sheet_name: Optional[str] = None) -> bool:
         """Agrega headers a la primera fila de la hoja"""
         try:
             body = {
@@ -243,7 +323,7 @@ class GoogleSheetsSync:
             
             result = self.service.spreadsheets().values().update(
                 spreadsheetId=self.spreadsheet_id,
-                range=f"{self.sheet_name}!A1",
+                range=f"{sheet_name or self.sheet_name}!A1",
                 valueInputOption='RAW',
                 body=body
             ).execute()
@@ -301,6 +381,240 @@ class GoogleSheetsSync:
                 'error': str(e),
                 'timestamp': datetime.now().isoformat()
             }
+    
+    def sync_stream(self, chunks: Iterable[List[Dict]], existing_keys: Optional[HashedKeyIndex] = None) -> Dict:
+        """Sincroniza los datos por bloques, sin cargar toda la entrada en memoria"""
+        total_processed = 0
+        total_new = 0
+        total_duplicates = 0
+        success = True
+        
+        try:
+            logger.info("🔄 Iniciando sincronización por bloques con Google Sheets...")
+            
+            # Obtener claves existentes una sola vez, leyendo la hoja por ventanas;
+            # las claves recibidas (caché del llamador) se usan y actualizan en su lugar
+            if existing_keys is not None:
+                headers = self.get_headers()
+            elif SYNC_CONFIG['check_duplicates']:
+                existing_keys, headers = self.get_existing_keys()
+            else:
+                existing_keys, headers = HashedKeyIndex(), self.get_headers()
+            headers_checked = False
+            
+            for chunk in chunks:
+                if not chunk:
+                    continue
+                
+                # Si no hay headers, usar los del primer bloque
+                if not headers:
+                    headers = list(chunk[0].keys())
+                    logger.info(f"📋 Headers generados automáticamente: {headers}")
+                
+                if SYNC_CONFIG['check_duplicates']:
+                    new_records, duplicate_records = self.split_new_records(chunk, existing_keys)
+                else:
+                    new_records, duplicate_records = chunk, []
+                
+                if new_records:
+                    prepared_data = self.prepare_data_for_sheets(new_records, headers)
+                    # Solo verificar headers en el primer append
+                    appended = self.append_data(prepared_data, None if headers_checked else headers)
+                    headers_checked = True
+                    success = success and appended
+                    if appended and SYNC_CONFIG['check_duplicates']:
+                        existing_keys.add_records(new_records)
+                
+                total_processed += len(chunk)
+                total_new += len(new_records)
+                total_duplicates += len(duplicate_records)
+                logger.info(f"📦 Bloque sincronizado: {total_processed} procesados, {total_new} nuevos, {total_duplicates} duplicados")
+            
+            summary = {
+                'total_processed': total_processed,
+                'new_records': total_new,
+                'duplicate_records': total_duplicates,
+                'success': success,
+                'timestamp': datetime.now().isoformat()
+            }
+            
+            logger.info(f"✅ Sincronización completada: {summary}")
+            return summary
+            
+        except Exception as e:
+            logger.error(f"❌ Error en sincronización: {e}")
+            return {
+                'total_processed': total_processed,
+                'new_records': total_new,
+                'duplicate_records': total_duplicates,
+                'success': False,
+                'error': str(e),
+                'timestamp': datetime.now().isoformat()
+            }
+
+
+def split_by_freshness(artists: List[str], latest: Dict[str, ArtistResult],
+                       max_age_hours: float) -> Tuple[List[str], Dict[str, ArtistResult]]:
+    """Separa los artistas vencidos de los revisados hace menos de max_age_hours"""
+    cutoff = datetime.now() - timedelta(hours=max_age_hours)
+    stale = []
+    fresh = {}
+    
+    for artist in artists:
+        key = normalize_artist_name(artist)
+        previous = latest.get(key)
+        checked_at = None
+        if previous is not None:
+            try:
+                checked_at = datetime.fromisoformat(previous.timestamp)
+            except ValueError:
+                checked_at = None
+        
+        # Los errores y resultados incompletos siempre se vuelven a buscar
+        is_clean = previous is not None and previous.status in ('Found', 'Not Found')
+        if checked_at and checked_at >= cutoff and is_clean:
+            fresh[key] = previous
+        else:
+            stale.append(artist)
+    
+    return stale, fresh
+
+# Marca de fin de la cola del pipeline
+_PIPELINE_END = object()
+
+
+def iter_micro_batches(records_queue: queue.Queue, batch_size: int = SYNC_CONFIG['batch_size'],
+                       flush_seconds: float = SYNC_CONFIG['pipeline_flush_seconds']) -> Iterator[List]:
+    """Agrupa los registros de la cola en lotes de batch_size (o lo acumulado tras flush_seconds)"""
+    batch = []
+    batch_started = 0.0
+    
+    while True:
+        timeout = max(flush_seconds - (time.monotonic() - batch_started), 0) if batch else None
+        try:
+            item = records_queue.get(timeout=timeout)
+        except queue.Empty:
+            # Publicar lo acumulado para que el progreso sea visible en la hoja
+            yield batch
+            batch = []
+            continue
+            
+        if item is _PIPELINE_END:
+            break
+        if not batch:
+            batch_started = time.monotonic()
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+            
+    if batch:
+        yield batch
+
+
+def _resolve(value):
+    """Espera el resultado si el valor es una tarea del arranque en paralelo"""
+    return value.result() if isinstance(value, Future) else value
+
+
+def run_startup_task(name: str, function: Callable, *args):
+    """Ejecuta una tarea del arranque y registra cuánto tardó"""
+    start = time.monotonic()
+    result = function(*args)
+    logger.info(f"⚡ Arranque: {name} listo en {time.monotonic() - start:.1f}s")
+    return result
+
+
+def run_pipeline(sheets_sync: Union[GoogleSheetsSync, Future], records: Iterable,
+                 existing_keys: Optional[Union[HashedKeyIndex, Future]] = None) -> Tuple[List, Dict]:
+    """Sincroniza los registros en micro-lotes mientras se siguen generando"""
+    records_queue = queue.Queue(maxsize=SYNC_CONFIG['pipeline_queue_size'])
+    batches = iter_micro_batches(records_queue)
+    outcome = {}
+    
+    def sync_worker():
+        try:
+            # El cliente de Sheets y las claves pueden seguir cargándose mientras empiezan las búsquedas
+            outcome['summary'] = _resolve(sheets_sync).sync_stream(batches, _resolve(existing_keys))
+        except Exception as e:
+            logger.error(f"❌ Error preparando la sincronización: {e}")
+            outcome['summary'] = {
+                'total_processed': 0, 'new_records': 0, 'duplicate_records': 0,
+                'success': False, 'error': str(e), 'timestamp': datetime.now().isoformat()
+            }
+        # Si la sincronización se cortó por un error, seguir vaciando la cola
+        for _ in batches:
+            pass
+            
+    worker = threading.Thread(target=sync_worker, name='sheets-sync', daemon=True)
+    worker.start()
+    
+    results = []
+    try:
+        for record in records:
+            results.append(record)
+            records_queue.put(record)
+    finally:
+        # Publicar lo pendiente aunque el scraping se haya interrumpido
+        records_queue.put(_PIPELINE_END)
+        worker.join()
+        
+    return results, outcome.get('summary', {
+        'total_processed': 0, 'new_records': 0, 'duplicate_records': 0,
+        'success': False, 'timestamp': datetime.now().isoformat()
+    })
+
+
+def spool_and_drain(sheets_sync: Union[GoogleSheetsSync, Future], records: Iterable,
+                    keep_results: bool = True) -> Tuple[List, Dict]:
+    """Deja los registros en el spool local a medida que llegan y lo publica si no hay otro escritor activo"""
+    from sheets_spool import spool_records, SpoolWriter
+    
+    # Sin keep_results (CSV existente) los registros solo pasan por el archivo del spool
+    results = []
+    processed = 0
+    
+    def spooled() -> Iterator:
+        nonlocal processed
+        for record in records:
+            processed += 1
+            if keep_results:
+                results.append(record)
+            yield record
+            
+    spool_records(spooled())
+    summary = SpoolWriter(_resolve(sheets_sync)).drain()
+    if summary is None:
+        # El escritor activo publica también estos registros: no se sabe todavía si habrá éxito
+        summary = {
+            'total_processed': processed, 'new_records': 0, 'duplicate_records': 0,
+            'success': None, 'pending_in_spool': True, 'timestamp': datetime.now().isoformat()
+        }
+    return results, summary
+
+
+def summary_state(summary: Dict) -> str:
+    """Estado de una sincronización para mostrar (pendiente si quedó en el spool de otro escritor)"""
+    if summary.get('pending_in_spool'):
+        return 'Pendiente en el spool'
+    return 'Exitoso' if summary['success'] else 'Fallido'
+
+
+def iter_csv_chunks(filepath: str, chunk_size: int = SYNC_CONFIG['csv_chunk_size']) -> Iterator[List[Dict]]:
+    """Lee un CSV en bloques de registros, conservando los valores originales como texto"""
+    logger.info(f"📁 Leyendo CSV por bloques de {chunk_size}: {filepath}")
+    
+    with open(filepath, 'r', newline='', encoding='utf-8') as csvfile:
+        reader = csv.DictReader(csvfile)
+        chunk = []
+        for record in reader:
+            # Las celdas vacías quedan como "" (no NaN)
+            chunk.append({key: (value if value is not None else "") for key, value in record.items() if key is not None})
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
 
 
 def load_csv_data(filepath: str) -> List[Dict]:
@@ -308,11 +622,7 @@ def load_csv_data(filepath: str) -> List[Dict]:
     try:
         logger.info(f"📁 Cargando datos desde CSV: {filepath}")
         
-        # Leer CSV
-        df = pd.read_csv(filepath)
-        
-        # Convertir a lista de diccionarios
-        data = df.to_dict('records')
+        data = [record for chunk in iter_csv_chunks(filepath) for record in chunk]
         
         logger.info(f"✅ CSV cargado: {len(data)} registros")
         return data
@@ -322,8 +632,29 @@ def load_csv_data(filepath: str) -> List[Dict]:
         return []
 
 
+def create_sheets_sync(partitioned: bool = PARTITION_CONFIG['enabled']) -> GoogleSheetsSync:
+    """Crea el sincronizador, con pestañas por período si se pide"""
+    if partitioned:
+        from sheet_partitions import PartitionedSheetsSync
+        return PartitionedSheetsSync()
+    return GoogleSheetsSync()
+
+
+def load_artists(artists: Optional[str], filepath: Optional[str], column: Optional[str] = None,
+                 max_artists: Optional[int] = None) -> List[str]:
+    """Lee los artistas de --artists o del archivo, sin repetidos y dentro del presupuesto"""
+    if artists:
+        artists = [artist.strip() for artist in artists.split(',') if artist.strip()]
+        print(f"🎵 Artistas especificados: {len(artists)}")
+    else:
+        artists = iter_artist_source(filepath, column)
+    # Se necesita la lista para ordenar y filtrar por antigüedad
+    return list(itertools.islice(unique_artists(artists), max_artists))
+
+
 def main():
     """Función principal"""
+    setup_logging(LOGGING_CONFIG['file'])
     parser = argparse.ArgumentParser(
         description="Sincronización con Google Sheets para SoundExchange Scraper",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -332,6 +663,8 @@ Ejemplos de uso:
   python google_sheets_sync.py --artists "nicki nicole,emilia"
   python google_sheets_sync.py --file artists_list.txt
   python google_sheets_sync.py --sync-existing-csv archivo.csv
+  python google_sheets_sync.py --file artists_list.txt --spool
+  python google_sheets_sync.py --drain-spool
         """
     )
     
@@ -343,7 +676,17 @@ Ejemplos de uso:
     parser.add_argument(
         '--file', 
         type=str, 
-        help='Archivo de texto con un artista por línea'
+        help="Archivo de texto con un artista por línea, '-' para la entrada estándar, o catálogo CSV/Parquet"
+    )
+    parser.add_argument(
+        '--column', 
+        type=str, 
+        help='Columna con los artistas en catálogos CSV/Parquet (por defecto: artist_name)'
+    )
+    parser.add_argument(
+        '--max-artists', 
+        type=int, 
+        help='Procesar como máximo N artistas distintos'
     )
     parser.add_argument(
         '--sync-existing-csv', 
@@ -362,11 +705,52 @@ Ejemplos de uso:
         default=SCRAPER_CONFIG['headless_mode'],
         help='Ejecutar en modo headless'
     )
+    parser.add_argument(
+        '--adaptive', 
+        action='store_true', 
+        help='Ajustar concurrencia y delay automáticamente según la respuesta de SoundExchange'
+    )
+    parser.add_argument(
+        '--max-age', 
+        type=float, 
+        help='Solo buscar artistas sin resultados de las últimas N horas (usa la hoja o --result-store)'
+    )
+    parser.add_argument(
+        '--result-store', 
+        type=str, 
+        help='Archivo o directorio Parquet con resultados previos para --max-age'
+    )
+    parser.add_argument(
+        '--bloom-filter', 
+        type=str, 
+        help='Archivo de filtros Bloom para omitir búsquedas que seguro no tienen resultados'
+    )
+    parser.add_argument(
+        '--variants', 
+        action='store_true', 
+        help='Buscar también variantes del nombre (sin "feat.", sin acentos, sin sufijos societarios)'
+    )
+    parser.add_argument(
+        '--partitioned', 
+        action='store_true', 
+        default=PARTITION_CONFIG['enabled'],
+        help='Repartir el historial en pestañas por período con una pestaña índice'
+    )
+    parser.add_argument(
+        '--spool', 
+        action='store_true', 
+        help='Dejar los registros en el spool local y publicarlos con un único escritor (jobs concurrentes)'
+    )
+    parser.add_argument(
+        '--drain-spool', 
+        action='store_true', 
+        help='Solo publicar los registros pendientes del spool local'
+    )
     
     args = parser.parse_args()
     
     # Verificar que se especifique al menos un modo
-    if not any([args.artists, args.file, args.sync_existing_csv]):
+    if not any([args.artists, args.file, args.sync_existing_csv, args.drain_spool]):
         parser.print_help()
         print("\n❌ Debes especificar al menos un modo de entrada")
         sys.exit(1)
@@ -374,66 +758,141 @@ Ejemplos de uso:
     try:
         # Inicializar sincronizador
         logger.info("🚀 Iniciando Google Sheets Sync...")
-        sheets_sync = GoogleSheetsSync()
+        if args.drain_spool or args.sync_existing_csv:
+            sheets_sync = create_sheets_sync(args.partitioned)
         
-        if args.sync_existing_csv:
+        if args.drain_spool:
+            from sheets_spool import SpoolWriter
+            summary = SpoolWriter(sheets_sync).drain()
+            if summary is None:
+                print("⏳ Otro proceso está vaciando el spool")
+            else:
+                print(f"\n✅ SPOOL PUBLICADO")
+                print(f"📥 Archivos: {summary['spool_files']}")
+                print(f"🆕 Registros nuevos: {summary['new_records']}")
+                print(f"🔄 Registros duplicados: {summary['duplicate_records']}")
+                print(f"✅ Estado: {summary_state(summary)}")
+                
+        elif args.sync_existing_csv:
             # Sincronizar desde CSV existente
             logger.info(f"📁 Sincronizando desde CSV: {args.sync_existing_csv}")
-            csv_data = load_csv_data(args.sync_existing_csv)
+            if not Path(args.sync_existing_csv).exists():
+                print(f"❌ El archivo {args.sync_existing_csv} no existe")
+                sys.exit(1)
+            
+            # Leer y sincronizar por bloques para mantener la memoria acotada
+            if args.spool:
+                _, summary = spool_and_drain(sheets_sync, itertools.chain.from_iterable(iter_csv_chunks(args.sync_existing_csv)),
+                                             keep_results=False)
+            else:
+                summary = sheets_sync.sync_stream(iter_csv_chunks(args.sync_existing_csv))
             
-            if csv_data:
-                summary = sheets_sync.sync_data(csv_data)
+            if summary['total_processed']:
                 print(f"\n✅ SINCRONIZACIÓN COMPLETADA")
                 print(f"📊 Total procesado: {summary['total_processed']}")
                 print(f"🆕 Registros nuevos: {summary['new_records']}")
                 print(f"🔄 Registros duplicados: {summary['duplicate_records']}")
-                print(f"✅ Estado: {'Exitoso' if summary['success'] else 'Fallido'}")
+                print(f"✅ Estado: {summary_state(summary)}")
             else:
                 print("❌ No se pudieron cargar datos del CSV")
                 
         else:
-            # Procesar artistas y sincronizar
-            if args.artists:
-                artists = [artist.strip() for artist in args.artists.split(',') if artist.strip()]
-                print(f"🎵 Artistas especificados: {len(artists)}")
-            else:
-                from batch_artist_scraper import load_artists_from_file
-                artists = load_artists_from_file(args.file)
-                if not artists:
-                    print(f"❌ No se pudieron cargar artistas desde {args.file}")
-                    sys.exit(1)
-            
-            print(f"📋 Total de artistas: {len(artists)}")
-            print(f"⏳ Iniciando procesamiento y sincronización...")
+            # Arranque en paralelo: cookie Cloudflare (Chrome), cliente de Sheets, claves existentes
+            # y lectura de la entrada. La primera búsqueda espera solo la sesión y los artistas;
+            # el cliente de Sheets y las claves los espera recién el hilo que sincroniza
+            startup = ThreadPoolExecutor(max_workers=5, thread_name_prefix='startup')
             
             # Crear scraper y procesar
             scraper = BatchArtistScraper(
                 headless=args.headless, 
-                delay=args.delay
+                delay=args.delay,
+                adaptive=args.adaptive,
+                bloom_filter=args.bloom_filter,
+                variants=args.variants
             )
+            # Con --max-age puede que no quede nada por buscar, pero esperar a saberlo serializaría el arranque
+            scraper.start_session(startup)
+            sheets_sync = startup.submit(run_startup_task, 'cliente de Sheets', create_sheets_sync, args.partitioned)
+            artists_ready = startup.submit(run_startup_task, 'entrada', load_artists,
+                                           args.artists, args.file, args.column, args.max_artists)
+            
+            # Las pestañas por período y el spool cargan sus propias claves
+            check_keys = SYNC_CONFIG['check_duplicates'] and not args.partitioned and not args.spool
+            existing_keys = None
+            latest_ready = None
+            if check_keys and args.max_age is not None and not args.result_store:
+                # El servicio de googleapiclient no es seguro entre hilos: claves y resultados
+                # previos salen de una sola lectura de la hoja en vez de dos lecturas en paralelo
+                sheet_state = startup.submit(run_startup_task, 'claves y resultados previos',
+                                             lambda: sheets_sync.result().get_keys_and_latest())
+                existing_keys = startup.submit(lambda: sheet_state.result()[0])
+                latest_ready = startup.submit(lambda: sheet_state.result()[1])
+            else:
+                if check_keys:
+                    existing_keys = startup.submit(run_startup_task, 'claves existentes',
+                                                   lambda: sheets_sync.result().get_existing_keys()[0])
+                if args.max_age is not None:
+                    if args.result_store:
+                        from columnar_store import load_latest_results
+                        latest_ready = startup.submit(run_startup_task, 'resultados previos',
+                                                      load_latest_results, args.result_store)
+                    else:
+                        latest_ready = startup.submit(run_startup_task, 'resultados previos',
+                                                      lambda: sheets_sync.result().get_latest_results())
+            startup.shutdown(wait=False)
+            
+            artists = artists_ready.result()
+            if not artists:
+                print(f"❌ No se pudieron cargar artistas desde {args.file or '--artists'}")
+                sys.exit(1)
+                
+            print(f"📋 Total de artistas: {len(artists)}")
+            print(f"⏳ Iniciando procesamiento y sincronización...")
+            
+            # Modo incremental: solo buscar artistas vencidos o nuevos
+            fresh = {}
+            to_scrape = artists
+            if latest_ready is not None:
+                to_scrape, fresh = split_by_freshness(artists, latest_ready.result(), args.max_age)
+                print(f"🕒 {len(fresh)} artistas revisados hace menos de {args.max_age}h, {len(to_scrape)} por buscar")
+            
+            # Procesar artistas y sincronizar en micro-lotes a medida que llegan (con --spool, al terminar)
+            records = itertools.chain(fresh.values(), scraper.iter_artists(to_scrape) if to_scrape else ())
+            if args.spool:
+                results, summary = spool_and_drain(sheets_sync, records)
+            else:
+                results, summary = run_pipeline(sheets_sync, records, existing_keys)
             
-            # Procesar artistas
-            results = scraper.process_artists_list(artists)
+            # Mantener el orden de entrada en el CSV
+            positions = {}
+            for position, artist in enumerate(artists):
+                positions.setdefault(normalize_artist_name(artist), position)
+            results.sort(key=lambda result: positions.get(normalize_artist_name(result.artist_name), len(artists)))
             
             if results:
-                # Sincronizar con Google Sheets
-                summary = sheets_sync.sync_data(results)
-                
                 # Mostrar resumen final
                 print(f"\n✅ PROCESAMIENTO Y SINCRONIZACIÓN COMPLETADOS")
                 print(f"📊 Total de artistas procesados: {len(results)}")
+                if args.max_age is not None:
+                    print(f"🕒 Buscados: {len(results) - len(fresh)} • Reutilizados: {len(fresh)}")
                 print(f"🎯 Artistas con resultados: {sum(1 for r in results if r['total_results'] > 0)}")
                 print(f"❌ Artistas sin resultados: {sum(1 for r in results if r['total_results'] == 0)}")
                 print(f"🔄 SINCRONIZACIÓN:")
                 print(f"   • Total procesado: {summary['total_processed']}")
                 print(f"   • Registros nuevos: {summary['new_records']}")
                 print(f"   • Registros duplicados: {summary['duplicate_records']}")
-                print(f"   • Estado: {'Exitoso' if summary['success'] else 'Fallido'}")
+                print(f"   • Estado: {summary_state(summary)}")
+                if summary.get('pending_in_spool'):
+                    print(f"   • Pendiente en el spool: lo publica el proceso que lo está vaciando")
                 
                 # Guardar también en Descargas
                 csv_file = scraper.save_to_csv(results, f"soundexchange_sync_{len(artists)}_artists.csv")
                 print(f"💾 CSV guardado en Descargas: {csv_file}")
                 
+                # Al historial van solo las búsquedas nuevas; los reutilizados ya están
+                if HISTORY_CONFIG['enabled']:
+                    scraper.save_to_history([r for r in results if normalize_artist_name(r.artist_name) not in fresh])
+                    
             else:
                 print("❌ No se obtuvieron resultados")
                 
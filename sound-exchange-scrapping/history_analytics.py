@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+🎵 History Analytics - SoundExchange
+====================================
+
+Tendencias por artista y categoría sobre el historial de resultados.
+
+Trabaja con operaciones vectorizadas de pandas/NumPy sobre todo el historial
+(`result_history.py`) en lugar de recorrer registros uno por uno: primera y
+última vez que un artista tuvo entradas en cada categoría, evolución de los
+conteos, entradas nuevas por período y artistas que dejaron de tener
+entradas (p. ej. "qué artistas limpiaron sus UA este trimestre").
+
+Uso:
+    python history_analytics.py trends --artist "bad bunny"
+    python history_analytics.py new --since 2026-07-01
+    python history_analytics.py cleared UA
+"""
+
+import argparse
+from datetime import date
+import logging
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from config import HISTORY_CONFIG
+from artist_result import CATEGORY_CODES, unverified_categories
+from artist_scraper import normalize_artist_name
+from result_history import read_history
+from logging_setup import setup_logging
+
+logger = logging.getLogger(__name__)
+
+
+def quarter_start(day: Optional[date] = None) -> str:
+    """Primer día del trimestre de la fecha indicada (hoy por defecto)"""
+    day = day or date.today()
+    return date(day.year, 3 * ((day.month - 1) // 3) + 1, 1).isoformat()
+
+
+def load_history_frame(directory: str = HISTORY_CONFIG['directory'], since: Optional[str] = None,
+                       until: Optional[str] = None, with_entries: bool = False) -> pd.DataFrame:
+    """Carga el historial como DataFrame con la clave normalizada de cada artista"""
+    columns = ['run_date', 'artist_name', 'timestamp', 'status'] + [f'{code}_count' for code in CATEGORY_CODES]
+    if with_entries:
+        columns += [f'{code}_results' for code in CATEGORY_CODES]
+    frame = read_history(directory, since, until, columns=columns).to_pandas()
+    
+    # Normalizar solo los nombres distintos y expandir con los códigos de factorize
+    codes, names = pd.factorize(frame['artist_name'].astype(str))
+    keys = np.array([normalize_artist_name(name) for name in names], dtype=object)
+    frame['artist_key'] = keys[codes] if len(codes) else pd.Series(dtype=object)
+    return frame.sort_values(['artist_key', 'timestamp'], kind='stable', ignore_index=True)
+
+
+def category_counts(frame: pd.DataFrame) -> pd.DataFrame:
+    """Pasa los conteos a formato largo: una fila por artista, observación y categoría verificada"""
+    counts = frame.melt(
+        id_vars=['artist_key', 'timestamp', 'status'],
+        value_vars=[f'{code}_count' for code in CATEGORY_CODES],
+        var_name='category',
+        value_name='count'
+    )
+    counts['category'] = counts['category'].str.removesuffix('_count')
+    
+    # Una búsqueda con error, fallida u omitida guarda conteo 0 sin que la entrada haya desaparecido:
+    # esas observaciones se descartan. Cada estado distinto se interpreta una sola vez como máscara de bits
+    status_codes, statuses = pd.factorize(counts['status'].astype(str))
+    masks = np.array([sum(1 << CATEGORY_CODES.index(code) for code in unverified_categories(status))
+                      for status in statuses], dtype=np.int64)
+    category_bits = np.left_shift(1, counts['category'].map(CATEGORY_CODES.index).to_numpy(dtype=np.int64))
+    counts = counts[(masks[status_codes] & category_bits) == 0].drop(columns='status')
+    return counts.sort_values(['artist_key', 'category', 'timestamp'], kind='stable', ignore_index=True)
+
+
+def artist_trends(frame: pd.DataFrame) -> pd.DataFrame:
+    """Tendencia de cada artista y categoría: observaciones, primera/última vez con entradas y conteos"""
+    counts = category_counts(frame)
+    counts['seen_at'] = counts['timestamp'].where(counts['count'] > 0)
+    
+    grouped = counts.groupby(['artist_key', 'category'], sort=True)
+    trends = grouped.agg(
+        observations=('count', 'size'),
+        first_seen=('seen_at', 'min'),
+        last_seen=('seen_at', 'max'),
+        first_count=('count', 'first'),
+        last_count=('count', 'last'),
+        max_count=('count', 'max'),
+        last_checked=('timestamp', 'max')
+    ).reset_index()
+    trends['change'] = trends['last_count'] - trends['first_count']
+    # Tuvo entradas alguna vez y en la última observación ya no
+    trends['cleared'] = trends['first_seen'].notna() & (trends['last_count'] == 0)
+    return trends
+
+
+def new_entries(frame: pd.DataFrame, since: Optional[str] = None) -> pd.DataFrame:
+    """Entradas registradas por primera vez desde una fecha, contadas por artista y categoría"""
+    entries = frame.melt(
+        id_vars=['artist_key', 'timestamp'],
+        value_vars=[f'{code}_results' for code in CATEGORY_CODES],
+        var_name='category',
+        value_name='entry'
+    ).explode('entry').dropna(subset=['entry'])
+    entries['category'] = entries['category'].str.removesuffix('_results')
+    
+    first_seen = entries.groupby(['artist_key', 'category', 'entry'], sort=False)['timestamp'].min()
+    if since:
+        first_seen = first_seen[first_seen >= pd.Timestamp(since)]
+        
+    return (first_seen.groupby(level=['artist_key', 'category'])
+            .agg(new_entries='size', first_seen='min', last_seen='max')
+            .reset_index()
+            .sort_values('new_entries', ascending=False, kind='stable', ignore_index=True))
+
+
+def cleared_artists(frame: pd.DataFrame, category: str, since: str,
+                    until: Optional[str] = None) -> pd.DataFrame:
+    """Artistas con entradas en la categoría antes de `since` y sin entradas en su última observación del período"""
+    counts = category_counts(frame)
+    counts = counts[counts['category'] == category]
+    since_ts = pd.Timestamp(since)
+    until_ts = pd.Timestamp(until) + pd.Timedelta(days=1) if until else None
+    
+    before = counts[counts['timestamp'] < since_ts].groupby('artist_key').last()
+    period = counts[counts['timestamp'] >= since_ts]
+    if until_ts is not None:
+        period = period[period['timestamp'] < until_ts]
+    after = period.groupby('artist_key').last()
+    
+    joined = before.join(after, how='inner', lsuffix='_before', rsuffix='_after')
+    cleared = joined[(joined['count_before'] > 0) & (joined['count_after'] == 0)]
+    return (cleared.reset_index()[['artist_key', 'count_before', 'timestamp_before', 'timestamp_after']]
+            .rename(columns={'timestamp_before': 'last_with_entries', 'timestamp_after': 'cleared_at'}))
+
+
+def _print_frame(frame: pd.DataFrame, limit: int = 20):
+    """Imprime las primeras filas de un resultado"""
+    if frame.empty:
+        print("  (sin resultados)")
+        return
+    print(frame.head(limit).to_string(index=False))
+    if len(frame) > limit:
+        print(f"  ... y {len(frame) - limit} más")
+
+
+def main():
+    """Función principal"""
+    setup_logging('history_analytics.log')
+    parser = argparse.ArgumentParser(
+        description="Tendencias por artista y categoría sobre el historial de resultados",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Ejemplos de uso:
+  python history_analytics.py trends --artist "bad bunny"
+  python history_analytics.py new --since 2026-07-01 --csv nuevas.csv
+  python history_analytics.py cleared UA
+  python history_analytics.py cleared PUA --since 2026-01-01 --until 2026-03-31
+        """
+    )
+    
+    parser.add_argument('--directory', type=str, default=HISTORY_CONFIG['directory'],
+                        help='Directorio del historial')
+    parser.add_argument('--csv', type=str, help='Exportar el resultado completo a un CSV')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    trends_parser = subparsers.add_parser('trends', help='Tendencia por artista y categoría')
+    trends_parser.add_argument('--artist', action='append', help='Filtrar por artista (repetible)')
+    
+    new_parser = subparsers.add_parser('new', help='Entradas nuevas por artista y categoría')
+    new_parser.add_argument('--since', type=str, default=quarter_start(),
+                            help='Desde la fecha AAAA-MM-DD (default: inicio del trimestre)')
+    
+    cleared_parser = subparsers.add_parser('cleared', help='Artistas que dejaron de tener entradas en una categoría')
+    cleared_parser.add_argument('category', choices=CATEGORY_CODES, help='Categoría')
+    cleared_parser.add_argument('--since', type=str, default=quarter_start(),
+                                help='Desde la fecha AAAA-MM-DD (default: inicio del trimestre)')
+    cleared_parser.add_argument('--until', type=str, help='Hasta la fecha AAAA-MM-DD')
+    
+    args = parser.parse_args()
+    
+    if args.command == 'trends':
+        trends = artist_trends(load_history_frame(args.directory))
+        if args.artist:
+            trends = trends[trends['artist_key'].isin([normalize_artist_name(a) for a in args.artist])]
+        print(f"📈 Tendencias: {trends['artist_key'].nunique()} artistas")
+        result = trends
+        
+    elif args.command == 'new':
+        result = new_entries(load_history_frame(args.directory, with_entries=True), args.since)
+        print(f"🆕 Entradas nuevas desde {args.since}: {int(result['new_entries'].sum()) if not result.empty else 0}")
+        
+    else:
+        # Las observaciones previas al período hacen falta para saber qué tenía cada artista
+        result = cleared_artists(load_history_frame(args.directory, until=args.until),
+                                 args.category, args.since, args.until)
+        print(f"🧹 Artistas que limpiaron {args.category} desde {args.since}: {len(result)}")
+        
+    _print_frame(result)
+    if args.csv:
+        result.to_csv(args.csv, index=False)
+        print(f"💾 CSV: {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
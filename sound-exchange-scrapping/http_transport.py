@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+🎵 HTTP Transport - SoundExchange
+=================================
+
+Transporte HTTP intercambiable para las búsquedas en SoundExchange.
+
+El código de búsqueda solo usa `transport.post(url, data=..., timeout=...)` y
+lee `status_code`, `headers` y `content` de la respuesta. Detrás de esa
+interfaz, `TRANSPORT_CONFIG` elige:
+
+- `requests` con un pool de conexiones keep-alive de tamaño configurable
+- `httpx` con HTTP/2 (varias búsquedas simultáneas multiplexadas en una sola
+  conexión TLS), si `httpx[http2]` está instalado
+
+En ambos casos se anuncian en `accept-encoding` solo las compresiones que el
+backend puede decodificar con los módulos instalados (`brotli`, `zstandard`)
+y cada petición puede notificar su tiempo y tamaño a hooks registrados.
+
+Uso:
+    python http_transport.py
+"""
+
+import time
+import logging
+from abc import ABC, abstractmethod
+from typing import List, Dict, Optional, Callable, NamedTuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import TRANSPORT_CONFIG
+
+logger = logging.getLogger(__name__)
+# httpx registra cada petición en INFO; las búsquedas ya tienen su propia línea muestreada
+logging.getLogger('httpx').setLevel(logging.WARNING)
+
+
+class RequestTiming(NamedTuple):
+    """Datos de una petición que reciben los hooks de timing"""
+    method: str
+    url: str
+    status_code: Optional[int]
+    elapsed: float
+    wire_bytes: Optional[int]  # Tamaño comprimido según content-length (None si no viene)
+    content_bytes: int  # Tamaño ya decodificado
+    encoding: str
+    http_version: str
+    error: Optional[str] = None
+
+
+def _module_available(*names: str) -> bool:
+    """True si alguno de los módulos se puede importar"""
+    for name in names:
+        try:
+            __import__(name)
+            return True
+        except ImportError:
+            continue
+    return False
+
+
+def supported_encodings(backend: str = TRANSPORT_CONFIG['backend']) -> List[str]:
+    """Compresiones que el backend puede decodificar, en orden de preferencia"""
+    if backend == 'httpx':
+        # httpx decodifica zstd y brotli si el módulo correspondiente está instalado
+        available = {'gzip', 'deflate'}
+        if _module_available('zstandard'):
+            available.add('zstd')
+        if _module_available('brotli', 'brotlicffi'):
+            available.add('br')
+    else:
+        # urllib3 publica lo que sabe decodificar según los módulos instalados
+        from urllib3.util.request import ACCEPT_ENCODING
+        available = {encoding.strip() for encoding in ACCEPT_ENCODING.split(',')}
+    return [encoding for encoding in ('zstd', 'br', 'gzip', 'deflate') if encoding in available]
+
+
+def http2_available() -> bool:
+    """True si httpx y h2 están instalados"""
+    return _module_available('httpx') and _module_available('h2')
+
+
+class HttpTransport(ABC):
+    """Interfaz común de los transportes: sesión con headers, cookies, hooks y post()"""
+    
+    backend = ''
+    
+    def __init__(self, headers: Optional[Dict[str, str]] = None, timeout: float = TRANSPORT_CONFIG['timeout']):
+        self.timeout = timeout
+        self.hooks: List[Callable[[RequestTiming], None]] = []
+        self.headers = dict(headers or {})
+        encodings = TRANSPORT_CONFIG['accept_encoding'] or supported_encodings(self.backend)
+        self.headers['accept-encoding'] = ', '.join(encodings)
+    
+    def add_hook(self, hook: Callable[[RequestTiming], None]):
+        """Registra una función que recibe el RequestTiming de cada petición"""
+        self.hooks.append(hook)
+    
+    def _notify(self, timing: RequestTiming):
+        for hook in self.hooks:
+            try:
+                hook(timing)
+            except Exception as e:
+                # Un hook roto no debe cortar las búsquedas
+                logger.warning(f"⚠️ Hook de timing falló: {e}")
+    
+    @abstractmethod
+    def set_cookie(self, name: str, value: str, domain: str):
+        """Agrega una cookie a la sesión del transporte"""
+    
+    @abstractmethod
+    def _send(self, url: str, data: Dict, timeout: float):
+        """Envía el POST con el cliente HTTP del backend"""
+    
+    def post(self, url: str, data: Optional[Dict] = None, timeout: Optional[float] = None):
+        """Envía un POST de formulario y notifica a los hooks el tiempo y tamaño de la respuesta"""
+        start = time.monotonic()
+        try:
+            response = self._send(url, data or {}, timeout or self.timeout)
+        except Exception as e:
+            self._notify(RequestTiming('POST', url, None, time.monotonic() - start, None, 0, '', '', str(e)))
+            raise
+            
+        content_length = response.headers.get('content-length')
+        self._notify(RequestTiming(
+            'POST', url, response.status_code, time.monotonic() - start,
+            int(content_length) if content_length and content_length.isdigit() else None,
+            len(response.content),
+            response.headers.get('content-encoding', 'identity'),
+            self._http_version(response)
+        ))
+        return response
+    
+    def _http_version(self, response) -> str:
+        return ''
+    
+    def close(self):
+        pass
+    
+    def __enter__(self) -> 'HttpTransport':
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class RequestsTransport(HttpTransport):
+    """Transporte sobre requests con pool de conexiones keep-alive configurable"""
+    
+    backend = 'requests'
+    
+    def __init__(self, headers: Optional[Dict[str, str]] = None, timeout: float = TRANSPORT_CONFIG['timeout']):
+        super().__init__(headers, timeout)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=TRANSPORT_CONFIG['pool_connections'],
+            pool_maxsize=TRANSPORT_CONFIG['pool_maxsize'],
+            max_retries=TRANSPORT_CONFIG['max_retries'],
+            # Esperar una conexión libre en lugar de abrir conexiones descartables
+            pool_block=True
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update(self.headers)
+        if not TRANSPORT_CONFIG['keep_alive']:
+            self.session.headers['connection'] = 'close'
+    
+    def set_cookie(self, name: str, value: str, domain: str):
+        self.session.cookies.set(name, value, domain=domain)
+    
+    def _send(self, url: str, data: Dict, timeout: float):
+        return self.session.post(url, data=data, timeout=timeout)
+    
+    def _http_version(self, response) -> str:
+        version = getattr(response.raw, 'version', None)
+        return {10: 'HTTP/1.0', 11: 'HTTP/1.1', 20: 'HTTP/2'}.get(version, '')
+    
+    def close(self):
+        self.session.close()
+
+
+class HttpxTransport(HttpTransport):
+    """Transporte sobre httpx con HTTP/2: las búsquedas simultáneas comparten una conexión"""
+    
+    backend = 'httpx'
+    
+    def __init__(self, headers: Optional[Dict[str, str]] = None, timeout: float = TRANSPORT_CONFIG['timeout']):
+        import httpx
+        
+        super().__init__(headers, timeout)
+        self._timeout_error = httpx.TimeoutException
+        self.client = httpx.Client(
+            http2=TRANSPORT_CONFIG['http2'],
+            headers=self.headers,
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=TRANSPORT_CONFIG['pool_maxsize'],
+                max_keepalive_connections=TRANSPORT_CONFIG['pool_maxsize'] if TRANSPORT_CONFIG['keep_alive'] else 0
+            )
+        )
+    
+    def set_cookie(self, name: str, value: str, domain: str):
+        self.client.cookies.set(name, value, domain=domain)
+    
+    def _send(self, url: str, data: Dict, timeout: float):
+        try:
+            return self.client.post(url, data=data, timeout=timeout)
+        except self._timeout_error as e:
+            # El código de búsqueda distingue los timeouts con requests.Timeout
+            raise requests.Timeout(str(e)) from e
+    
+    def _http_version(self, response) -> str:
+        return response.http_version
+    
+    def close(self):
+        self.client.close()
+
+
+def create_transport(headers: Optional[Dict[str, str]] = None, cookie: Optional[Dict] = None,
+                     backend: str = TRANSPORT_CONFIG['backend']) -> HttpTransport:
+    """Crea el transporte indicado en la configuración; sin httpx/h2 se usa requests"""
+    if backend == 'httpx' and not http2_available():
+        logger.warning("⚠️ httpx[http2] no está instalado; se usa requests")
+        backend = 'requests'
+        
+    transport = HttpxTransport(headers) if backend == 'httpx' else RequestsTransport(headers)
+    if cookie:
+        transport.set_cookie(cookie['name'], cookie['value'], cookie['domain'])
+    logger.info(f"🌐 Transporte {transport.backend} (accept-encoding: {transport.headers['accept-encoding']})")
+    return transport
+
+
+class TimingStats:
+    """Hook que acumula tiempos y bytes por petición para el resumen de una corrida"""
+    
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.elapsed = 0.0
+        self.wire_bytes = 0
+        self.content_bytes = 0
+        self.encodings: Dict[str, int] = {}
+    
+    def __call__(self, timing: RequestTiming):
+        self.requests += 1
+        self.elapsed += timing.elapsed
+        if timing.error:
+            self.errors += 1
+            return
+        self.wire_bytes += timing.wire_bytes if timing.wire_bytes is not None else timing.content_bytes
+        self.content_bytes += timing.content_bytes
+        self.encodings[timing.encoding] = self.encodings.get(timing.encoding, 0) + 1
+    
+    def summary(self) -> Dict:
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'avg_latency': round(self.elapsed / self.requests, 3) if self.requests else 0.0,
+            'wire_bytes': self.wire_bytes,
+            'content_bytes': self.content_bytes,
+            'encodings': dict(self.encodings)
+        }
+
+
+def main():
+    """Función principal"""
+    print(f"🌐 Backend configurado: {TRANSPORT_CONFIG['backend']}")
+    print(f"  • HTTP/2 disponible: {'sí' if http2_available() else 'no (pip install httpx[http2])'}")
+    print(f"  • Compresiones soportadas (requests): {', '.join(supported_encodings('requests'))}")
+    print(f"  • Compresiones soportadas (httpx): {', '.join(supported_encodings('httpx'))}")
+    print(f"  • Pool: {TRANSPORT_CONFIG['pool_maxsize']} conexiones, keep-alive: {TRANSPORT_CONFIG['keep_alive']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+🎵 Logging Setup - SoundExchange
+================================
+
+Configuración de logging compartida y no bloqueante.
+
+Los módulos solo encolan los registros (`QueueHandler`); un hilo
+`QueueListener` los formatea y escribe en el archivo y la terminal, así que
+la escritura queda fuera del camino de cada petición. Las líneas por
+petición se marcan con `extra=PER_REQUEST` y se muestrean, y el archivo puede
+escribirse en JSONL para procesarlo con otras herramientas.
+"""
+
+import json
+import atexit
+import queue
+import logging
+import logging.handlers
+from datetime import datetime
+from typing import Optional
+
+from config import LOGGING_CONFIG
+
+# Marca de las líneas de log que se emiten una vez por petición
+PER_REQUEST = {'per_request': True}
+
+# Atributos estándar de LogRecord; el resto viene de `extra` y va al JSONL
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', 'taskName'}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler que no formatea en el hilo que loguea"""
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # El formateo (mensaje, argumentos, traceback) lo hace el hilo del listener
+        return record
+
+
+class RequestSampler(logging.Filter):
+    """Deja pasar una de cada `sample_every` líneas por petición; advertencias y errores siempre pasan"""
+    
+    def __init__(self, sample_every: int = LOGGING_CONFIG['request_sample_every']):
+        super().__init__()
+        self.sample_every = max(sample_every, 1)
+        self.seen = 0
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or not getattr(record, 'per_request', False):
+            return True
+        self.seen += 1
+        return (self.seen - 1) % self.sample_every == 0
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Formatea cada registro como una línea JSON con los campos de `extra`"""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': datetime.fromtimestamp(record.created).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+        entry.update({key: value for key, value in vars(record).items() if key not in _RECORD_ATTRIBUTES})
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def setup_logging(log_file: str = LOGGING_CONFIG['file'], level: str = LOGGING_CONFIG['level'],
+                  json_lines: bool = LOGGING_CONFIG['json_lines']):
+    """Configura el logging raíz con cola y listener; las llamadas siguientes no hacen nada"""
+    global _listener
+    if _listener is not None:
+        return
+        
+    file_handler = logging.FileHandler(log_file, encoding='utf-8')
+    file_handler.setFormatter(JsonLinesFormatter() if json_lines else logging.Formatter(LOGGING_CONFIG['format']))
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(LOGGING_CONFIG['format']))
+    
+    queue_handler = DeferredQueueHandler(queue.SimpleQueue())
+    queue_handler.addFilter(RequestSampler())
+    
+    root = logging.getLogger()
+    root.setLevel(getattr(logging, level))
+    root.addHandler(queue_handler)
+    
+    _listener = logging.handlers.QueueListener(queue_handler.queue, file_handler, stream_handler,
+                                               respect_handler_level=True)
+    _listener.start()
+    # Vaciar la cola antes de salir
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging():
+    """Escribe los registros pendientes y detiene el listener"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in list(logging.getLogger().handlers):
+            if isinstance(handler, DeferredQueueHandler):
+                logging.getLogger().removeHandler(handler)
+        _listener = None
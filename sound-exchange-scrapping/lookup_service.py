@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+"""
+🎵 Lookup Service - SoundExchange
+=================================
+
+Servicio local de consultas que mantiene una sesión y cookie Cloudflare
+activas y expone una pequeña API HTTP/JSON sobre BatchArtistScraper.
+
+Las consultas concurrentes del mismo artista (normalizado) se agrupan en una
+sola búsqueda contra SoundExchange, y todas las búsquedas comparten una única
+conexión con el delay configurado.
+
+Uso:
+    python lookup_service.py
+    python lookup_service.py --port 8765 --delay 1.5
+
+Endpoints:
+    GET  /artist?name=bad+bunny    Consulta un artista (espera el resultado)
+    POST /bulk {"artists": [...]}  Encola una lista y retorna un job_id
+    GET  /jobs/<job_id>            Estado y resultados de un job
+    GET  /health                   Estado del servicio
+"""
+
+import json
+import time
+import argparse
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import logging
+from typing import List, Dict, Optional, Tuple
+from urllib.parse import urlparse, parse_qs
+
+from config import SCRAPER_CONFIG, SERVICE_CONFIG
+from artist_scraper import normalize_artist_name
+from artist_result import ArtistResult, CATEGORY_CODES
+from batch_artist_scraper import BatchArtistScraper
+from logging_setup import setup_logging
+
+logger = logging.getLogger(__name__)
+
+
+def result_to_json(result: ArtistResult) -> Dict:
+    """Convierte un resultado en un diccionario serializable con las listas por categoría"""
+    data = dict(result)
+    data['categories'] = {code: list(result.category(code)) for code in CATEGORY_CODES}
+    return data
+
+
+class LookupService:
+    """Mantiene la sesión activa y agrupa consultas concurrentes por artista"""
+    
+    def __init__(self, headless: bool = True, delay: float = 2.0, adaptive: bool = SERVICE_CONFIG['adaptive'],
+                 cookie_ttl: float = SERVICE_CONFIG['cookie_ttl'],
+                 cache_ttl: float = SERVICE_CONFIG['cache_ttl'],
+                 max_workers: int = SERVICE_CONFIG['max_workers'],
+                 max_cache_entries: int = SERVICE_CONFIG['max_cache_entries'],
+                 job_retention: float = SERVICE_CONFIG['job_retention']):
+        self.scraper = BatchArtistScraper(headless=headless, delay=delay, adaptive=adaptive)
+        self.cookie_ttl = cookie_ttl
+        self.cache_ttl = cache_ttl
+        self.max_cache_entries = max_cache_entries
+        self.job_retention = job_retention
+        self.session_started = 0.0
+        self.started_at = datetime.now().isoformat()
+        
+        # Un solo hilo accede a SoundExchange a la vez
+        self._upstream_lock = threading.Lock()
+        self._state_lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+        # Orden de uso: los menos usados quedan al principio
+        self._cache: 'OrderedDict[str, Tuple[float, ArtistResult]]' = OrderedDict()
+        self._jobs: Dict[str, Dict] = {}
+        self._last_prune = time.monotonic()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='lookup')
+        self.upstream_sweeps = 0
+        self.coalesced_requests = 0
+        self.cache_hits = 0
+    
+    def ensure_session(self) -> bool:
+        """Crea o renueva la sesión si la cookie Cloudflare está vencida"""
+        if self.scraper.session and time.monotonic() - self.session_started < self.cookie_ttl:
+            return True
+            
+        logger.info("🔄 Renovando sesión y cookie Cloudflare...")
+        if not self.scraper.setup_session():
+            return False
+        self.session_started = time.monotonic()
+        return True
+    
+    def _sweep(self, artist: str) -> ArtistResult:
+        """Ejecuta la búsqueda en todas las categorías usando la conexión compartida"""
+        with self._upstream_lock:
+            if not self.ensure_session():
+                raise RuntimeError("No se pudo configurar la sesión con SoundExchange")
+            self.upstream_sweeps += 1
+            return self.scraper.process_artist(artist)
+    
+    def _prune(self, force: bool = False):
+        """Descarta resultados vencidos y jobs terminados hace más de job_retention (con _state_lock tomado)"""
+        now = time.monotonic()
+        if not force and now - self._last_prune < SERVICE_CONFIG['prune_interval']:
+            return
+        self._last_prune = now
+        
+        for key in [key for key, (stored, _) in self._cache.items() if now - stored >= self.cache_ttl]:
+            del self._cache[key]
+            
+        for job_id, job in list(self._jobs.items()):
+            if job['finished'] is None and all(future.done() for future in job['futures']):
+                job['finished'] = now
+            if job['finished'] is not None and now - job['finished'] >= self.job_retention:
+                del self._jobs[job_id]
+    
+    def _finish(self, key: str, future: Future):
+        """Guarda el resultado en cache y libera la consulta en curso"""
+        with self._state_lock:
+            self._inflight.pop(key, None)
+            # Los resultados con categorías fallidas no se guardan en cache
+            if not future.cancelled() and future.exception() is None and not future.result().failed_categories():
+                self._cache[key] = (time.monotonic(), future.result())
+                self._cache.move_to_end(key)
+                while len(self._cache) > self.max_cache_entries:
+                    self._cache.popitem(last=False)
+            self._prune()
+    
+    def lookup(self, artist: str) -> Future:
+        """Retorna un Future con el resultado del artista, agrupando consultas repetidas"""
+        key = normalize_artist_name(artist)
+        
+        with self._state_lock:
+            cached = self._cache.get(key)
+            if cached and time.monotonic() - cached[0] < self.cache_ttl:
+                self.cache_hits += 1
+                self._cache.move_to_end(key)
+                future = Future()
+                future.set_result(cached[1])
+                return future
+            if cached:
+                del self._cache[key]
+                
+            if key in self._inflight:
+                self.coalesced_requests += 1
+                return self._inflight[key]
+                
+            future = self._executor.submit(self._sweep, artist)
+            self._inflight[key] = future
+            
+        future.add_done_callback(lambda done: self._finish(key, done))
+        return future
+    
+    def submit_bulk(self, artists: List[str]) -> str:
+        """Encola una lista de artistas y retorna el identificador del job"""
+        job_id = uuid.uuid4().hex[:12]
+        unique = list(dict.fromkeys(artist.strip() for artist in artists if artist.strip()))
+        job = {
+            'job_id': job_id,
+            'created': datetime.now().isoformat(),
+            'artists': unique,
+            'futures': [self.lookup(artist) for artist in unique],
+            'finished': None
+        }
+        with self._state_lock:
+            self._prune()
+            self._jobs[job_id] = job
+        logger.info(f"📋 Job {job_id}: {len(unique)} artistas encolados")
+        return job_id
+    
+    def job_status(self, job_id: str) -> Optional[Dict]:
+        """Retorna el estado y los resultados disponibles de un job"""
+        with self._state_lock:
+            job = self._jobs.get(job_id)
+        if not job:
+            return None
+            
+        results = []
+        errors = []
+        for artist, future in zip(job['artists'], job['futures']):
+            if not future.done():
+                continue
+            if future.exception() is not None:
+                errors.append({'artist_name': artist, 'error': str(future.exception())})
+            else:
+                results.append(result_to_json(future.result()))
+                
+        done = len(results) + len(errors)
+        return {
+            'job_id': job_id,
+            'created': job['created'],
+            'status': 'done' if done == len(job['artists']) else 'running',
+            'total': len(job['artists']),
+            'completed': done,
+            'results': results,
+            'errors': errors
+        }
+    
+    def health(self) -> Dict:
+        """Retorna métricas básicas del servicio"""
+        with self._state_lock:
+            return {
+                'started_at': self.started_at,
+                'session_active': self.scraper.session is not None,
+                'session_age': round(time.monotonic() - self.session_started, 1) if self.session_started else None,
+                'cache_size': len(self._cache),
+                'inflight': len(self._inflight),
+                'jobs': len(self._jobs),
+                'upstream_sweeps': self.upstream_sweeps,
+                'coalesced_requests': self.coalesced_requests,
+                'cache_hits': self.cache_hits,
+                'rate_controller': self.scraper.controller.metrics() if self.scraper.controller else None
+            }
+    
+    def shutdown(self):
+        """Detiene los hilos de consulta"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class LookupRequestHandler(BaseHTTPRequestHandler):
+    """Handler HTTP de la API JSON"""
+    
+    service: LookupService = None
+    request_timeout: float = SERVICE_CONFIG['request_timeout']
+    
+    def _send_json(self, status: int, payload: Dict):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        
+        if parsed.path == '/health':
+            self._send_json(200, self.service.health())
+            
+        elif parsed.path == '/artist':
+            name = parse_qs(parsed.query).get('name', [''])[0].strip()
+            if not name:
+                self._send_json(400, {'error': "Falta el parámetro 'name'"})
+                return
+            try:
+                result = self.service.lookup(name).result(timeout=self.request_timeout)
+                self._send_json(200, result_to_json(result))
+            except FutureTimeoutError:
+                self._send_json(504, {'error': 'Tiempo de espera agotado', 'artist_name': name})
+            except Exception as e:
+                self._send_json(502, {'error': str(e), 'artist_name': name})
+                
+        elif parsed.path.startswith('/jobs/'):
+            status = self.service.job_status(parsed.path[len('/jobs/'):])
+            if status is None:
+                self._send_json(404, {'error': 'Job no encontrado'})
+            else:
+                self._send_json(200, status)
+                
+        else:
+            self._send_json(404, {'error': 'Ruta no encontrada'})
+    
+    def do_POST(self):
+        if urlparse(self.path).path != '/bulk':
+            self._send_json(404, {'error': 'Ruta no encontrada'})
+            return
+            
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            payload = json.loads(self.rfile.read(length) or b'{}')
+            artists = payload.get('artists', [])
+            if not isinstance(artists, list) or not artists:
+                raise ValueError("'artists' debe ser una lista no vacía")
+        except (ValueError, AttributeError) as e:
+            self._send_json(400, {'error': str(e)})
+            return
+            
+        job_id = self.service.submit_bulk([str(artist) for artist in artists])
+        self._send_json(202, {'job_id': job_id, 'status_url': f'/jobs/{job_id}'})
+    
+    def log_message(self, format, *args):
+        logger.debug(f"🌐 {self.address_string()} - {format % args}")
+
+
+def main():
+    """Función principal"""
+    setup_logging('lookup_service.log')
+    parser = argparse.ArgumentParser(
+        description="Servicio local de consultas a SoundExchange",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Ejemplos de uso:
+  python lookup_service.py
+  python lookup_service.py --port 9000 --delay 1.5
+  curl 'http://127.0.0.1:8765/artist?name=bad+bunny'
+        """
+    )
+    
+    parser.add_argument('--host', type=str, default=SERVICE_CONFIG['host'], help='Host donde escuchar')
+    parser.add_argument('--port', type=int, default=SERVICE_CONFIG['port'], help='Puerto donde escuchar')
+    parser.add_argument(
+        '--delay',
+        type=float,
+        default=SCRAPER_CONFIG['delay_between_searches'],
+        help='Delay entre búsquedas en segundos'
+    )
+    parser.add_argument(
+        '--headless',
+        action='store_true',
+        default=SCRAPER_CONFIG['headless_mode'],
+        help='Ejecutar en modo headless'
+    )
+    parser.add_argument(
+        '--adaptive',
+        action='store_true',
+        default=SERVICE_CONFIG['adaptive'],
+        help='Ajustar concurrencia y delay automáticamente según la respuesta de SoundExchange (default)'
+    )
+    parser.add_argument(
+        '--fixed-delay',
+        dest='adaptive',
+        action='store_false',
+        help='Usar siempre --delay entre búsquedas, sin control adaptativo'
+    )
+    
+    args = parser.parse_args()
+    
+    service = LookupService(headless=args.headless, delay=args.delay, adaptive=args.adaptive)
+    
+    # Obtener la cookie antes de aceptar consultas
+    if not service.ensure_session():
+        logger.warning("⚠️ No se pudo preparar la sesión; se reintentará con la primera consulta")
+        
+    LookupRequestHandler.service = service
+    server = ThreadingHTTPServer((args.host, args.port), LookupRequestHandler)
+    logger.info(f"🚀 Servicio escuchando en http://{args.host}:{args.port}")
+    
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n⏹️ Servicio detenido por el usuario")
+    finally:
+        server.server_close()
+        service.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+🎵 Name Variants - SoundExchange
+================================
+
+Expansión de nombres de artistas en variantes canónicas de búsqueda.
+
+Un mismo artista aparece en SoundExchange con distintas formas: con o sin
+"feat.", "&" en lugar de "and", con o sin acentos, con sufijos societarios
+como "LLC" o "SA". Cada nombre de entrada se expande en un conjunto chico de
+formas normalizadas; BatchArtistScraper busca cada forma una sola vez por
+corrida y atribuye los resultados a todos los artistas que la generaron.
+
+Uso:
+    python name_variants.py "Beyoncé & Jay-Z feat. Kendrick" "rimas entertainment llc"
+"""
+
+import re
+import sys
+import unicodedata
+from typing import List
+
+from config import NAME_VARIANT_CONFIG
+from artist_result import SearchOutcome, STATUS_OK, STATUS_EMPTY, STATUS_SKIPPED
+from artist_scraper import normalize_artist_name
+
+# La colaboración se corta solo después del nombre principal y si le sigue otro nombre ("the feat" no se toca)
+_FEATURE_PATTERN = re.compile(
+    r'\s+[\(\[]?(?:' + '|'.join(re.escape(marker) for marker in NAME_VARIANT_CONFIG['feature_markers']) + r')\s+\S.*$'
+)
+# Puntos opcionales: "s.a.", "s.a" y "sa" son el mismo sufijo
+_SUFFIX_PATTERN = re.compile(
+    r'[\s,]+(?:' + '|'.join(re.escape(suffix.rstrip('.')).replace(r'\.', r'\.?') + r'\.?'
+                            for suffix in NAME_VARIANT_CONFIG['company_suffixes']) + r')$'
+)
+_STOP_WORDS = frozenset(NAME_VARIANT_CONFIG['stop_words'])
+
+
+def strip_accents(name: str) -> str:
+    """Quita los acentos y diacríticos de un nombre"""
+    decomposed = unicodedata.normalize('NFKD', name)
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def is_searchable(form: str) -> bool:
+    """False si la forma es muy corta o solo tiene palabras comunes ("the", "los"): traería resultados de otros artistas"""
+    return len(form) >= NAME_VARIANT_CONFIG['min_length'] and not set(form.split()) <= _STOP_WORDS
+
+
+def expand_variants(artist: str, max_variants: int = NAME_VARIANT_CONFIG['max_variants']) -> List[str]:
+    """Retorna las formas de búsqueda de un artista, empezando por el nombre normalizado"""
+    base = normalize_artist_name(artist)
+    if not base:
+        return []
+        
+    variants = [base]
+    
+    def add(form: str):
+        form = normalize_artist_name(form).strip(' ,.-')
+        if is_searchable(form) and form not in variants:
+            variants.append(form)
+            
+    # Sin colaboraciones: "bad bunny feat. drake" -> "bad bunny"; el resto parte de esta forma
+    core = normalize_artist_name(_FEATURE_PATTERN.sub('', base)).strip(' ,.-')
+    if not is_searchable(core):
+        core = base
+    add(core)
+    # Conectores equivalentes
+    if ' & ' in core:
+        add(core.replace(' & ', ' and '))
+    elif ' and ' in core:
+        add(core.replace(' and ', ' & '))
+    # Sin acentos
+    add(strip_accents(core))
+    # Sin sufijo societario: "rimas entertainment llc" -> "rimas entertainment"
+    add(_SUFFIX_PATTERN.sub('', strip_accents(core)))
+    
+    return variants[:max_variants]
+
+
+def merge_outcomes(outcomes: List[SearchOutcome]) -> SearchOutcome:
+    """Combina los resultados de una categoría para varias formas del mismo artista"""
+    items = list(dict.fromkeys(item for outcome in outcomes for item in outcome.items))
+    failed = [outcome for outcome in outcomes if outcome.failed]
+    
+    # Una forma fallida deja la categoría incompleta para que se reintente
+    if failed:
+        return SearchOutcome(failed[0].status, items, failed[0].detail)
+    if items:
+        return SearchOutcome(STATUS_OK, items)
+    if outcomes and all(outcome.status == STATUS_SKIPPED for outcome in outcomes):
+        return SearchOutcome(STATUS_SKIPPED, [], outcomes[0].detail)
+    return SearchOutcome(STATUS_EMPTY, [])
+
+
+def main():
+    """Función principal"""
+    if len(sys.argv) < 2:
+        print("❌ Uso: python name_variants.py \"nombre del artista\" [...]")
+        sys.exit(1)
+        
+    for artist in sys.argv[1:]:
+        print(f"🎵 {artist}")
+        for variant in expand_variants(artist):
+            print(f"  • {variant}")
+
+
+if __name__ == "__main__":
+    main()
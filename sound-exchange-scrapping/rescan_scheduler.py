@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+🎵 Rescan Scheduler - SoundExchange
+===================================
+
+Planificador de re-escaneos basado en antigüedad y tasa de cambio.
+
+Mantiene un historial por artista (último chequeo, cantidad de chequeos y de
+cambios) y en cada corrida procesa primero a los artistas más vencidos, hasta
+agotar el presupuesto de peticiones. Los artistas nuevos, los que cambian
+seguido y los que tuvieron resultados recientemente se revisan más a menudo
+que los que llevan tiempo estables.
+
+Uso:
+    python rescan_scheduler.py --file artists_list.txt
+    python rescan_scheduler.py --file artists_list.txt --budget 200 --dry-run
+"""
+
+import json
+import hashlib
+import heapq
+import sys
+import argparse
+from datetime import datetime, timedelta
+import logging
+from typing import List, Dict, Optional, Tuple
+from pathlib import Path
+
+from config import SCRAPER_CONFIG, SCHEDULER_CONFIG, HISTORY_CONFIG
+from artist_scraper import normalize_artist_name
+from artist_result import ArtistResult
+from batch_artist_scraper import BatchArtistScraper, load_artists_from_file
+from logging_setup import setup_logging
+
+logger = logging.getLogger(__name__)
+
+
+def result_signature(result: ArtistResult) -> str:
+    """Genera una firma de los resultados por categoría para detectar cambios"""
+    payload = '\x1e'.join('\x1f'.join(items) for items in result.results)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+class RescanScheduler:
+    """Cola de prioridad de artistas según antigüedad y tasa de cambio"""
+    
+    def __init__(self, state_file: str = SCHEDULER_CONFIG['state_file'],
+                 request_budget: int = SCHEDULER_CONFIG['request_budget']):
+        self.state_file = Path(state_file)
+        self.request_budget = request_budget
+        self.min_interval = timedelta(hours=SCHEDULER_CONFIG['min_interval_hours'])
+        self.max_interval = timedelta(hours=SCHEDULER_CONFIG['max_interval_hours'])
+        self.recent_window = timedelta(days=SCHEDULER_CONFIG['recent_results_days'])
+        self.min_priority = SCHEDULER_CONFIG['min_priority']
+        self.state = self._load_state()
+    
+    def _load_state(self) -> Dict[str, Dict]:
+        """Carga el historial de chequeos"""
+        if not self.state_file.exists():
+            return {}
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.error(f"❌ Error cargando estado {self.state_file}: {e}")
+            return {}
+    
+    def save_state(self):
+        """Guarda el historial de chequeos de forma atómica"""
+        tmp_file = self.state_file.with_suffix(self.state_file.suffix + '.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, ensure_ascii=False, indent=2)
+        tmp_file.replace(self.state_file)
+        logger.info(f"💾 Estado guardado: {self.state_file} ({len(self.state)} artistas)")
+    
+    def check_interval(self, entry: Dict, now: datetime) -> timedelta:
+        """Calcula cada cuánto debe revisarse un artista según su historial"""
+        # Tasa de cambio suavizada: un artista sin historial cuenta como 50%
+        change_rate = (entry.get('changes', 0) + 1) / (entry.get('checks', 0) + 2)
+        interval = self.max_interval - (self.max_interval - self.min_interval) * change_rate
+        
+        last_found = entry.get('last_found')
+        if last_found and now - datetime.fromisoformat(last_found) <= self.recent_window:
+            interval = self.min_interval
+            
+        return max(interval, self.min_interval)
+    
+    def priority(self, artist: str, now: datetime) -> float:
+        """Prioridad de un artista: antigüedad del último chequeo sobre su intervalo"""
+        entry = self.state.get(normalize_artist_name(artist))
+        if not entry or not entry.get('last_checked'):
+            return float('inf')
+        age = now - datetime.fromisoformat(entry['last_checked'])
+        return age / self.check_interval(entry, now)
+    
+    def select(self, artists: List[str], categories_per_artist: int = 4,
+               now: Optional[datetime] = None) -> List[Tuple[str, float]]:
+        """Selecciona los artistas más prioritarios que entran en el presupuesto"""
+        now = now or datetime.now()
+        
+        heap = []
+        seen = set()
+        for artist in artists:
+            key = normalize_artist_name(artist)
+            if not key or key in seen:
+                continue
+            seen.add(key)
+            priority = self.priority(artist, now)
+            if priority >= self.min_priority:
+                heap.append((-priority, key, artist))
+        heapq.heapify(heap)
+        
+        max_artists = max(self.request_budget // categories_per_artist, 0)
+        selected = []
+        while heap and len(selected) < max_artists:
+            negative_priority, _, artist = heapq.heappop(heap)
+            selected.append((artist, -negative_priority))
+            
+        logger.info(f"📋 {len(seen)} artistas en la lista, {len(selected)} seleccionados "
+                    f"(presupuesto: {self.request_budget} peticiones)")
+        return selected
+    
+    def record(self, result: ArtistResult, now: Optional[datetime] = None) -> bool:
+        """Actualiza el historial con un resultado; retorna True si hubo cambios"""
+        # Los errores, búsquedas incompletas y categorías omitidas no cuentan como chequeo: el artista sigue vencido
+        if result.status.startswith('Error') or result.failed_categories() or result.skipped_categories():
+            return False
+            
+        now = now or datetime.now()
+        key = normalize_artist_name(result.artist_name)
+        entry = self.state.setdefault(key, {'artist_name': result.artist_name, 'first_seen': now.isoformat(),
+                                            'checks': 0, 'changes': 0})
+        
+        signature = result_signature(result)
+        changed = 'signature' in entry and entry['signature'] != signature
+        
+        entry['checks'] = entry.get('checks', 0) + 1
+        entry['changes'] = entry.get('changes', 0) + (1 if changed else 0)
+        entry['signature'] = signature
+        entry['last_checked'] = now.isoformat()
+        if result.total_results > 0:
+            entry['last_found'] = now.isoformat()
+            
+        return changed
+    
+    def run(self, scraper: BatchArtistScraper, artists: List[str]) -> List[ArtistResult]:
+        """Re-escanea los artistas seleccionados y actualiza el historial"""
+        selected = self.select(artists, categories_per_artist=len(scraper.categories))
+        if not selected:
+            logger.info("✅ No hay artistas vencidos en esta corrida")
+            return []
+            
+        results = scraper.process_artists_list([artist for artist, _ in selected])
+        
+        changes = sum(1 for result in results if self.record(result))
+        logger.info(f"🔄 {changes} artistas con cambios de {len(results)} revisados")
+        
+        self.save_state()
+        return results
+
+
+def main():
+    """Función principal"""
+    setup_logging('rescan_scheduler.log')
+    parser = argparse.ArgumentParser(
+        description="Planificador de re-escaneos para SoundExchange",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Ejemplos de uso:
+  python rescan_scheduler.py --file artists_list.txt
+  python rescan_scheduler.py --file artists_list.txt --budget 200
+  python rescan_scheduler.py --file artists_list.txt --dry-run
+        """
+    )
+    
+    parser.add_argument(
+        '--file',
+        type=str,
+        required=True,
+        help='Archivo de texto con un artista por línea'
+    )
+    parser.add_argument(
+        '--budget',
+        type=int,
+        default=SCHEDULER_CONFIG['request_budget'],
+        help='Máximo de peticiones a SoundExchange en esta corrida'
+    )
+    parser.add_argument(
+        '--state',
+        type=str,
+        default=SCHEDULER_CONFIG['state_file'],
+        help='Archivo con el historial de chequeos'
+    )
+    parser.add_argument(
+        '--dry-run',
+        action='store_true',
+        help='Mostrar los artistas seleccionados sin buscarlos'
+    )
+    parser.add_argument(
+        '--delay',
+        type=float,
+        default=SCRAPER_CONFIG['delay_between_searches'],
+        help='Delay entre búsquedas en segundos'
+    )
+    parser.add_argument(
+        '--headless',
+        action='store_true',
+        default=SCRAPER_CONFIG['headless_mode'],
+        help='Ejecutar en modo headless'
+    )
+    parser.add_argument(
+        '--output',
+        type=str,
+        help='Nombre del archivo de salida (sin extensión)'
+    )
+    
+    args = parser.parse_args()
+    
+    if not Path(args.file).exists():
+        print(f"❌ El archivo {args.file} no existe")
+        sys.exit(1)
+        
+    artists = load_artists_from_file(args.file)
+    if not artists:
+        print(f"❌ No se pudieron cargar artistas desde {args.file}")
+        sys.exit(1)
+        
+    scheduler = RescanScheduler(state_file=args.state, request_budget=args.budget)
+    scraper = BatchArtistScraper(headless=args.headless, delay=args.delay)
+    
+    if args.dry_run:
+        selected = scheduler.select(artists, categories_per_artist=len(scraper.categories))
+        print(f"\n📋 Artistas seleccionados: {len(selected)}")
+        for artist, priority in selected:
+            print(f"  • {artist} (prioridad: {'nuevo' if priority == float('inf') else f'{priority:.2f}'})")
+        return
+        
+    try:
+        results = scheduler.run(scraper, artists)
+        
+        if results:
+            base_filename = args.output if args.output else f"soundexchange_rescan_{len(results)}_artists"
+            csv_file = scraper.save_to_csv(results, f"{base_filename}.csv")
+            if HISTORY_CONFIG['enabled']:
+                scraper.save_to_history(results)
+            
+            print(f"\n✅ RE-ESCANEO COMPLETADO")
+            print(f"📊 Artistas revisados: {len(results)} de {len(artists)}")
+            print(f"🎯 Artistas con resultados: {sum(1 for r in results if r['total_results'] > 0)}")
+            print(f"💾 CSV: {csv_file}")
+        else:
+            print("✅ No había artistas vencidos")
+            
+    except KeyboardInterrupt:
+        print(f"\n⏹️ Procesamiento interrumpido por el usuario")
+    except Exception as e:
+        logger.error(f"❌ Error en el re-escaneo: {e}")
+        print(f"\n❌ Error: {e}")
+        print("Revisa el log para más detalles")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+🎵 Response Archive - SoundExchange
+===================================
+
+Archivo opcional de las respuestas crudas de `ulists_get_query`.
+
+Cada cuerpo de respuesta se guarda comprimido con zstd (zlib si pyarrow no
+trae el códec) y direccionado por contenido: el SHA-256 del cuerpo es su
+clave, así que las respuestas idénticas (p. ej. todas las búsquedas sin
+resultados) se guardan una sola vez. Un índice en SQLite registra cada
+búsqueda por (artista normalizado, categoría, fecha de descarga), y qué
+formas de búsqueda (variantes de nombre) componen cada artista pedido.
+
+Si SoundExchange cambia el HTML alrededor de `.uli-search-item` o hace falta
+extraer más campos, `reparse` vuelve a ejecutar la extracción sobre el
+archivo en paralelo con todos los núcleos, sin repetir ninguna búsqueda.
+
+Uso:
+    python batch_artist_scraper.py --file artists_list.txt --archive
+    python response_archive.py stats
+    python response_archive.py reparse --output reparse.csv
+"""
+
+import os
+import csv
+import zlib
+import sqlite3
+import hashlib
+import argparse
+import importlib
+import itertools
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+import logging
+from typing import List, Dict, Optional, Callable, Iterator, Tuple
+from pathlib import Path
+
+import pyarrow as pa
+
+from config import ARCHIVE_CONFIG, HISTORY_CONFIG
+from artist_scraper import normalize_artist_name
+from artist_result import (ArtistResult, SearchOutcome, CSV_FIELDNAMES, CATEGORY_CODES,
+                           STATUS_OK, STATUS_EMPTY, STATUS_PARSE_ERROR, STATUS_SKIPPED)
+from name_variants import merge_outcomes
+from logging_setup import setup_logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PARSER = 'artist_scraper:parse_search_response'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    digest TEXT PRIMARY KEY,
+    codec TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS responses (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    artist TEXT NOT NULL,
+    artist_key TEXT NOT NULL,
+    category TEXT NOT NULL,
+    fetched_at TEXT NOT NULL,
+    digest TEXT NOT NULL REFERENCES blobs (digest)
+);
+CREATE INDEX IF NOT EXISTS responses_by_artist ON responses (artist_key, category, fetched_at);
+CREATE INDEX IF NOT EXISTS responses_by_date ON responses (fetched_at);
+CREATE TABLE IF NOT EXISTS forms (
+    artist TEXT NOT NULL,
+    artist_key TEXT NOT NULL,
+    form_key TEXT NOT NULL,
+    PRIMARY KEY (artist_key, form_key)
+);
+"""
+
+
+def _codec(level: int = ARCHIVE_CONFIG['compression_level']) -> Optional[pa.Codec]:
+    """Códec zstd de pyarrow, o None si esta compilación no lo incluye"""
+    if not pa.Codec.is_available('zstd'):
+        return None
+    return pa.Codec('zstd', compression_level=level)
+
+
+def compress_body(body: bytes, level: int = ARCHIVE_CONFIG['compression_level']) -> Tuple[str, bytes]:
+    """Comprime un cuerpo de respuesta; retorna el nombre del códec y los datos"""
+    codec = _codec(level)
+    if codec is None:
+        return 'zlib', zlib.compress(body, 6)
+    return 'zstd', codec.compress(body, asbytes=True)
+
+
+def decompress_body(codec: str, data: bytes, size: int) -> bytes:
+    """Descomprime un cuerpo guardado con compress_body"""
+    if codec == 'zlib':
+        return zlib.decompress(data)
+    return pa.Codec('zstd').decompress(data, decompressed_size=size, asbytes=True)
+
+
+class ResponseArchive:
+    """Archivo de respuestas crudas direccionado por contenido con índice en SQLite"""
+    
+    def __init__(self, path: str = ARCHIVE_CONFIG['path'], readonly: bool = False):
+        self.path = str(Path(path).expanduser())
+        self.level = ARCHIVE_CONFIG['compression_level']
+        # Las búsquedas en paralelo (--adaptive) comparten la conexión de a una
+        self._lock = threading.Lock()
+        if readonly:
+            self._db = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+        else:
+            self._db = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute('PRAGMA synchronous=NORMAL')
+            self._db.executescript(SCHEMA)
+    
+    def store(self, artist: str, category: str, body: bytes, fetched_at: Optional[str] = None) -> str:
+        """Archiva una respuesta; el cuerpo solo se comprime y guarda si no estaba ya. Retorna su digest"""
+        digest = hashlib.sha256(body).hexdigest()
+        with self._lock:
+            if self._db.execute('SELECT 1 FROM blobs WHERE digest = ?', (digest,)).fetchone() is None:
+                codec, data = compress_body(body, self.level)
+                self._db.execute('INSERT OR IGNORE INTO blobs (digest, codec, size, data) VALUES (?, ?, ?, ?)',
+                                 (digest, codec, len(body), data))
+            self._db.execute(
+                'INSERT INTO responses (artist, artist_key, category, fetched_at, digest) VALUES (?, ?, ?, ?, ?)',
+                (artist, normalize_artist_name(artist), category, fetched_at or datetime.now().isoformat(), digest)
+            )
+            self._db.commit()
+        return digest
+    
+    def store_forms(self, artist: str, forms: List[str]):
+        """Registra las formas de búsqueda cuyos resultados se combinan en un artista pedido"""
+        artist_key = normalize_artist_name(artist)
+        with self._lock:
+            self._db.executemany(
+                'INSERT OR IGNORE INTO forms (artist, artist_key, form_key) VALUES (?, ?, ?)',
+                [(artist, artist_key, normalize_artist_name(form)) for form in forms]
+            )
+            self._db.commit()
+    
+    def artist_forms(self, artists: Optional[List[str]] = None) -> Dict[str, Tuple[str, List[str]]]:
+        """Formas de búsqueda de cada artista pedido: clave -> (artista, claves de las formas)"""
+        with self._lock:
+            # Los archivos anteriores a la tabla de formas se abren en solo lectura sin ella
+            if self._db.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'forms'").fetchone() is None:
+                return {}
+            query = 'SELECT artist, artist_key, form_key FROM forms'
+            params: List = []
+            if artists:
+                params = [normalize_artist_name(artist) for artist in artists]
+                query += f" WHERE artist_key IN ({','.join('?' * len(params))})"
+            rows = self._db.execute(query, params).fetchall()
+            
+        forms: Dict[str, Tuple[str, List[str]]] = {}
+        for artist, artist_key, form_key in rows:
+            forms.setdefault(artist_key, (artist, []))[1].append(form_key)
+        return forms
+    
+    def read_bodies(self, digests: List[str]) -> Iterator[Tuple[str, bytes]]:
+        """Recorre los cuerpos descomprimidos de una lista de digests"""
+        placeholders = ','.join('?' * len(digests))
+        with self._lock:
+            rows = self._db.execute(f'SELECT digest, codec, size, data FROM blobs WHERE digest IN ({placeholders})',
+                                    digests).fetchall()
+        for digest, codec, size, data in rows:
+            yield digest, decompress_body(codec, data, size)
+    
+    def latest_responses(self, since: Optional[str] = None, until: Optional[str] = None,
+                         artists: Optional[List[str]] = None) -> List[Tuple[str, str, str, str, str]]:
+        """Última respuesta de cada (artista, categoría) en el período: (artista, clave, categoría, fecha, digest)"""
+        conditions = []
+        params: List = []
+        if since:
+            conditions.append('fetched_at >= ?')
+            params.append(since)
+        if until:
+            # Fecha inclusive: cualquier hora de ese día es menor que el día siguiente en texto ISO
+            conditions.append('fetched_at < ?')
+            params.append((date.fromisoformat(until) + timedelta(days=1)).isoformat())
+        if artists:
+            keys = [normalize_artist_name(artist) for artist in artists]
+            conditions.append(f"artist_key IN ({','.join('?' * len(keys))})")
+            params.extend(keys)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        
+        with self._lock:
+            return self._db.execute(
+                'SELECT artist, artist_key, category, fetched_at, digest FROM responses '
+                f'WHERE id IN (SELECT MAX(id) FROM responses {where} GROUP BY artist_key, category) '
+                'ORDER BY artist_key, category',
+                params
+            ).fetchall()
+    
+    def stats(self) -> Dict:
+        """Retorna el tamaño del archivo: búsquedas, cuerpos distintos y bytes antes y después de comprimir"""
+        with self._lock:
+            responses, artists, first, last = self._db.execute(
+                'SELECT COUNT(*), COUNT(DISTINCT artist_key), MIN(fetched_at), MAX(fetched_at) FROM responses'
+            ).fetchone()
+            bodies, raw_bytes, stored_bytes = self._db.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(LENGTH(data)), 0) FROM blobs'
+            ).fetchone()
+            # Bytes que ocuparían todas las respuestas sin deduplicar ni comprimir
+            logical_bytes = self._db.execute(
+                'SELECT COALESCE(SUM(b.size), 0) FROM responses r JOIN blobs b ON b.digest = r.digest'
+            ).fetchone()[0]
+        return {
+            'responses': responses,
+            'artists': artists,
+            'unique_bodies': bodies,
+            'first_fetch': first,
+            'last_fetch': last,
+            'logical_bytes': logical_bytes,
+            'raw_bytes': raw_bytes,
+            'stored_bytes': stored_bytes
+        }
+    
+    def close(self):
+        self._db.close()
+
+
+def load_parser(spec: str = DEFAULT_PARSER) -> Callable[[bytes], List[str]]:
+    """Importa una función de extracción indicada como 'modulo:funcion'"""
+    module_name, _, function_name = spec.partition(':')
+    if not function_name:
+        raise ValueError(f"El parser debe tener la forma modulo:funcion: {spec}")
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+def _parse_chunk(task: Tuple[str, List[str], str]) -> Dict[str, Tuple[str, List[str], str]]:
+    """Parsea un bloque de cuerpos en un proceso aparte; retorna digest -> (estado, resultados, detalle)"""
+    path, digests, parser_spec = task
+    parser = load_parser(parser_spec)
+    archive = ResponseArchive(path, readonly=True)
+    parsed = {}
+    try:
+        for digest, body in archive.read_bodies(digests):
+            try:
+                items = list(parser(body))
+                parsed[digest] = (STATUS_OK if items else STATUS_EMPTY, items, '')
+            except Exception as e:
+                parsed[digest] = (STATUS_PARSE_ERROR, [], str(e))
+    finally:
+        archive.close()
+    return parsed
+
+
+def reparse(path: str = ARCHIVE_CONFIG['path'], parser_spec: str = DEFAULT_PARSER,
+            since: Optional[str] = None, until: Optional[str] = None, artists: Optional[List[str]] = None,
+            workers: Optional[int] = None, chunk_size: int = ARCHIVE_CONFIG['reparse_chunk']) -> List[ArtistResult]:
+    """Vuelve a extraer los resultados de la última respuesta archivada de cada artista y categoría"""
+    archive = ResponseArchive(path, readonly=True)
+    try:
+        forms = archive.artist_forms(artists)
+        if artists:
+            # Con filtro de artistas también hacen falta las respuestas de sus variantes
+            artists = list(dict.fromkeys([normalize_artist_name(artist) for artist in artists] +
+                                         [form for _, form_keys in forms.values() for form in form_keys]))
+        rows = archive.latest_responses(since, until, artists)
+    finally:
+        archive.close()
+        
+    # Cada cuerpo distinto se parsea una sola vez, aunque lo compartan muchas búsquedas
+    digests = list(dict.fromkeys(row[4] for row in rows))
+    chunks = [digests[start:start + chunk_size] for start in range(0, len(digests), chunk_size)]
+    workers = workers or os.cpu_count() or 1
+    logger.info(f"🧩 Re-parseando {len(digests)} respuestas distintas ({len(rows)} búsquedas) con {workers} procesos")
+    
+    parsed: Dict[str, Tuple[str, List[str], str]] = {}
+    if workers == 1:
+        for chunk in chunks:
+            parsed.update(_parse_chunk((path, chunk, parser_spec)))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for result in executor.map(_parse_chunk, [(path, chunk, parser_spec) for chunk in chunks]):
+                parsed.update(result)
+                
+    # Resultados de cada forma buscada: clave -> (nombre, resultados por categoría, fecha más reciente)
+    searched = {}
+    for key, group in itertools.groupby(rows, key=lambda row: row[1]):
+        group = list(group)
+        latest = max(group, key=lambda row: row[3])
+        searched[key] = (latest[0], {category: SearchOutcome(*parsed[digest]) for _, _, category, _, digest in group},
+                         latest[3])
+    
+    # Una forma que solo se buscó como variante de otro artista no es un resultado propio
+    variant_only = {form for _, form_keys in forms.values() for form in form_keys} - forms.keys()
+    # Sin respuesta archivada no hay resultado verificado: no debe leerse como "no encontrado"
+    missing = SearchOutcome(STATUS_SKIPPED, [], 'Sin respuesta archivada')
+    results = []
+    for key in sorted(forms.keys() | (searched.keys() - variant_only)):
+        artist, form_keys = forms.get(key, (searched[key][0], [key]))
+        if not any(form in searched for form in form_keys):
+            continue
+        outcomes = {
+            code: merge_outcomes([searched[form][1].get(code, missing) if form in searched else missing
+                                  for form in form_keys])
+            for code in CATEGORY_CODES
+        }
+        timestamp = max(searched[form][2] for form in form_keys if form in searched)
+        results.append(ArtistResult.from_outcomes(artist, outcomes, timestamp=timestamp))
+        
+    failed = sum(1 for status, _, _ in parsed.values() if status == STATUS_PARSE_ERROR)
+    if failed:
+        logger.warning(f"⚠️ {failed} respuestas no se pudieron parsear")
+    return results
+
+
+def main():
+    """Función principal"""
+    setup_logging('response_archive.log')
+    parser = argparse.ArgumentParser(
+        description="Archivo de respuestas crudas de SoundExchange",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Ejemplos de uso:
+  python response_archive.py stats
+  python response_archive.py reparse --output reparse.csv
+  python response_archive.py reparse --since 2026-07-01 --workers 8 --history
+  python response_archive.py reparse --parser mi_parser:extraer --artist "bad bunny"
+        """
+    )
+    
+    parser.add_argument('--path', type=str, default=ARCHIVE_CONFIG['path'], help='Base SQLite del archivo')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    subparsers.add_parser('stats', help='Mostrar el tamaño del archivo')
+    
+    reparse_parser = subparsers.add_parser('reparse', help='Volver a extraer los resultados sin repetir búsquedas')
+    reparse_parser.add_argument('--parser', type=str, default=DEFAULT_PARSER,
+                                help=f'Función de extracción modulo:funcion (default: {DEFAULT_PARSER})')
+    reparse_parser.add_argument('--since', type=str, help='Desde la fecha AAAA-MM-DD')
+    reparse_parser.add_argument('--until', type=str, help='Hasta la fecha AAAA-MM-DD')
+    reparse_parser.add_argument('--artist', action='append', help='Solo este artista (repetible)')
+    reparse_parser.add_argument('--workers', type=int, help='Procesos en paralelo (default: todos los núcleos)')
+    reparse_parser.add_argument('--output', type=str, help='Archivo CSV de salida')
+    reparse_parser.add_argument('--history', action='store_true', help='Agregar también los resultados al historial')
+    
+    args = parser.parse_args()
+    
+    if not Path(args.path).expanduser().exists():
+        print(f"❌ No existe el archivo {args.path}")
+        return
+        
+    if args.command == 'stats':
+        archive = ResponseArchive(args.path, readonly=True)
+        stats = archive.stats()
+        archive.close()
+        ratio = stats['logical_bytes'] / stats['stored_bytes'] if stats['stored_bytes'] else 0
+        print(f"🗃️ {stats['responses']} respuestas de {stats['artists']} artistas "
+              f"({stats['first_fetch']} → {stats['last_fetch']})")
+        print(f"  • Cuerpos distintos: {stats['unique_bodies']}")
+        print(f"  • Tamaño: {stats['logical_bytes'] / 2**20:.1f} MB sin deduplicar, "
+              f"{stats['stored_bytes'] / 2**20:.1f} MB guardados ({ratio:.0f}x)")
+        return
+        
+    results = reparse(args.path, args.parser, args.since, args.until, args.artist, args.workers)
+    filename = args.output or str(Path.home() / "Downloads" / f"soundexchange_reparse_{datetime.now():%Y%m%d_%H%M%S}.csv")
+    with open(Path(filename).expanduser(), 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=CSV_FIELDNAMES)
+        writer.writeheader()
+        writer.writerows(results)
+    print(f"✅ {len(results)} artistas re-parseados: {filename}")
+    
+    if args.history and HISTORY_CONFIG['enabled']:
+        from result_history import append_history
+        append_history(results, HISTORY_CONFIG['directory'])
+        print(f"🗄️ Historial: {HISTORY_CONFIG['directory']}")
+
+
+if __name__ == "__main__":
+    main()
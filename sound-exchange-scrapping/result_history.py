@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+🎵 Result History - SoundExchange
+=================================
+
+Historial de resultados por artista, solo de agregado, en Parquet.
+
+Cada corrida agrega un archivo nuevo bajo `run_date=AAAA-MM-DD/` (particionado
+estilo Hive) con el mismo esquema de `columnar_store`; los archivos existentes
+nunca se reescriben. Las lecturas filtran por fecha usando solo los nombres
+de las particiones, así que consultar un trimestre no abre el resto del
+historial. El análisis de tendencias está en `history_analytics.py`.
+
+Uso:
+    python result_history.py import ~/Downloads/soundexchange_batch_*.csv
+    python result_history.py show --since 2026-07-01
+"""
+
+import uuid
+import argparse
+from datetime import datetime
+import logging
+from typing import List, Dict, Optional, Iterable, Union
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from config import HISTORY_CONFIG
+from artist_result import ArtistResult
+from columnar_store import results_to_table
+from logging_setup import setup_logging
+
+logger = logging.getLogger(__name__)
+
+# Partición por fecha de corrida; el valor se compara como texto ISO
+HISTORY_PARTITIONING = ds.partitioning(pa.schema([('run_date', pa.string())]), flavor='hive')
+
+
+def _run_date(record: ArtistResult) -> str:
+    """Fecha (AAAA-MM-DD) del registro según su timestamp; hoy si no tiene uno válido"""
+    try:
+        return datetime.fromisoformat(str(record.timestamp)).date().isoformat()
+    except ValueError:
+        return datetime.now().date().isoformat()
+
+
+def append_history(records: Iterable[Union[ArtistResult, Dict]],
+                   directory: str = HISTORY_CONFIG['directory']) -> List[str]:
+    """Agrega los registros al historial, un archivo nuevo por fecha; retorna los archivos escritos"""
+    by_date: Dict[str, List[ArtistResult]] = {}
+    for record in records:
+        if not isinstance(record, ArtistResult):
+            record = ArtistResult.from_record(record)
+        by_date.setdefault(_run_date(record), []).append(record)
+        
+    written = []
+    run_id = f"{datetime.now():%Y%m%d_%H%M%S}_{uuid.uuid4().hex[:8]}"
+    for run_date, date_records in sorted(by_date.items()):
+        partition = Path(directory).expanduser() / f"run_date={run_date}"
+        partition.mkdir(parents=True, exist_ok=True)
+        
+        # Escribir en un temporal y renombrar: un lector nunca ve un archivo a medias
+        filepath = partition / f"part-{run_id}.parquet"
+        tmp_file = partition / f".part-{run_id}.parquet.tmp"
+        pq.write_table(
+            results_to_table(date_records),
+            tmp_file,
+            compression='zstd',
+            row_group_size=HISTORY_CONFIG['row_group_size'],
+            write_statistics=True
+        )
+        tmp_file.replace(filepath)
+        written.append(str(filepath))
+        
+    if written:
+        logger.info(f"🗄️ {sum(len(r) for r in by_date.values())} registros agregados al historial ({len(written)} particiones)")
+    return written
+
+
+def history_dataset(directory: str = HISTORY_CONFIG['directory']) -> ds.Dataset:
+    """Abre el historial como dataset de Arrow con la columna de partición run_date"""
+    directory = Path(directory).expanduser()
+    if not directory.exists():
+        raise FileNotFoundError(f"No existe el historial {directory}")
+    # Los temporales empiezan con '.' y el dataset los ignora
+    return ds.dataset(str(directory), format='parquet', partitioning=HISTORY_PARTITIONING)
+
+
+def read_history(directory: str = HISTORY_CONFIG['directory'], since: Optional[str] = None,
+                 until: Optional[str] = None, artists: Optional[List[str]] = None,
+                 columns: Optional[List[str]] = None) -> pa.Table:
+    """Lee el historial entre dos fechas (inclusive), opcionalmente solo algunos artistas"""
+    expression = None
+    filters = []
+    if since:
+        filters.append(ds.field('run_date') >= since)
+    if until:
+        filters.append(ds.field('run_date') <= until)
+    if artists:
+        filters.append(ds.field('artist_name').isin(artists))
+    for condition in filters:
+        expression = condition if expression is None else expression & condition
+        
+    return history_dataset(directory).to_table(columns=columns, filter=expression)
+
+
+def main():
+    """Función principal"""
+    setup_logging('result_history.log')
+    from entry_snapshot import load_records
+    
+    parser = argparse.ArgumentParser(
+        description="Historial de resultados por artista en Parquet",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Ejemplos de uso:
+  python result_history.py import ~/Downloads/soundexchange_batch_*.csv
+  python result_history.py import resultados/ --directory historial/
+  python result_history.py show --since 2026-07-01 --until 2026-09-30
+        """
+    )
+    
+    parser.add_argument('--directory', type=str, default=HISTORY_CONFIG['directory'],
+                        help='Directorio del historial')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    import_parser = subparsers.add_parser('import', help='Agregar resultados previos (CSV o Parquet) al historial')
+    import_parser.add_argument('sources', nargs='+', help='Archivos CSV o archivos/directorios Parquet')
+    
+    show_parser = subparsers.add_parser('show', help='Resumir el historial')
+    show_parser.add_argument('--since', type=str, help='Desde la fecha AAAA-MM-DD')
+    show_parser.add_argument('--until', type=str, help='Hasta la fecha AAAA-MM-DD')
+    
+    args = parser.parse_args()
+    
+    if args.command == 'import':
+        # Todas las corridas de cada fuente, no solo el último resultado por artista
+        written = append_history(load_records(args.sources, latest_only=False), args.directory)
+        print(f"✅ {len(written)} archivos agregados al historial: {args.directory}")
+        return
+        
+    table = read_history(args.directory, args.since, args.until, columns=['run_date', 'artist_name'])
+    runs = table.group_by('run_date').aggregate([('artist_name', 'count')]).sort_by('run_date')
+    print(f"🗄️ Historial: {table.num_rows} registros en {runs.num_rows} fechas")
+    for run in runs.to_pylist():
+        print(f"  • {run['run_date']}: {run['artist_name_count']} registros")
+
+
+if __name__ == "__main__":
+    main()
@@ -37,6 +37,7 @@ setup(
             "soundexchange-scraper=artist_scraper:main",
             "soundexchange-batch=batch_artist_scraper:main",
             "soundexchange-sync=google_sheets_sync:main",
+            "soundexchange-service=lookup_service:main",
         ],
     },
 )
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+🎵 Sheet Partitions - SoundExchange
+===================================
+
+Particionado del historial de resultados en pestañas por período.
+
+Los registros nuevos se agregan a una pestaña por período (p. ej.
+"Resultados 2026-10"); cuando una pestaña llega a `max_rows_per_tab` filas se
+abre otra del mismo período. Una pestaña índice guarda la cantidad de filas y
+el rango de timestamps de cada partición, y la verificación de duplicados solo
+lee las particiones cuyo rango puede contener la clave, así que el costo de
+sincronizar no crece con el historial.
+"""
+
+import logging
+from datetime import datetime
+from typing import List, Dict, Optional, Set, Iterable
+
+from config import PARTITION_CONFIG, SYNC_CONFIG
+from artist_result import ArtistResult, CSV_FIELDNAMES
+from google_sheets_sync import GoogleSheetsSync
+from dedup_engine import HashedKeyIndex
+
+logger = logging.getLogger(__name__)
+
+INDEX_HEADERS = ['sheet_name', 'period', 'rows', 'min_timestamp', 'max_timestamp', 'updated']
+
+
+class PartitionedSheetsSync(GoogleSheetsSync):
+    """Sincronizador que reparte el historial en pestañas por período"""
+    
+    def __init__(self, tab_prefix: str = PARTITION_CONFIG['tab_prefix'],
+                 period_format: str = PARTITION_CONFIG['period_format'],
+                 max_rows_per_tab: int = PARTITION_CONFIG['max_rows_per_tab'],
+                 index_sheet: str = PARTITION_CONFIG['index_sheet']):
+        super().__init__()
+        self.tab_prefix = tab_prefix
+        self.period_format = period_format
+        self.max_rows_per_tab = max_rows_per_tab
+        self.index_sheet = index_sheet
+        self.index: List[Dict] = []
+        self._index_loaded = False
+        # Claves de duplicado por partición, cargadas solo cuando se necesitan
+        self._partition_keys: Dict[str, HashedKeyIndex] = {}
+        # Columnas comunes a todas las pestañas, leídas una vez de la hoja principal
+        self._headers: Optional[List[str]] = None
+    
+    def partition_headers(self) -> List[str]:
+        """Columnas de todas las particiones: los headers de la hoja principal, o CSV_FIELDNAMES si está vacía"""
+        if self._headers is None:
+            self._headers = self.get_headers() or list(CSV_FIELDNAMES)
+        return self._headers
+    
+    def _sheet_titles(self) -> Set[str]:
+        """Retorna los nombres de las pestañas del spreadsheet"""
+        result = self.service.spreadsheets().get(
+            spreadsheetId=self.spreadsheet_id,
+            fields='sheets.properties.title'
+        ).execute()
+        return {sheet['properties']['title'] for sheet in result.get('sheets', [])}
+    
+    def _add_sheet(self, title: str):
+        """Crea una pestaña nueva"""
+        self.service.spreadsheets().batchUpdate(
+            spreadsheetId=self.spreadsheet_id,
+            body={'requests': [{'addSheet': {'properties': {'title': title}}}]}
+        ).execute()
+        logger.info(f"🗂️ Pestaña creada: {title}")
+    
+    def _scan_partition(self, sheet_name: str, period: str) -> Dict:
+        """Cuenta las filas y el rango de timestamps de una pestaña existente"""
+        headers = self.get_headers(sheet_name)
+        timestamp_index = headers.index('timestamp') if 'timestamp' in headers else None
+        
+        entry = {'sheet_name': sheet_name, 'period': period, 'rows': 0, 'min_timestamp': '', 'max_timestamp': ''}
+        for row in self.iter_existing_rows(sheet_name=sheet_name):
+            entry['rows'] += 1
+            if timestamp_index is not None and timestamp_index < len(row):
+                self._extend_range(entry, str(row[timestamp_index]))
+        return entry
+    
+    @staticmethod
+    def _extend_range(entry: Dict, timestamp: str):
+        """Amplía el rango de timestamps de una partición"""
+        if not timestamp:
+            return
+        if not entry['min_timestamp'] or timestamp < entry['min_timestamp']:
+            entry['min_timestamp'] = timestamp
+        if not entry['max_timestamp'] or timestamp > entry['max_timestamp']:
+            entry['max_timestamp'] = timestamp
+    
+    def load_index(self):
+        """Carga la pestaña índice, creándola si no existe"""
+        titles = self._sheet_titles()
+        
+        if self.index_sheet in titles:
+            headers = self.get_headers(self.index_sheet)
+            self.index = []
+            for row in self.iter_existing_rows(sheet_name=self.index_sheet):
+                record = dict(zip(headers, row))
+                self.index.append({
+                    'sheet_name': record.get('sheet_name', ''),
+                    'period': record.get('period', ''),
+                    'rows': int(record.get('rows') or 0),
+                    'min_timestamp': record.get('min_timestamp', ''),
+                    'max_timestamp': record.get('max_timestamp', '')
+                })
+        else:
+            logger.info(f"🗂️ Creando índice de particiones '{self.index_sheet}'...")
+            self._add_sheet(self.index_sheet)
+            self.index = []
+            # La hoja original queda registrada como partición histórica (sin período)
+            if self.sheet_name in titles:
+                entry = self._scan_partition(self.sheet_name, '')
+                if entry['rows']:
+                    self.index.append(entry)
+            self.save_index()
+            
+        self._index_loaded = True
+        logger.info(f"🗂️ Índice cargado: {len(self.index)} particiones")
+    
+    def save_index(self):
+        """Reescribe la pestaña índice"""
+        updated = datetime.now().isoformat()
+        values = [INDEX_HEADERS] + [
+            [entry['sheet_name'], entry['period'], str(entry['rows']),
+             entry['min_timestamp'], entry['max_timestamp'], updated]
+            for entry in self.index
+        ]
+        self.service.spreadsheets().values().update(
+            spreadsheetId=self.spreadsheet_id,
+            range=f"{self.index_sheet}!A1",
+            valueInputOption='RAW',
+            body={'values': values}
+        ).execute()
+    
+    def period_of(self, record: Dict) -> str:
+        """Retorna el período de un registro según su timestamp"""
+        try:
+            return datetime.fromisoformat(str(record.get('timestamp', ''))).strftime(self.period_format)
+        except ValueError:
+            return datetime.now().strftime(self.period_format)
+    
+    def candidate_partitions(self, timestamp: str) -> List[Dict]:
+        """Retorna las particiones que pueden contener un registro con ese timestamp"""
+        # Sin el timestamp en la clave no se puede descartar ninguna partición
+        if 'timestamp' not in SYNC_CONFIG['duplicate_key_fields']:
+            return self.index
+        return [entry for entry in self.index
+                if entry['rows'] and entry['min_timestamp'] <= timestamp <= entry['max_timestamp']]
+    
+    def partition_keys(self, sheet_name: str) -> HashedKeyIndex:
+        """Retorna las claves de duplicado de una partición, leyéndola una sola vez"""
+        if sheet_name not in self._partition_keys:
+            headers = self.get_headers(sheet_name)
+            self._partition_keys[sheet_name] = self.build_existing_keys(
+                self.iter_existing_rows(sheet_name=sheet_name), headers
+            ) if headers else HashedKeyIndex()
+            logger.info(f"📊 Claves cargadas de '{sheet_name}': {len(self._partition_keys[sheet_name])}")
+        return self._partition_keys[sheet_name]
+    
+    def is_duplicate(self, record: Dict) -> bool:
+        """Verifica si un registro ya existe en alguna partición candidata"""
+        return any(record in self.partition_keys(entry['sheet_name'])
+                   for entry in self.candidate_partitions(str(record.get('timestamp', ''))))
+    
+    def target_partition(self, period: str, planned: Dict[str, int]) -> Dict:
+        """Retorna la partición donde agregar un registro del período, abriendo una nueva si está llena"""
+        same_period = [entry for entry in self.index if entry['period'] == period]
+        if same_period:
+            entry = same_period[-1]
+            if entry['rows'] + planned.get(entry['sheet_name'], 0) < self.max_rows_per_tab:
+                return entry
+                
+        sheet_name = f"{self.tab_prefix} {period}"
+        if same_period:
+            sheet_name = f"{sheet_name}_{len(same_period) + 1}"
+        self._add_sheet(sheet_name)
+        
+        entry = {'sheet_name': sheet_name, 'period': period, 'rows': 0, 'min_timestamp': '', 'max_timestamp': ''}
+        self.index.append(entry)
+        self._partition_keys[sheet_name] = HashedKeyIndex()
+        logger.info(f"🔄 Nueva partición para {period}: {sheet_name}")
+        return entry
+    
+    def append_partitioned(self, records: List[Dict], headers: List[str]) -> bool:
+        """Agrega los registros a la partición de su período"""
+        groups: Dict[str, List[Dict]] = {}
+        planned: Dict[str, int] = {}
+        entries: Dict[str, Dict] = {}
+        
+        for record in records:
+            entry = self.target_partition(self.period_of(record), planned)
+            groups.setdefault(entry['sheet_name'], []).append(record)
+            planned[entry['sheet_name']] = planned.get(entry['sheet_name'], 0) + 1
+            entries[entry['sheet_name']] = entry
+            
+        success = True
+        for sheet_name, group in groups.items():
+            entry = entries[sheet_name]
+            prepared_data = self.prepare_data_for_sheets(group, headers)
+            # Las pestañas nuevas reciben los headers en el primer append
+            if not self.append_data(prepared_data, headers if entry['rows'] == 0 else None, sheet_name):
+                success = False
+                continue
+                
+            entry['rows'] += len(group)
+            self.partition_keys(sheet_name).add_records(group)
+            for record in group:
+                self._extend_range(entry, str(record.get('timestamp', '')))
+                
+        return success
+    
+    def sync_stream(self, chunks: Iterable[List[Dict]], existing_keys: Optional[HashedKeyIndex] = None) -> Dict:
+        """Sincroniza los datos por bloques repartiéndolos en las particiones"""
+        # Las claves de cada partición ya quedan en caché en la instancia; existing_keys no se usa
+        total_processed = 0
+        total_new = 0
+        total_duplicates = 0
+        success = True
+        
+        try:
+            logger.info("🔄 Iniciando sincronización particionada con Google Sheets...")
+            if not self._index_loaded:
+                self.load_index()
+            # El orden de columnas no depende del primer registro de cada bloque
+            headers = self.partition_headers()
+                
+            for chunk in chunks:
+                if not chunk:
+                    continue
+                    
+                if SYNC_CONFIG['check_duplicates']:
+                    new_records, duplicate_records = [], []
+                    for record in chunk:
+                        (duplicate_records if self.is_duplicate(record) else new_records).append(record)
+                else:
+                    new_records, duplicate_records = chunk, []
+                    
+                if new_records:
+                    success = self.append_partitioned(new_records, headers) and success
+                    # Mantener el índice al día aunque la corrida se interrumpa
+                    self.save_index()
+                    
+                total_processed += len(chunk)
+                total_new += len(new_records)
+                total_duplicates += len(duplicate_records)
+                logger.info(f"📦 Bloque sincronizado: {total_processed} procesados, {total_new} nuevos, {total_duplicates} duplicados")
+                
+            summary = {
+                'total_processed': total_processed,
+                'new_records': total_new,
+                'duplicate_records': total_duplicates,
+                'success': success,
+                'timestamp': datetime.now().isoformat()
+            }
+            
+            logger.info(f"✅ Sincronización completada: {summary}")
+            return summary
+            
+        except Exception as e:
+            logger.error(f"❌ Error en sincronización: {e}")
+            return {
+                'total_processed': total_processed,
+                'new_records': total_new,
+                'duplicate_records': total_duplicates,
+                'success': False,
+                'error': str(e),
+                'timestamp': datetime.now().isoformat()
+            }
+    
+    def sync_data(self, new_data: List[Dict]) -> Dict:
+        """Sincroniza los datos nuevos con Google Sheets"""
+        return self.sync_stream([new_data])
+    
+    def get_latest_results(self, sheet_names: Optional[List[str]] = None) -> Dict[str, ArtistResult]:
+        """Retorna el registro más reciente de cada artista en todas las particiones"""
+        if not self._index_loaded:
+            self.load_index()
+        if sheet_names is None:
+            sheet_names = [entry['sheet_name'] for entry in self.index]
+        return super().get_latest_results(sheet_names)
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+🎵 Sheets Spool - SoundExchange
+===============================
+
+Spool local para que varias sincronizaciones concurrentes escriban en Google
+Sheets a través de un único escritor.
+
+Cada job deja sus filas en un archivo JSONL nuevo del directorio de spool
+(escrito en un temporal y renombrado, así que nunca se ve a medias). Vaciar
+el spool requiere un lock exclusivo (`fcntl.flock`) sobre el directorio: el
+proceso que lo obtiene recorre en streaming todos los archivos pendientes,
+descarta duplicados contra un único índice de claves y publica en appends
+grandes.
+Los demás jobs dejan sus archivos y terminan; las llamadas a la API crecen
+con la cantidad de vaciados y no con la cantidad de jobs.
+
+Uso:
+    python sheets_spool.py --status
+    python sheets_spool.py --drain
+"""
+
+import os
+import json
+import fcntl
+import uuid
+import argparse
+from datetime import datetime
+import logging
+from typing import List, Dict, Optional, Iterable, Iterator
+from pathlib import Path
+
+from config import SPOOL_CONFIG, SYNC_CONFIG
+from dedup_engine import HashedKeyIndex
+from logging_setup import setup_logging
+
+logger = logging.getLogger(__name__)
+
+SPOOL_PATTERN = 'spool-*.jsonl'
+LOCK_FILENAME = '.writer.lock'
+REJECTED_SUFFIX = '.rejected'
+
+
+def _spool_dir(directory: str) -> Path:
+    """Retorna el directorio del spool, creándolo si no existe"""
+    directory = Path(directory).expanduser()
+    directory.mkdir(parents=True, exist_ok=True)
+    return directory
+
+
+def spool_records(records: Iterable[Dict], directory: str = SPOOL_CONFIG['directory']) -> Optional[str]:
+    """Deja los registros en un archivo nuevo del spool; retorna su ruta (None si no había registros)"""
+    directory = _spool_dir(directory)
+    name = f"spool-{datetime.now():%Y%m%d_%H%M%S}-{os.getpid()}-{uuid.uuid4().hex[:8]}.jsonl"
+    tmp_file = directory / f".{name}.tmp"
+    
+    count = 0
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(dict(record), ensure_ascii=False) + '\n')
+            count += 1
+        f.flush()
+        os.fsync(f.fileno())
+        
+    if not count:
+        tmp_file.unlink()
+        return None
+        
+    # El rename es atómico: el escritor solo ve archivos completos
+    filepath = directory / name
+    tmp_file.replace(filepath)
+    logger.info(f"📥 {count} registros en el spool: {filepath.name}")
+    return str(filepath)
+
+
+def pending_spool_files(directory: str = SPOOL_CONFIG['directory']) -> List[Path]:
+    """Archivos del spool pendientes de publicar, del más viejo al más nuevo"""
+    return sorted(_spool_dir(directory).glob(SPOOL_PATTERN))
+
+
+def _read_spool_file(filepath: Path) -> Iterator[Dict]:
+    """Recorre los registros de un archivo del spool"""
+    with open(filepath, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+class SpoolWriter:
+    """Único escritor del spool: publica los archivos pendientes con un índice de claves en caché"""
+    
+    def __init__(self, sheets_sync, directory: str = SPOOL_CONFIG['directory'],
+                 batch_rows: int = SPOOL_CONFIG['append_batch_rows']):
+        self.sheets_sync = sheets_sync
+        self.directory = _spool_dir(directory)
+        self.batch_rows = batch_rows
+        # Claves de la hoja, leídas una vez y actualizadas con cada append
+        self.existing_keys = None
+    
+    def _try_lock(self):
+        """Toma el lock del escritor sin esperar; retorna el archivo abierto o None si otro proceso lo tiene"""
+        lock_file = open(self.directory / LOCK_FILENAME, 'w')
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.close()
+            return None
+        return lock_file
+    
+    def _check_pending(self, files: List[Path]) -> List[Path]:
+        """Verifica que los archivos pendientes se puedan leer; los ilegibles se apartan con el sufijo .rejected"""
+        readable = []
+        for filepath in files:
+            try:
+                # Se recorre sin retener los registros: la publicación vuelve a leerlos en streaming
+                for _ in _read_spool_file(filepath):
+                    pass
+                readable.append(filepath)
+            except (OSError, ValueError) as e:
+                logger.error(f"❌ Archivo de spool ilegible {filepath.name}: {e}")
+                filepath.replace(filepath.with_name(filepath.name + REJECTED_SUFFIX))
+        return readable
+    
+    def _iter_unique_chunks(self, files: List[Path], totals: Dict[str, int]) -> Iterator[List[Dict]]:
+        """Recorre los archivos en bloques de batch_rows registros, sin repetidos entre archivos"""
+        # Solo el bloque en curso y los hashes de lo ya entregado quedan en memoria
+        seen = HashedKeyIndex()
+        block = {}
+        
+        def flush() -> List[Dict]:
+            unique, _ = seen.split(list(block.values()))
+            seen.add_records(unique)
+            totals['unique'] += len(unique)
+            block.clear()
+            return unique
+            
+        for filepath in files:
+            for record in _read_spool_file(filepath):
+                totals['records'] += 1
+                block.setdefault(self.sheets_sync.record_key(record), record)
+                if len(block) >= self.batch_rows:
+                    yield flush()
+        if block:
+            yield flush()
+    
+    def _publish(self, files: List[Path]) -> Dict:
+        """Une los registros de todos los archivos, descarta repetidos y los publica en lotes grandes"""
+        from sheet_partitions import PartitionedSheetsSync
+        
+        # Las particiones guardan sus propias claves; para la hoja única se leen una sola vez
+        partitioned = isinstance(self.sheets_sync, PartitionedSheetsSync)
+        if self.existing_keys is None and SYNC_CONFIG['check_duplicates'] and not partitioned:
+            self.existing_keys, _ = self.sheets_sync.get_existing_keys()
+            
+        totals = {'records': 0, 'unique': 0}
+        summary = self.sheets_sync.sync_stream(self._iter_unique_chunks(files, totals), existing_keys=self.existing_keys)
+        summary['spool_files'] = len(files)
+        summary['duplicate_records'] += totals['records'] - totals['unique']
+        summary['total_processed'] = totals['records']
+        return summary
+    
+    def drain(self) -> Optional[Dict]:
+        """Publica todo lo pendiente si no hay otro escritor activo; None si el lock está tomado"""
+        summary = {'spool_files': 0, 'total_processed': 0, 'new_records': 0,
+                   'duplicate_records': 0, 'success': True}
+        
+        while True:
+            lock_file = self._try_lock()
+            if lock_file is None:
+                logger.info("⏳ Otro proceso está vaciando el spool; los archivos quedan para él")
+                if not summary['spool_files']:
+                    return None
+                # Lo que llegó después lo publica el otro escritor
+                summary['pending_in_spool'] = True
+                summary['timestamp'] = datetime.now().isoformat()
+                return summary
+                
+            try:
+                # Repetir mientras sigan llegando archivos durante el vaciado
+                for _ in range(SPOOL_CONFIG['max_passes']):
+                    files = pending_spool_files(self.directory)
+                    if not files:
+                        break
+                        
+                    pending = self._check_pending(files)
+                    if not pending:
+                        break
+                    result = self._publish(pending)
+                    for field in ('spool_files', 'total_processed', 'new_records', 'duplicate_records'):
+                        summary[field] += result.get(field, 0)
+                        
+                    # Solo se borran los archivos ya publicados; si algo falló se reintentan en el próximo vaciado
+                    if not result['success']:
+                        summary['success'] = False
+                        logger.error(f"❌ Falló la publicación del spool: {result.get('error', 'append rechazado')}")
+                        break
+                    for filepath in pending:
+                        filepath.unlink()
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+                lock_file.close()
+                
+            # Un job pudo dejar su archivo justo antes de que se liberara el lock
+            if not summary['success'] or not pending_spool_files(self.directory):
+                break
+                
+        summary['timestamp'] = datetime.now().isoformat()
+        logger.info(f"📤 Spool vaciado: {summary}")
+        return summary
+
+
+def main():
+    """Función principal"""
+    setup_logging('sheets_spool.log')
+    parser = argparse.ArgumentParser(
+        description="Spool local de un único escritor para la sincronización con Google Sheets",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Ejemplos de uso:
+  python sheets_spool.py --status
+  python sheets_spool.py --drain
+  python google_sheets_sync.py --file artists_list.txt --spool
+        """
+    )
+    
+    parser.add_argument('--directory', type=str, default=SPOOL_CONFIG['directory'], help='Directorio del spool')
+    parser.add_argument('--drain', action='store_true', help='Publicar en Google Sheets los archivos pendientes')
+    parser.add_argument('--status', action='store_true', help='Mostrar los archivos pendientes')
+    
+    args = parser.parse_args()
+    
+    files = pending_spool_files(args.directory)
+    if args.status or not args.drain:
+        print(f"📥 Archivos pendientes en {args.directory}: {len(files)}")
+        for filepath in files:
+            print(f"  • {filepath.name} ({filepath.stat().st_size} bytes)")
+        return
+        
+    from google_sheets_sync import GoogleSheetsSync
+    summary = SpoolWriter(GoogleSheetsSync(), args.directory).drain()
+    if summary is None:
+        print("⏳ Otro proceso está vaciando el spool")
+    else:
+        print(f"✅ Spool vaciado: {summary['spool_files']} archivos, {summary['new_records']} registros nuevos, "
+              f"{summary['duplicate_records']} duplicados")
+        if summary.get('pending_in_spool'):
+            print("⏳ Quedan archivos pendientes: los publica el proceso que está vaciando el spool")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""Hoja de cálculo en memoria para probar la sincronización sin Google Sheets"""
+
+from typing import Dict, List, Optional
+
+from google_sheets_sync import GoogleSheetsSync
+from sheet_partitions import PartitionedSheetsSync
+
+
+class InMemorySheetsMixin:
+    """Reemplaza las llamadas a la API por pestañas en memoria: título -> filas (la primera es el header)"""
+    
+    def _authenticate(self):
+        self.tabs: Dict[str, List[List[str]]] = {self.sheet_name: []}
+    
+    def _sheet_titles(self):
+        return set(self.tabs)
+    
+    def _add_sheet(self, title: str):
+        self.tabs[title] = []
+    
+    def get_headers(self, sheet_name: Optional[str] = None) -> List[str]:
+        rows = self.tabs.get(sheet_name or self.sheet_name, [])
+        return list(rows[0]) if rows else []
+    
+    def iter_existing_rows(self, window_rows: int = 0, windows_per_request: int = 0, sheet_name: Optional[str] = None):
+        return iter(self.tabs.get(sheet_name or self.sheet_name, [])[1:])
+    
+    def append_data(self, data: List[List], headers: List[str] = None, sheet_name: Optional[str] = None) -> bool:
+        rows = self.tabs.setdefault(sheet_name or self.sheet_name, [])
+        if headers and not rows:
+            rows.append(list(headers))
+        rows.extend(list(row) for row in data)
+        return True
+    
+    def save_index(self):
+        self.tabs[self.index_sheet] = [['sheet_name', 'period', 'rows', 'min_timestamp', 'max_timestamp']] + [
+            [entry['sheet_name'], entry['period'], str(entry['rows']), entry['min_timestamp'], entry['max_timestamp']]
+            for entry in self.index
+        ]
+
+
+class InMemorySheetsSync(InMemorySheetsMixin, GoogleSheetsSync):
+    """GoogleSheetsSync sobre pestañas en memoria"""
+
+
+class InMemoryPartitionedSync(InMemorySheetsMixin, PartitionedSheetsSync):
+    """PartitionedSheetsSync sobre pestañas en memoria"""
@@ -0,0 +1,55 @@
+"""Tests del controlador adaptativo de ritmo"""
+
+import pytest
+
+from adaptive_rate import AIMDController
+
+
+def make_controller():
+    return AIMDController(initial_delay=1.0, min_delay=0.25, max_delay=30.0, max_concurrency=4,
+                          delay_step=0.25, decrease_factor=0.5, successes_per_increase=2,
+                          latency_spike_factor=3.0, min_spike_latency=2.0, cooldown=0.0)
+
+
+def test_healthy_responses_increase_the_rate():
+    controller = make_controller()
+    for _ in range(4):
+        controller.record(0.1, status_code=200)
+    assert controller.concurrency == 3
+    assert controller.delay == pytest.approx(0.5)
+    assert controller.successes == 4
+
+
+@pytest.mark.parametrize('status_code', [429, 500, 502, 503, 504])
+def test_throttling_and_server_errors_back_off(status_code):
+    controller = make_controller()
+    controller.record(0.1, status_code=status_code)
+    assert controller.delay == pytest.approx(2.0)
+    assert controller.throttled == 1
+    assert controller.successes == 0
+
+
+def test_challenge_and_errors_back_off():
+    controller = make_controller()
+    controller.record(0.1, status_code=403, challenge=True)
+    controller.record(0.1, error=True)
+    assert controller.delay == pytest.approx(4.0)
+    assert controller.challenges == 1
+    assert controller.errors == 1
+
+
+def test_other_non_2xx_are_not_successes():
+    controller = make_controller()
+    for _ in range(4):
+        controller.record(0.1, status_code=403)
+    assert controller.successes == 0
+    assert controller.delay == pytest.approx(1.0)
+    assert controller.latency_ewma is None
+
+
+def test_latency_spike_backs_off():
+    controller = make_controller()
+    controller.record(1.0, status_code=200)
+    controller.record(5.0, status_code=200)
+    assert controller.latency_spikes == 1
+    assert controller.delay == pytest.approx(2.0)
@@ -0,0 +1,21 @@
+"""Tests de la lectura de artistas"""
+
+import logging
+
+from artist_input import unique_artists, prefetch
+
+
+def test_unique_artists_is_exact():
+    artists = [f'Artista {i}' for i in range(20000)]
+    assert list(unique_artists(artists + ['artista  0', 'ARTISTA 1', ''])) == artists
+
+
+def test_prefetch_stops_on_read_error_without_raising(caplog):
+    def source():
+        yield 'uno'
+        yield 'dos'
+        raise OSError('disco desconectado')
+        
+    with caplog.at_level(logging.ERROR):
+        assert list(prefetch(source(), maxsize=1)) == ['uno', 'dos']
+    assert 'disco desconectado' in caplog.text
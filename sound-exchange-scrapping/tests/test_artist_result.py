@@ -0,0 +1,38 @@
+"""Tests del estado de los resultados por artista"""
+
+from artist_result import (ArtistResult, SearchOutcome, unverified_categories,
+                           STATUS_OK, STATUS_EMPTY, STATUS_TIMEOUT, STATUS_SKIPPED)
+
+
+def outcomes(**statuses):
+    """Resultados por categoría: ok con un resultado, el resto vacíos salvo los indicados"""
+    base = {code: SearchOutcome(STATUS_EMPTY, []) for code in ('UA', 'PUA', 'UP', 'USRO')}
+    for code, status in statuses.items():
+        base[code] = SearchOutcome(status, ['Entrada'] if status == STATUS_OK else [])
+    return base
+
+
+def test_failed_search_is_incomplete_not_not_found():
+    result = ArtistResult.from_outcomes('Artista', outcomes(UA=STATUS_TIMEOUT))
+    assert result.status == 'Incomplete: UA timeout'
+    assert unverified_categories(result.status) == ['UA']
+
+
+def test_skipped_categories_are_reported_in_status():
+    result = ArtistResult.from_outcomes('Artista', outcomes(UA=STATUS_SKIPPED, PUA=STATUS_OK))
+    assert result.status == 'Found (skipped: UA)'
+    assert unverified_categories(result.status) == ['UA']
+
+
+def test_verified_statuses_have_no_unverified_categories():
+    assert unverified_categories('Found') == []
+    assert unverified_categories('Not Found') == []
+    assert unverified_categories('Error: sin sesión') == ['UA', 'PUA', 'UP', 'USRO']
+
+
+def test_empty_items_are_preserved_from_the_sheet():
+    result = ArtistResult.from_record({'artist_name': 'Artista', 'timestamp': '2026-01-01',
+                                       'UA_results': 'Uno; ; Dos', 'PUA_results': '', 'UA_count': '3'})
+    assert result['UA_count'] == 3
+    assert result['UA_results'] == 'Uno; ; Dos'
+    assert result['PUA_count'] == 0
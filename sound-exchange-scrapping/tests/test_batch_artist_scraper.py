@@ -0,0 +1,29 @@
+"""Tests del scraper en lote sin red"""
+
+import time
+
+import batch_artist_scraper
+from artist_result import SearchOutcome, STATUS_OK, STATUS_EMPTY
+from batch_artist_scraper import BatchArtistScraper
+
+
+def test_delay_only_separates_requests(monkeypatch):
+    starts = []
+    
+    def fake_search(session, artist, code, controller=None, archive=None):
+        starts.append(time.monotonic())
+        return SearchOutcome(STATUS_OK if code == 'UA' else STATUS_EMPTY, ['Entrada'] if code == 'UA' else [])
+        
+    monkeypatch.setattr(batch_artist_scraper, 'search_category', fake_search)
+    scraper = BatchArtistScraper(delay=0.1)
+    scraper.session = object()
+    
+    started = time.monotonic()
+    result = scraper.process_artist('Emilia')
+    elapsed = time.monotonic() - started
+    
+    assert result.status == 'Found'
+    # La primera búsqueda sale de inmediato y no hay pausa después de la última
+    assert starts[0] - started < 0.05
+    assert all(later - earlier >= 0.095 for earlier, later in zip(starts, starts[1:]))
+    assert elapsed < 0.1 * len(starts)
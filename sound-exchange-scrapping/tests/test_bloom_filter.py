@@ -0,0 +1,38 @@
+"""Tests de los filtros Bloom por categoría"""
+
+from bloom_filter import CategoryFilters, BloomFilter, entry_tokens
+
+
+def test_tokens_ignore_punctuation_and_case():
+    assert entry_tokens('Bad Bunny, J Balvin') == ['bad', 'bunny', 'j', 'balvin']
+    assert entry_tokens('  AC/DC  ') == ['ac', 'dc']
+
+
+def test_artist_from_a_punctuated_entry_is_never_discarded():
+    filters = CategoryFilters.build({'UA': ['Bad Bunny, J Balvin', 'Rimas Entertainment LLC.']}, complete=['UA'])
+    assert filters.might_contain('UA', 'bad bunny')
+    assert filters.might_contain('UA', 'J Balvin')
+    assert filters.might_contain('UA', 'rimas entertainment llc')
+
+
+def test_filters_are_built_only_for_complete_categories():
+    filters = CategoryFilters.build({'UA': ['Bad Bunny'], 'PUA': ['Emilia']}, complete=['UA'])
+    assert set(filters.filters) == {'UA'}
+    # Sin filtro la categoría se sigue buscando siempre
+    assert filters.might_contain('PUA', 'artista desconocido')
+
+
+def test_no_false_negatives():
+    bloom = BloomFilter.for_capacity(1000, 0.01)
+    words = [f'artista{i}' for i in range(1000)]
+    for word in words:
+        bloom.add(word)
+    assert all(word in bloom for word in words)
+
+
+def test_save_and_load_round_trip(tmp_path):
+    filters = CategoryFilters.build({'UA': ['Bad Bunny']}, complete=['UA'])
+    path = filters.save(str(tmp_path / 'filtros.bloom'))
+    loaded = CategoryFilters.load(path)
+    assert loaded.might_contain('UA', 'bad bunny')
+    assert loaded.filters['UA'].bits == filters.filters['UA'].bits
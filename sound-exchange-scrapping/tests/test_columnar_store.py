@@ -0,0 +1,33 @@
+"""Tests del almacenamiento de resultados en Parquet"""
+
+from artist_result import ArtistResult
+from columnar_store import iter_results, load_latest_results, read_run_metadata, write_parquet
+
+
+def record(artist, timestamp, ua=''):
+    return {'artist_name': artist, 'timestamp': timestamp, 'UA_results': ua, 'status': 'Found' if ua else 'Not Found'}
+
+
+def test_parquet_round_trip_keeps_results_and_metadata(tmp_path):
+    filepath = str(tmp_path / 'run.parquet')
+    write_parquet([record('Beta', '2026-01-02T10:00:00'), record('Alfa', '2026-01-01T10:00:00', 'Uno; Dos')],
+                  filepath, metadata={'run': 7})
+    
+    results = list(iter_results(filepath))
+    assert [result.artist_name for result in results] == ['Alfa', 'Beta']
+    assert results[0].results[0] == ('Uno', 'Dos')
+    assert results[0].status == 'Found'
+    assert results[1].status == 'Not Found'
+    assert read_run_metadata(filepath) == {'run': 7}
+
+
+def test_latest_result_per_artist_across_files(tmp_path):
+    write_parquet([record('Alfa', '2026-01-01T10:00:00')], str(tmp_path / 'a.parquet'))
+    write_parquet([record('alfa ', '2026-02-01T10:00:00', 'Uno'), record('Beta', '2026-01-15T10:00:00')],
+                  str(tmp_path / 'b.parquet'))
+    
+    latest = load_latest_results(str(tmp_path))
+    assert set(latest) == {'alfa', 'beta'}
+    assert isinstance(latest['alfa'], ArtistResult)
+    assert latest['alfa'].timestamp == '2026-02-01T10:00:00'
+    assert latest['alfa'].total_results == 1
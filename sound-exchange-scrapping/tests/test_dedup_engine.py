@@ -0,0 +1,46 @@
+"""Tests del índice de claves de duplicado"""
+
+import random
+
+import pytest
+
+from dedup_engine import HashedKeyIndex
+
+
+def make_records(rng, count, artists=300):
+    return [{'artist_name': f'artista {rng.randrange(artists)}', 'timestamp': f'2026-01-{rng.randrange(1, 4):02d}'}
+            for _ in range(count)]
+
+
+@pytest.mark.parametrize('buffer_hashes', [0, 16, 1 << 20])
+def test_split_matches_a_set_across_buffer_merges(buffer_hashes):
+    rng = random.Random(buffer_hashes)
+    index = HashedKeyIndex(key_fields=['artist_name', 'timestamp'], normalization={})
+    seen = set()
+    
+    for _ in range(60):
+        batch = make_records(rng, rng.randrange(1, 40))
+        new_records, duplicate_records = index.split(batch)
+        
+        expected_new = [record for record in batch if (record['artist_name'], record['timestamp']) not in seen]
+        expected_duplicates = [record for record in batch if (record['artist_name'], record['timestamp']) in seen]
+        assert new_records == expected_new
+        assert duplicate_records == expected_duplicates
+        
+        index.add_records(new_records)
+        # Con buffer 0 cada lote va al array principal; con 16 se alternan inserciones y fusiones
+        index._flush_pending(buffer_hashes)
+        seen.update((record['artist_name'], record['timestamp']) for record in new_records)
+        assert len(index) == len(seen)
+        
+    assert len(index._sorted()) == len(seen)
+
+
+def test_rows_and_records_hash_the_same():
+    headers = ['artist_name', 'timestamp', 'status']
+    index = HashedKeyIndex(key_fields=['artist_name', 'timestamp'], normalization={})
+    index.add_rows([['Emilia', '2026-01-01', 'Found'], ['corta']], headers)
+    assert {'artist_name': 'Emilia', 'timestamp': '2026-01-01'} in index
+    assert {'artist_name': 'Emilia', 'timestamp': '2026-01-02'} not in index
+    # Las filas más cortas que la clave se ignoran
+    assert len(index) == 1
@@ -0,0 +1,56 @@
+"""Tests del snapshot mapeado en memoria"""
+
+import pytest
+
+from artist_result import ArtistResult, SearchOutcome, STATUS_OK, STATUS_EMPTY, STATUS_TIMEOUT, STATUS_SKIPPED
+from entry_snapshot import EntrySnapshot, write_snapshot, SNAPSHOT_MAGIC, HEADER_STRUCT
+
+
+def make_result(artist, timestamp, **statuses):
+    """Registro con resultados ok en las categorías indicadas como STATUS_OK"""
+    outcomes = {code: SearchOutcome(statuses.get(code, STATUS_EMPTY),
+                                    [f'{artist} {code}'] if statuses.get(code) == STATUS_OK else [])
+                for code in ('UA', 'PUA', 'UP', 'USRO')}
+    return ArtistResult.from_outcomes(artist, outcomes, timestamp=timestamp)
+
+
+def test_round_trip_keeps_status_and_outcomes(tmp_path):
+    path = tmp_path / 'resultados.snap'
+    records = [
+        make_result('Bad Bunny', '2026-01-01T00:00:00', UA=STATUS_OK),
+        make_result('Emilia', '2026-01-01T00:00:00', UA=STATUS_TIMEOUT),
+        make_result('Nicki Nicole', '2026-01-01T00:00:00', PUA=STATUS_SKIPPED),
+    ]
+    assert write_snapshot(records, path) == 3
+    
+    with EntrySnapshot(path) as snapshot:
+        found = snapshot.get('bad  BUNNY')
+        incomplete = snapshot.get('emilia')
+        skipped = snapshot.get('nicki nicole')
+        assert 'missing' not in snapshot
+        
+    assert found.status == 'Found'
+    assert found.category('UA') == ('Bad Bunny UA',)
+    # Una búsqueda fallida u omitida no puede servirse como resultado verificado
+    assert incomplete.status == 'Incomplete: UA timeout'
+    assert incomplete.failed_categories() == ['UA']
+    assert skipped.status == 'Not Found (skipped: PUA)'
+    assert skipped.status not in ('Found', 'Not Found')
+
+
+def test_latest_record_per_artist_wins(tmp_path):
+    path = tmp_path / 'resultados.snap'
+    write_snapshot([
+        make_result('Emilia', '2026-02-01T00:00:00', UA=STATUS_OK),
+        make_result('EMILIA', '2026-01-01T00:00:00'),
+    ], path)
+    with EntrySnapshot(path) as snapshot:
+        assert len(snapshot) == 1
+        assert snapshot.get('emilia').timestamp == '2026-02-01T00:00:00'
+
+
+def test_other_versions_are_rejected(tmp_path):
+    path = tmp_path / 'viejo.snap'
+    path.write_bytes(HEADER_STRUCT.pack(SNAPSHOT_MAGIC, 1, 0, 0, HEADER_STRUCT.size))
+    with pytest.raises(ValueError, match='vuelve a generarlo'):
+        EntrySnapshot(path)
@@ -0,0 +1,46 @@
+"""Tests de los análisis sobre el historial"""
+
+import pandas as pd
+
+from history_analytics import category_counts, cleared_artists, artist_trends
+
+
+def history(rows):
+    """Historial mínimo: (artista, timestamp, estado, conteo UA)"""
+    frame = pd.DataFrame(rows, columns=['artist_key', 'timestamp', 'status', 'UA_count'])
+    frame['timestamp'] = pd.to_datetime(frame['timestamp'])
+    for code in ('PUA', 'UP', 'USRO'):
+        frame[f'{code}_count'] = 0
+    return frame
+
+
+FRAME = history([
+    ('cleared', '2026-01-10', 'Found', 2),
+    ('cleared', '2026-04-10', 'Not Found', 0),
+    ('timeout', '2026-01-10', 'Found', 3),
+    ('timeout', '2026-04-10', 'Incomplete: UA timeout', 0),
+    ('skipped', '2026-01-10', 'Found', 1),
+    ('skipped', '2026-04-10', 'Not Found (skipped: UA)', 0),
+    ('error', '2026-01-10', 'Found', 1),
+    ('error', '2026-04-10', 'Error: sin sesión', 0),
+])
+
+
+def test_unverified_observations_are_dropped():
+    counts = category_counts(FRAME)
+    ua = counts[counts['category'] == 'UA']
+    assert ua.groupby('artist_key').size().to_dict() == {'cleared': 2, 'error': 1, 'skipped': 1, 'timeout': 1}
+    # Las demás categorías de una búsqueda omitida en UA siguen siendo observaciones válidas
+    assert len(counts[(counts['artist_key'] == 'skipped') & (counts['category'] == 'PUA')]) == 2
+
+
+def test_failed_search_does_not_clear_an_artist():
+    cleared = cleared_artists(FRAME, 'UA', since='2026-04-01')
+    assert cleared['artist_key'].tolist() == ['cleared']
+
+
+def test_trends_only_clear_after_a_verified_empty_search():
+    trends = artist_trends(FRAME).set_index(['artist_key', 'category'])
+    assert trends.loc[('cleared', 'UA'), 'cleared']
+    assert not trends.loc[('timeout', 'UA'), 'cleared']
+    assert not trends.loc[('skipped', 'UA'), 'cleared']
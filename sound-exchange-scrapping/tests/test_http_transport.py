@@ -0,0 +1,75 @@
+"""Tests de la interfaz común de los transportes HTTP"""
+
+import pytest
+
+from http_transport import HttpTransport, RequestTiming, TimingStats
+
+
+class FakeResponse:
+    status_code = 200
+    content = b'{"ok": true}'
+    headers = {'content-length': '8', 'content-encoding': 'gzip'}
+
+
+class FakeTransport(HttpTransport):
+    """Transporte sin red: responde siempre lo mismo o falla si se le indica"""
+    
+    backend = 'fake'
+    
+    def __init__(self, error=None):
+        super().__init__()
+        self.error = error
+        self.sent = []
+    
+    def set_cookie(self, name, value, domain):
+        pass
+    
+    def _send(self, url, data, timeout):
+        self.sent.append((url, data, timeout))
+        if self.error:
+            raise self.error
+        return FakeResponse()
+
+
+def test_post_notifies_hooks_with_sizes_and_encoding():
+    transport = FakeTransport()
+    timings = []
+    transport.add_hook(timings.append)
+    
+    response = transport.post('https://example.test/search', data={'q': 'x'})
+    
+    assert response.status_code == 200
+    assert transport.sent == [('https://example.test/search', {'q': 'x'}, transport.timeout)]
+    [timing] = timings
+    assert (timing.status_code, timing.wire_bytes, timing.content_bytes, timing.encoding) == (200, 8, 12, 'gzip')
+    assert not timing.error
+
+
+def test_failed_post_is_notified_and_reraised():
+    transport = FakeTransport(error=ConnectionError('sin red'))
+    stats = TimingStats()
+    transport.add_hook(stats)
+    
+    with pytest.raises(ConnectionError):
+        transport.post('https://example.test/search')
+    assert stats.summary()['requests'] == 1
+    assert stats.summary()['errors'] == 1
+
+
+def test_broken_hook_does_not_stop_the_request():
+    transport = FakeTransport()
+    transport.add_hook(lambda timing: 1 / 0)
+    assert transport.post('https://example.test/search').status_code == 200
+
+
+def test_timing_stats_summary():
+    stats = TimingStats()
+    stats(RequestTiming('POST', 'u', 200, 0.2, None, 100, 'identity', 'HTTP/1.1', ''))
+    stats(RequestTiming('POST', 'u', 200, 0.4, 40, 100, 'br', 'HTTP/2', ''))
+    
+    summary = stats.summary()
+    assert summary['requests'] == 2
+    assert summary['avg_latency'] == 0.3
+    assert summary['wire_bytes'] == 140
+    assert summary['content_bytes'] == 200
+    assert summary['encodings'] == {'identity': 1, 'br': 1}
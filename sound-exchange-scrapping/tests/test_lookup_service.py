@@ -0,0 +1,35 @@
+"""Tests de la cache del servicio de consultas"""
+
+import pytest
+
+from artist_result import ArtistResult
+from lookup_service import LookupService
+
+
+@pytest.fixture
+def service():
+    service = LookupService(max_workers=1, max_cache_entries=2, job_retention=0)
+    # Sin red: cada búsqueda retorna un resultado vacío
+    service._sweep = lambda artist: ArtistResult.from_results(artist, {})
+    yield service
+    service.shutdown()
+
+
+def test_cache_is_bounded_lru(service):
+    for artist in ('uno', 'dos'):
+        service.lookup(artist).result()
+    service.lookup('uno').result()
+    service.lookup('tres').result()
+    
+    # 'dos' era el menos usado y se descartó al agregar 'tres'
+    assert list(service._cache) == ['uno', 'tres']
+
+
+def test_finished_jobs_are_pruned(service):
+    job_id = service.submit_bulk(['uno', 'dos'])
+    for future in service._jobs[job_id]['futures']:
+        future.result()
+    with service._state_lock:
+        service._prune(force=True)
+        service._prune(force=True)
+    assert service.job_status(job_id) is None
@@ -0,0 +1,38 @@
+"""Tests de las variantes de nombres"""
+
+from artist_result import SearchOutcome, STATUS_OK, STATUS_EMPTY, STATUS_TIMEOUT, STATUS_SKIPPED
+from name_variants import expand_variants, merge_outcomes
+
+
+def test_collaborations_are_cut_after_the_main_name():
+    assert expand_variants('Bad Bunny feat. Drake') == ['bad bunny feat. drake', 'bad bunny']
+    assert expand_variants('Bad Bunny (ft. Drake)') == ['bad bunny (ft. drake)', 'bad bunny']
+
+
+def test_marker_without_a_following_name_is_part_of_the_name():
+    assert expand_variants('The Feat') == ['the feat']
+    assert expand_variants('Ft. Lauderdale') == ['ft. lauderdale']
+
+
+def test_short_or_stop_word_variants_are_dropped():
+    assert all(variant not in ('the', 'los', 'la') for variant in expand_variants('The feat. Someone'))
+    assert expand_variants('Los feat. Otro') == ['los feat. otro']
+
+
+def test_company_suffix_with_dots_is_removed():
+    assert 'los angeles azules' in expand_variants('Los Angeles Azules S.A.')
+    assert 'rimas entertainment' in expand_variants('Rimas Entertainment LLC')
+
+
+def test_connectors_and_accents():
+    variants = expand_variants('Beyoncé & Jay-Z')
+    assert variants[:3] == ['beyoncé & jay-z', 'beyoncé and jay-z', 'beyonce & jay-z']
+
+
+def test_merge_keeps_failures_and_skips():
+    ok = SearchOutcome(STATUS_OK, ['A'])
+    empty = SearchOutcome(STATUS_EMPTY, [])
+    assert merge_outcomes([ok, SearchOutcome(STATUS_OK, ['A', 'B'])]).items == ['A', 'B']
+    assert merge_outcomes([ok, SearchOutcome(STATUS_TIMEOUT, [], 'timeout')]).status == STATUS_TIMEOUT
+    assert merge_outcomes([SearchOutcome(STATUS_SKIPPED, []), SearchOutcome(STATUS_SKIPPED, [])]).status == STATUS_SKIPPED
+    assert merge_outcomes([empty, SearchOutcome(STATUS_SKIPPED, [])]).status == STATUS_EMPTY
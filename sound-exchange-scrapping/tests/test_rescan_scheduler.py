@@ -0,0 +1,46 @@
+"""Tests de la cola de re-escaneo por prioridad"""
+
+from datetime import datetime, timedelta
+
+from artist_result import ArtistResult, SearchOutcome, STATUS_OK, STATUS_EMPTY, STATUS_TIMEOUT
+from rescan_scheduler import RescanScheduler
+
+NOW = datetime(2026, 6, 1, 12, 0)
+
+
+def result(artist, status=STATUS_EMPTY, items=()):
+    outcomes = {code: SearchOutcome(STATUS_EMPTY, []) for code in ('UA', 'PUA', 'UP', 'USRO')}
+    outcomes['UA'] = SearchOutcome(status, list(items))
+    return ArtistResult.from_outcomes(artist, outcomes)
+
+
+def test_unknown_artists_come_first_and_fresh_ones_are_skipped(tmp_path):
+    scheduler = RescanScheduler(state_file=str(tmp_path / 'state.json'), request_budget=8)
+    scheduler.record(result('Viejo'), now=NOW - timedelta(days=60))
+    scheduler.record(result('Reciente'), now=NOW - timedelta(hours=1))
+    
+    selected = scheduler.select(['Reciente', 'Viejo', 'Nuevo', 'nuevo'], now=NOW)
+    assert [artist for artist, _ in selected] == ['Nuevo', 'Viejo']
+
+
+def test_budget_limits_the_selection(tmp_path):
+    scheduler = RescanScheduler(state_file=str(tmp_path / 'state.json'), request_budget=4)
+    assert len(scheduler.select(['Uno', 'Dos', 'Tres'], now=NOW)) == 1
+
+
+def test_incomplete_results_are_not_recorded(tmp_path):
+    scheduler = RescanScheduler(state_file=str(tmp_path / 'state.json'))
+    assert not scheduler.record(result('Artista', STATUS_TIMEOUT), now=NOW)
+    assert scheduler.state == {}
+
+
+def test_changes_are_detected_and_state_round_trips(tmp_path):
+    state_file = tmp_path / 'state.json'
+    scheduler = RescanScheduler(state_file=str(state_file))
+    assert not scheduler.record(result('Artista'), now=NOW - timedelta(days=2))
+    assert scheduler.record(result('Artista', STATUS_OK, ['Canción']), now=NOW)
+    scheduler.save_state()
+    
+    [entry] = RescanScheduler(state_file=str(state_file)).state.values()
+    assert (entry['checks'], entry['changes']) == (2, 1)
+    assert entry['last_found'] == NOW.isoformat()
@@ -0,0 +1,38 @@
+"""Tests del archivo de respuestas crudas"""
+
+import json
+
+from response_archive import ResponseArchive, reparse
+
+HIT = json.dumps({'html': '<div class="uli-search-item">Bad Bunny</div>'}).encode()
+EMPTY = json.dumps({'html': ''}).encode()
+
+
+def test_identical_bodies_are_stored_once(tmp_path):
+    archive = ResponseArchive(str(tmp_path / 'archivo.db'))
+    archive.store('uno', 'UA', EMPTY)
+    archive.store('dos', 'UA', EMPTY)
+    stats = archive.stats()
+    archive.close()
+    assert stats['responses'] == 2
+    assert stats['unique_bodies'] == 1
+
+
+def test_reparse_rebuilds_variants_and_skips_missing_categories(tmp_path):
+    path = str(tmp_path / 'archivo.db')
+    archive = ResponseArchive(path)
+    # Las respuestas se archivan con la forma buscada, no con el nombre pedido
+    archive.store('bad bunny feat. drake', 'UA', EMPTY)
+    archive.store('bad bunny', 'UA', HIT)
+    archive.store('bad bunny feat. drake', 'PUA', EMPTY)
+    archive.store('bad bunny', 'PUA', EMPTY)
+    archive.store_forms('Bad Bunny feat. Drake', ['bad bunny feat. drake', 'bad bunny'])
+    archive.close()
+    
+    results = reparse(path, workers=1)
+    assert [result.artist_name for result in results] == ['Bad Bunny feat. Drake']
+    result = results[0]
+    assert result.category('UA') == ('Bad Bunny',)
+    # UP y USRO no tienen respuesta archivada: quedan omitidas, no como "no encontrado"
+    assert result.skipped_categories() == ['UP', 'USRO']
+    assert result.status == 'Found (skipped: UP, USRO)'
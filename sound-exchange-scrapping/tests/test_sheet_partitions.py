@@ -0,0 +1,42 @@
+"""Tests de las pestañas por período"""
+
+from artist_result import CSV_FIELDNAMES
+from fake_sheets import InMemoryPartitionedSync
+
+
+def record(artist, timestamp, **extra):
+    return dict({'artist_name': artist, 'timestamp': timestamp, 'status': 'Not Found'}, **extra)
+
+
+def test_every_partition_uses_the_main_sheet_headers():
+    sync = InMemoryPartitionedSync()
+    sync.tabs[sync.sheet_name] = [['timestamp', 'artist_name', 'status']]
+    
+    # El primer registro de cada bloque tiene otras columnas y en otro orden
+    sync.sync_stream([[record('Uno', '2026-01-05T10:00:00', extra='x')],
+                      [{'status': 'Found', 'artist_name': 'Dos', 'timestamp': '2026-02-05T10:00:00'}]])
+    
+    assert sync.tabs['Resultados 2026-01'] == [['timestamp', 'artist_name', 'status'],
+                                               ['2026-01-05T10:00:00', 'Uno', 'Not Found']]
+    assert sync.tabs['Resultados 2026-02'][0] == ['timestamp', 'artist_name', 'status']
+
+
+def test_empty_main_sheet_falls_back_to_csv_columns():
+    sync = InMemoryPartitionedSync()
+    sync.sync_stream([[record('Uno', '2026-01-05T10:00:00')]])
+    assert sync.tabs['Resultados 2026-01'][0] == CSV_FIELDNAMES
+
+
+def test_full_tab_rolls_over_and_duplicates_are_skipped():
+    sync = InMemoryPartitionedSync()
+    sync.max_rows_per_tab = 2
+    records = [record(f'Artista {i}', f'2026-03-0{i + 1}T00:00:00') for i in range(3)]
+    
+    summary = sync.sync_stream([records])
+    assert summary['new_records'] == 3
+    assert [entry['sheet_name'] for entry in sync.index] == ['Resultados 2026-03', 'Resultados 2026-03_2']
+    assert [entry['rows'] for entry in sync.index] == [2, 1]
+    
+    summary = sync.sync_stream([records[:2]])
+    assert summary['duplicate_records'] == 2
+    assert summary['new_records'] == 0
@@ -0,0 +1,51 @@
+"""Tests del spool de registros y su escritor único"""
+
+import fcntl
+
+from fake_sheets import InMemorySheetsSync
+from sheets_spool import LOCK_FILENAME, SpoolWriter, pending_spool_files, spool_records
+
+
+def record(artist, timestamp='2026-01-01T10:00:00'):
+    return {'artist_name': artist, 'timestamp': timestamp, 'status': 'Not Found'}
+
+
+def test_empty_batch_leaves_no_file(tmp_path):
+    assert spool_records([], str(tmp_path)) is None
+    assert pending_spool_files(str(tmp_path)) == []
+
+
+def test_drain_publishes_each_record_once_and_clears_the_spool(tmp_path):
+    sync = InMemorySheetsSync()
+    spool_records([record('Uno'), record('Dos')], str(tmp_path))
+    spool_records([record('Dos'), record('Tres')], str(tmp_path))
+    
+    summary = SpoolWriter(sync, directory=str(tmp_path)).drain()
+    
+    assert summary['success']
+    assert summary['spool_files'] == 2
+    assert summary['total_processed'] == 4
+    assert summary['new_records'] == 3
+    assert summary['duplicate_records'] == 1
+    assert len(sync.tabs[sync.sheet_name]) == 4
+    assert pending_spool_files(str(tmp_path)) == []
+
+
+def test_drain_skips_when_another_writer_holds_the_lock(tmp_path):
+    spool_records([record('Uno')], str(tmp_path))
+    with open(tmp_path / LOCK_FILENAME, 'w') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        assert SpoolWriter(InMemorySheetsSync(), directory=str(tmp_path)).drain() is None
+    assert len(pending_spool_files(str(tmp_path))) == 1
+
+
+def test_unreadable_file_is_set_aside(tmp_path):
+    sync = InMemorySheetsSync()
+    spool_records([record('Uno')], str(tmp_path))
+    (tmp_path / 'spool-00000000_000000-0-broken.jsonl').write_text('{no es json\n')
+    
+    summary = SpoolWriter(sync, directory=str(tmp_path)).drain()
+    
+    assert summary['new_records'] == 1
+    assert pending_spool_files(str(tmp_path)) == []
+    assert (tmp_path / 'spool-00000000_000000-0-broken.jsonl.rejected').exists()
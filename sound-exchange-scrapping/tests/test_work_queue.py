@@ -0,0 +1,60 @@
+"""Tests de la cola de trabajo distribuida"""
+
+import pytest
+
+from artist_result import STATUS_OK, STATUS_EMPTY, STATUS_TIMEOUT
+from work_queue import SqliteTaskStore, TaskStore, is_loopback
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SqliteTaskStore(str(tmp_path / 'cola.db'), max_attempts=2)
+    yield store
+    store.close()
+
+
+def test_unknown_status_or_items_are_rejected(store):
+    store.create_job(['Emilia'])
+    claim = store.claim('worker', 10, 60)
+    tasks = [task['task_id'] for task in claim['tasks']]
+    
+    summary = store.complete(claim['lease'], [
+        {'task_id': tasks[0], 'status': 'done'},
+        {'task_id': tasks[1]},
+        {'task_id': tasks[2], 'status': STATUS_OK, 'items': 'Emilia'},
+    ])
+    assert summary['rejected'] == 3
+    assert summary['accepted'] == 0
+    
+    summary = store.complete(claim['lease'], [{'task_id': task, 'status': STATUS_EMPTY, 'items': []} for task in tasks])
+    assert summary['accepted'] == len(tasks)
+
+
+def test_results_are_idempotent_and_failures_requeue(store):
+    store.create_job(['Emilia'])
+    claim = store.claim('worker', 10, 60)
+    first, second = claim['tasks'][0]['task_id'], claim['tasks'][1]['task_id']
+    
+    summary = store.complete(claim['lease'], [
+        {'task_id': first, 'status': STATUS_OK, 'items': ['Emilia']},
+        {'task_id': first, 'status': STATUS_OK, 'items': ['Emilia']},
+        {'task_id': second, 'status': STATUS_TIMEOUT, 'detail': 'timeout'},
+    ])
+    assert summary == {'accepted': 1, 'duplicates': 1, 'requeued': 1, 'rejected': 0}
+
+
+def test_loopback_hosts():
+    assert is_loopback('127.0.0.1')
+    assert is_loopback('localhost')
+    assert is_loopback('::1')
+    assert not is_loopback('0.0.0.0')
+    assert not is_loopback('coordinador.local')
+
+
+def test_incomplete_backend_fails_on_instantiation():
+    class PartialStore(TaskStore):
+        def create_job(self, artists):
+            return {}
+            
+    with pytest.raises(TypeError):
+        PartialStore()
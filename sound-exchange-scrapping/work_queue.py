@@ -0,0 +1,699 @@
+#!/usr/bin/env python3
+"""
+🎵 Work Queue - SoundExchange
+=============================
+
+Cola de trabajo distribuida para repartir auditorías grandes entre varias
+máquinas, cada una con su propia IP, sesión y ritmo de peticiones.
+
+Un coordinador guarda en SQLite una tarea por (artista, categoría). Los
+workers piden tareas en lotes con un lease (token + vencimiento), lo renuevan
+con heartbeats mientras trabajan y devuelven los resultados. La devolución es
+idempotente: un resultado repetido o tardío no duplica nada, y las tareas con
+el lease vencido vuelven a la cola. Cuando las cuatro categorías de un
+artista están resueltas se arma su ArtistResult.
+
+Como cada worker solo habla con el coordinador para pedir y devolver lotes,
+el rendimiento total crece casi linealmente con la cantidad de máquinas.
+
+Uso:
+    python work_queue.py coordinator
+    python work_queue.py enqueue --file artists_list.txt
+    python work_queue.py worker --coordinator http://10.0.0.5:8766 --adaptive
+    python work_queue.py status
+    python work_queue.py export <job_id> --output auditoria.csv
+
+Endpoints del coordinador:
+    POST /claim {"worker": "...", "limit": 8}             Toma tareas con un lease
+    POST /heartbeat {"lease": "..."}                      Renueva un lease
+    POST /complete {"lease": "...", "results": [...]}     Devuelve resultados
+    GET  /jobs/<job_id>                                   Estado de un job
+    GET  /health                                          Estado de la cola
+"""
+
+import os
+import csv
+import json
+import hmac
+import time
+import socket
+import ipaddress
+import sqlite3
+import argparse
+import itertools
+import threading
+import uuid
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import logging
+from typing import List, Dict, Optional, Iterable, Iterator
+from pathlib import Path
+from urllib.parse import urlparse
+
+import requests
+
+from config import SCRAPER_CONFIG, WORK_QUEUE_CONFIG, RETRY_CONFIG, HISTORY_CONFIG
+from artist_result import (ArtistResult, SearchOutcome, CATEGORY_CODES, CSV_FIELDNAMES, FAILED_STATUSES,
+                           STATUS_OK, STATUS_EMPTY)
+from logging_setup import setup_logging
+
+logger = logging.getLogger(__name__)
+
+# Estados de una tarea en la cola
+TASK_PENDING = 'pending'
+TASK_LEASED = 'leased'
+TASK_DONE = 'done'
+
+# Estados que un worker puede devolver para una búsqueda
+RESULT_STATUSES = frozenset((STATUS_OK, STATUS_EMPTY)) | FAILED_STATUSES
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    created TEXT NOT NULL,
+    artists INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    task_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    artist TEXT NOT NULL,
+    category TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    available_at REAL NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_token TEXT,
+    lease_expires REAL,
+    worker TEXT,
+    status TEXT,
+    items TEXT,
+    detail TEXT,
+    completed_at TEXT,
+    UNIQUE (job_id, artist, category)
+);
+CREATE INDEX IF NOT EXISTS tasks_by_state ON tasks (state, available_at, lease_expires);
+CREATE INDEX IF NOT EXISTS tasks_by_job ON tasks (job_id, position);
+"""
+
+
+class TaskStore(ABC):
+    """Interfaz del almacenamiento de la cola; SqliteTaskStore es la implementación por defecto"""
+    
+    @abstractmethod
+    def create_job(self, artists: Iterable[str]) -> Dict:
+        """Crea un job con una tarea por (artista, categoría)"""
+    
+    @abstractmethod
+    def claim(self, worker: str, limit: int, lease_seconds: float) -> Dict:
+        """Entrega tareas disponibles bajo un lease nuevo"""
+    
+    @abstractmethod
+    def heartbeat(self, lease: str, lease_seconds: float) -> int:
+        """Extiende el vencimiento de las tareas abiertas de un lease"""
+    
+    @abstractmethod
+    def complete(self, lease: str, results: List[Dict]) -> Dict:
+        """Registra los resultados de un lease"""
+    
+    @abstractmethod
+    def job_status(self, job_id: str) -> Optional[Dict]:
+        """Retorna el avance de un job"""
+    
+    @abstractmethod
+    def job_results(self, job_id: str) -> Iterator[ArtistResult]:
+        """Recorre los resultados de un job por artista"""
+    
+    @abstractmethod
+    def stats(self) -> Dict:
+        """Retorna el estado de la cola"""
+
+
+class SqliteTaskStore(TaskStore):
+    """Cola durable en SQLite; el coordinador y los comandos locales comparten el archivo"""
+    
+    def __init__(self, path: str = WORK_QUEUE_CONFIG['database'],
+                 max_attempts: int = WORK_QUEUE_CONFIG['max_attempts']):
+        self.path = str(Path(path).expanduser())
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self.max_attempts = max_attempts
+        # Una conexión por store; los hilos del servidor HTTP la usan de a uno
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.executescript(SCHEMA)
+    
+    def _transaction(self):
+        """Abre una transacción de escritura; BEGIN IMMEDIATE evita que dos procesos tomen la misma tarea"""
+        self._db.execute('BEGIN IMMEDIATE')
+    
+    def create_job(self, artists: Iterable[str], chunk_size: int = 1000) -> Dict:
+        """Crea un job con una tarea por (artista, categoría); lee los artistas en streaming"""
+        job_id = uuid.uuid4().hex[:12]
+        created = datetime.now().isoformat()
+        total = 0
+        artists = iter(artists)
+        
+        with self._lock:
+            self._db.execute('INSERT INTO jobs (job_id, created) VALUES (?, ?)', (job_id, created))
+            while True:
+                chunk = list(itertools.islice(artists, chunk_size))
+                if not chunk:
+                    break
+                self._transaction()
+                try:
+                    self._db.executemany(
+                        'INSERT OR IGNORE INTO tasks (job_id, position, artist, category) VALUES (?, ?, ?, ?)',
+                        [(job_id, total + offset, artist, code)
+                         for offset, artist in enumerate(chunk) for code in CATEGORY_CODES]
+                    )
+                    self._db.execute('COMMIT')
+                except Exception:
+                    self._db.execute('ROLLBACK')
+                    raise
+                total += len(chunk)
+            self._db.execute('UPDATE jobs SET artists = ? WHERE job_id = ?', (total, job_id))
+            
+        logger.info(f"📋 Job {job_id}: {total} artistas, {total * len(CATEGORY_CODES)} tareas encoladas")
+        return {'job_id': job_id, 'created': created, 'artists': total}
+    
+    def claim(self, worker: str, limit: int = WORK_QUEUE_CONFIG['claim_batch'],
+              lease_seconds: float = WORK_QUEUE_CONFIG['lease_seconds']) -> Dict:
+        """Entrega hasta `limit` tareas disponibles (pendientes o con lease vencido) bajo un lease nuevo"""
+        now = time.time()
+        lease = uuid.uuid4().hex
+        
+        with self._lock:
+            self._transaction()
+            try:
+                # Las tareas que agotaron sus intentos con el lease vencido se cierran como fallidas
+                self._db.execute(
+                    "UPDATE tasks SET state = ?, status = 'timeout', detail = 'Lease vencido sin resultado', "
+                    "completed_at = ?, lease_token = NULL WHERE state = ? AND lease_expires < ? AND attempts >= ?",
+                    (TASK_DONE, datetime.now().isoformat(), TASK_LEASED, now, self.max_attempts)
+                )
+                # Orden de alta: las categorías de un mismo artista salen juntas y el artista se completa antes
+                rows = self._db.execute(
+                    'SELECT task_id, artist, category, attempts FROM tasks '
+                    'WHERE (state = ? AND available_at <= ?) OR (state = ? AND lease_expires < ?) '
+                    'ORDER BY task_id LIMIT ?',
+                    (TASK_PENDING, now, TASK_LEASED, now, limit)
+                ).fetchall()
+                self._db.executemany(
+                    'UPDATE tasks SET state = ?, lease_token = ?, lease_expires = ?, worker = ?, '
+                    'attempts = attempts + 1 WHERE task_id = ?',
+                    [(TASK_LEASED, lease, now + lease_seconds, worker, row[0]) for row in rows]
+                )
+                self._db.execute('COMMIT')
+            except Exception:
+                self._db.execute('ROLLBACK')
+                raise
+            remaining = self._db.execute('SELECT COUNT(*) FROM tasks WHERE state != ?', (TASK_DONE,)).fetchone()[0]
+            
+        if rows:
+            logger.info(f"📤 {len(rows)} tareas entregadas a {worker}")
+        return {
+            'lease': lease if rows else None,
+            'lease_seconds': lease_seconds,
+            'tasks': [{'task_id': task_id, 'artist': artist, 'category': category, 'attempt': attempts + 1}
+                      for task_id, artist, category, attempts in rows],
+            'remaining': remaining
+        }
+    
+    def heartbeat(self, lease: str, lease_seconds: float = WORK_QUEUE_CONFIG['lease_seconds']) -> int:
+        """Extiende el vencimiento de las tareas aún abiertas de un lease; retorna cuántas se extendieron"""
+        with self._lock:
+            cursor = self._db.execute(
+                'UPDATE tasks SET lease_expires = ? WHERE lease_token = ? AND state = ?',
+                (time.time() + lease_seconds, lease, TASK_LEASED)
+            )
+            return cursor.rowcount
+    
+    def complete(self, lease: str, results: List[Dict]) -> Dict:
+        """Registra resultados de forma idempotente: gana el primer resultado válido de cada tarea"""
+        summary = {'accepted': 0, 'duplicates': 0, 'requeued': 0, 'rejected': 0}
+        completed_at = datetime.now().isoformat()
+        
+        with self._lock:
+            self._transaction()
+            try:
+                for result in results:
+                    row = self._db.execute('SELECT state, lease_token, attempts FROM tasks WHERE task_id = ?',
+                                           (result['task_id'],)).fetchone()
+                    if row is None:
+                        summary['rejected'] += 1
+                        continue
+                    state, current_lease, attempts = row
+                    
+                    if state == TASK_DONE:
+                        summary['duplicates'] += 1
+                        continue
+                        
+                    status = result.get('status')
+                    if status not in RESULT_STATUSES or not isinstance(result.get('items', []), list):
+                        # Un estado desconocido no puede cerrar la tarea como resultado válido
+                        summary['rejected'] += 1
+                        
+                    elif status not in FAILED_STATUSES:
+                        # Un resultado válido se acepta aunque el lease haya vencido: la búsqueda ya se hizo
+                        self._db.execute(
+                            'UPDATE tasks SET state = ?, status = ?, items = ?, detail = ?, completed_at = ?, '
+                            'lease_token = NULL WHERE task_id = ?',
+                            (TASK_DONE, status, json.dumps(result.get('items', []), ensure_ascii=False),
+                             result.get('detail', ''), completed_at, result['task_id'])
+                        )
+                        summary['accepted'] += 1
+                        
+                    elif current_lease != lease or state != TASK_LEASED:
+                        # Un fallo de un lease que ya no es el vigente no debe pisar al nuevo dueño
+                        summary['rejected'] += 1
+                        
+                    elif attempts < self.max_attempts:
+                        backoff = min(RETRY_CONFIG['backoff_base'] * 2 ** (attempts - 1), RETRY_CONFIG['backoff_max'])
+                        self._db.execute(
+                            'UPDATE tasks SET state = ?, available_at = ?, status = ?, detail = ?, '
+                            'lease_token = NULL WHERE task_id = ?',
+                            (TASK_PENDING, time.time() + backoff, status, result.get('detail', ''), result['task_id'])
+                        )
+                        summary['requeued'] += 1
+                        
+                    else:
+                        self._db.execute(
+                            "UPDATE tasks SET state = ?, status = ?, items = '[]', detail = ?, completed_at = ?, "
+                            'lease_token = NULL WHERE task_id = ?',
+                            (TASK_DONE, status, result.get('detail', ''), completed_at, result['task_id'])
+                        )
+                        summary['accepted'] += 1
+                self._db.execute('COMMIT')
+            except Exception:
+                self._db.execute('ROLLBACK')
+                raise
+                
+        return summary
+    
+    def job_status(self, job_id: str) -> Optional[Dict]:
+        """Retorna el avance de un job: tareas por estado y artistas completos"""
+        with self._lock:
+            job = self._db.execute('SELECT created, artists FROM jobs WHERE job_id = ?', (job_id,)).fetchone()
+            if job is None:
+                return None
+            states = dict(self._db.execute('SELECT state, COUNT(*) FROM tasks WHERE job_id = ? GROUP BY state',
+                                           (job_id,)).fetchall())
+            failed = self._db.execute(
+                f"SELECT COUNT(*) FROM tasks WHERE job_id = ? AND state = ? "
+                f"AND status IN ({','.join('?' * len(FAILED_STATUSES))})",
+                (job_id, TASK_DONE, *FAILED_STATUSES)
+            ).fetchone()[0]
+            completed_artists = self._db.execute(
+                'SELECT COUNT(*) FROM (SELECT position FROM tasks WHERE job_id = ? GROUP BY position '
+                'HAVING SUM(state = ?) = ?)',
+                (job_id, TASK_DONE, len(CATEGORY_CODES))
+            ).fetchone()[0]
+            
+        created, artists = job
+        return {
+            'job_id': job_id,
+            'created': created,
+            'status': 'done' if completed_artists == artists else 'running',
+            'artists': artists,
+            'completed_artists': completed_artists,
+            'tasks': {state: states.get(state, 0) for state in (TASK_PENDING, TASK_LEASED, TASK_DONE)},
+            'failed_tasks': failed
+        }
+    
+    def job_results(self, job_id: str) -> Iterator[ArtistResult]:
+        """Arma el ArtistResult de cada artista con todas sus categorías resueltas, en orden de alta"""
+        with self._lock:
+            rows = self._db.execute(
+                'SELECT position, artist, category, state, status, items, detail, completed_at '
+                'FROM tasks WHERE job_id = ? ORDER BY position',
+                (job_id,)
+            ).fetchall()
+            
+        for _, group in itertools.groupby(rows, key=lambda row: row[0]):
+            group = list(group)
+            if any(row[3] != TASK_DONE for row in group):
+                continue
+            outcomes = {category: SearchOutcome(status, json.loads(items or '[]'), detail or '')
+                        for _, _, category, _, status, items, detail, _ in group}
+            yield ArtistResult.from_outcomes(group[0][1], outcomes, timestamp=max(row[7] for row in group))
+    
+    def stats(self) -> Dict:
+        """Retorna el estado global de la cola"""
+        with self._lock:
+            states = dict(self._db.execute('SELECT state, COUNT(*) FROM tasks GROUP BY state').fetchall())
+            expired = self._db.execute('SELECT COUNT(*) FROM tasks WHERE state = ? AND lease_expires < ?',
+                                       (TASK_LEASED, time.time())).fetchone()[0]
+            workers = self._db.execute('SELECT COUNT(DISTINCT worker) FROM tasks WHERE state = ?',
+                                       (TASK_LEASED,)).fetchone()[0]
+            jobs = [row[0] for row in self._db.execute('SELECT job_id FROM jobs ORDER BY created').fetchall()]
+        return {
+            'jobs': jobs,
+            'tasks': {state: states.get(state, 0) for state in (TASK_PENDING, TASK_LEASED, TASK_DONE)},
+            'expired_leases': expired,
+            'active_workers': workers
+        }
+    
+    def close(self):
+        self._db.close()
+
+
+def is_loopback(host: str) -> bool:
+    """True si el host solo es accesible desde la misma máquina"""
+    if host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+class CoordinatorRequestHandler(BaseHTTPRequestHandler):
+    """Handler HTTP del coordinador"""
+    
+    store: TaskStore = None
+    lease_seconds: float = WORK_QUEUE_CONFIG['lease_seconds']
+    auth_token: Optional[str] = WORK_QUEUE_CONFIG['auth_token']
+    
+    def _send_json(self, status: int, payload: Dict):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def _authorized(self) -> bool:
+        if self.auth_token and not hmac.compare_digest(self.headers.get('X-Queue-Token', ''), self.auth_token):
+            self._send_json(401, {'error': 'Token inválido'})
+            return False
+        return True
+    
+    def do_GET(self):
+        if not self._authorized():
+            return
+        path = urlparse(self.path).path
+        
+        if path == '/health':
+            self._send_json(200, self.store.stats())
+            
+        elif path.startswith('/jobs/'):
+            status = self.store.job_status(path[len('/jobs/'):])
+            if status is None:
+                self._send_json(404, {'error': 'Job no encontrado'})
+            else:
+                self._send_json(200, status)
+                
+        else:
+            self._send_json(404, {'error': 'Ruta no encontrada'})
+    
+    def do_POST(self):
+        if not self._authorized():
+            return
+        path = urlparse(self.path).path
+        
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            payload = json.loads(self.rfile.read(length) or b'{}')
+            if not isinstance(payload, dict):
+                raise ValueError('El cuerpo debe ser un objeto JSON')
+                
+            if path == '/claim':
+                worker = str(payload.get('worker') or self.address_string())
+                limit = max(1, min(int(payload.get('limit', WORK_QUEUE_CONFIG['claim_batch'])), 100))
+                self._send_json(200, self.store.claim(worker, limit, self.lease_seconds))
+                
+            elif path == '/heartbeat':
+                extended = self.store.heartbeat(str(payload['lease']), self.lease_seconds)
+                self._send_json(200, {'extended': extended})
+                
+            elif path == '/complete':
+                results = payload.get('results')
+                if not isinstance(results, list):
+                    raise ValueError("'results' debe ser una lista")
+                self._send_json(200, self.store.complete(str(payload.get('lease', '')), results))
+                
+            else:
+                self._send_json(404, {'error': 'Ruta no encontrada'})
+                
+        except (ValueError, KeyError, TypeError) as e:
+            self._send_json(400, {'error': str(e)})
+    
+    def log_message(self, format, *args):
+        logger.debug(f"🌐 {self.address_string()} - {format % args}")
+
+
+class QueueWorker:
+    """Worker que toma tareas del coordinador y las busca con su propia sesión y ritmo"""
+    
+    def __init__(self, coordinator_url: str, worker_id: Optional[str] = None,
+                 batch_size: int = WORK_QUEUE_CONFIG['claim_batch'], headless: bool = True,
+                 delay: float = 2.0, adaptive: bool = False, variants: bool = False,
+                 auth_token: Optional[str] = WORK_QUEUE_CONFIG['auth_token']):
+        from batch_artist_scraper import BatchArtistScraper
+        
+        self.coordinator_url = coordinator_url.rstrip('/')
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.batch_size = batch_size
+        self.scraper = BatchArtistScraper(headless=headless, delay=delay, adaptive=adaptive, variants=variants)
+        self.session_started = 0.0
+        self.client = requests.Session()
+        if auth_token:
+            self.client.headers['X-Queue-Token'] = auth_token
+        self.stats = {'tasks': 0, 'failed': 0, 'duplicates': 0, 'lost_leases': 0}
+    
+    def _post(self, path: str, payload: Dict) -> Dict:
+        response = self.client.post(f"{self.coordinator_url}{path}", json=payload, timeout=30)
+        response.raise_for_status()
+        return response.json()
+    
+    def ensure_session(self) -> bool:
+        """Crea o renueva la sesión propia del worker si la cookie Cloudflare está vencida"""
+        if self.scraper.session and time.monotonic() - self.session_started < WORK_QUEUE_CONFIG['cookie_ttl']:
+            return True
+        if not self.scraper.setup_session():
+            return False
+        self.session_started = time.monotonic()
+        return True
+    
+    def _heartbeat(self, lease: str, stop: threading.Event):
+        """Renueva el lease periódicamente hasta que el lote termine"""
+        while not stop.wait(WORK_QUEUE_CONFIG['heartbeat_interval']):
+            try:
+                if not self._post('/heartbeat', {'lease': lease})['extended']:
+                    self.stats['lost_leases'] += 1
+                    logger.warning(f"⚠️ El lease {lease[:8]} ya no está vigente; los resultados pueden llegar duplicados")
+            except requests.RequestException as e:
+                logger.warning(f"⚠️ No se pudo renovar el lease {lease[:8]}: {e}")
+    
+    def _search(self, task: Dict) -> Dict:
+        """Busca una tarea; es la misma búsqueda por categoría que usan los reintentos del lote"""
+        outcome = self.scraper.retry_category(task['artist'], task['category'])
+        if not self.scraper.controller:
+            time.sleep(self.scraper.delay)  # Pausa entre búsquedas
+        return {'task_id': task['task_id'], 'status': outcome.status, 'items': outcome.items, 'detail': outcome.detail}
+    
+    def _submit(self, lease: str, results: List[Dict]):
+        """Devuelve los resultados; si el coordinador no responde, reintenta antes de que venza el lease"""
+        for attempt in range(1, RETRY_CONFIG['max_retries'] + 1):
+            try:
+                summary = self._post('/complete', {'lease': lease, 'results': results})
+                self.stats['duplicates'] += summary['duplicates']
+                return
+            except requests.RequestException as e:
+                logger.warning(f"⚠️ No se pudieron entregar los resultados (intento {attempt}): {e}")
+                time.sleep(min(RETRY_CONFIG['backoff_base'] * 2 ** (attempt - 1), RETRY_CONFIG['backoff_max']))
+        logger.error(f"❌ Resultados del lease {lease[:8]} sin entregar; las tareas volverán a la cola al vencer el lease")
+    
+    def process_batch(self, claim: Dict):
+        """Busca un lote de tareas manteniendo vivo su lease"""
+        tasks = claim['tasks']
+        stop = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(claim['lease'], stop), daemon=True)
+        heartbeat.start()
+        
+        try:
+            if self.scraper.controller:
+                # El controlador adaptativo limita la concurrencia real de este worker
+                with ThreadPoolExecutor(max_workers=self.scraper.controller.max_concurrency) as executor:
+                    results = list(executor.map(self._search, tasks))
+            else:
+                results = [self._search(task) for task in tasks]
+        finally:
+            stop.set()
+            heartbeat.join()
+            
+        self.stats['tasks'] += len(results)
+        self.stats['failed'] += sum(1 for result in results if result['status'] in FAILED_STATUSES)
+        self._submit(claim['lease'], results)
+    
+    def run(self, exit_when_empty: bool = False):
+        """Pide y procesa lotes hasta que se interrumpa (o hasta vaciar la cola con exit_when_empty)"""
+        logger.info(f"👷 Worker {self.worker_id} conectado a {self.coordinator_url}")
+        
+        while True:
+            try:
+                claim = self._post('/claim', {'worker': self.worker_id, 'limit': self.batch_size})
+            except requests.RequestException as e:
+                logger.warning(f"⚠️ Coordinador no disponible: {e}")
+                time.sleep(WORK_QUEUE_CONFIG['poll_interval'])
+                continue
+                
+            if not claim['tasks']:
+                if exit_when_empty and not claim['remaining']:
+                    break
+                time.sleep(WORK_QUEUE_CONFIG['poll_interval'])
+                continue
+                
+            if not self.ensure_session():
+                # Sin sesión las búsquedas fallarían; el lease vence y otro worker toma las tareas
+                logger.error("❌ No se pudo configurar la sesión; reintentando más tarde")
+                time.sleep(WORK_QUEUE_CONFIG['poll_interval'])
+                continue
+                
+            self.process_batch(claim)
+            
+        logger.info(f"📊 Worker {self.worker_id}: {self.stats}")
+        if self.scraper.controller:
+            logger.info(f"📈 Control adaptativo: {self.scraper.controller.metrics()}")
+        logger.info(f"🌐 Transporte: {self.scraper.transport_stats.summary()}")
+
+
+def export_job(store: TaskStore, job_id: str, filename: str) -> int:
+    """Escribe en CSV los artistas completos de un job; retorna cuántos se exportaron"""
+    count = 0
+    with open(Path(filename).expanduser(), 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=CSV_FIELDNAMES)
+        writer.writeheader()
+        for result in store.job_results(job_id):
+            writer.writerow(result)
+            count += 1
+    return count
+
+
+def main():
+    """Función principal"""
+    parser = argparse.ArgumentParser(
+        description="Cola de trabajo distribuida para búsquedas en varias máquinas",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Ejemplos de uso:
+  python work_queue.py coordinator --port 8766
+  python work_queue.py --token secreto coordinator --host 0.0.0.0
+  python work_queue.py enqueue --file catalogo.csv --column artist_name
+  python work_queue.py worker --coordinator http://10.0.0.5:8766 --adaptive
+  python work_queue.py worker --coordinator http://10.0.0.5:8766 --exit-when-empty
+  python work_queue.py status
+  python work_queue.py export 3f2a9c1b7d4e --output auditoria.csv --history
+        """
+    )
+    
+    parser.add_argument('--db', type=str, default=WORK_QUEUE_CONFIG['database'], help='Base SQLite de la cola')
+    parser.add_argument('--token', type=str, default=WORK_QUEUE_CONFIG['auth_token'],
+                        help='Token compartido entre coordinador y workers')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    coordinator_parser = subparsers.add_parser('coordinator', help='Servir la cola a los workers')
+    coordinator_parser.add_argument('--host', type=str, default=WORK_QUEUE_CONFIG['host'], help='Host donde escuchar')
+    coordinator_parser.add_argument('--port', type=int, default=WORK_QUEUE_CONFIG['port'], help='Puerto donde escuchar')
+    coordinator_parser.add_argument('--lease-seconds', type=float, default=WORK_QUEUE_CONFIG['lease_seconds'],
+                                    help='Duración de cada lease en segundos')
+                                    
+    enqueue_parser = subparsers.add_parser('enqueue', help='Crear un job con una lista de artistas')
+    enqueue_parser.add_argument('--artists', type=str, help='Lista de artistas separados por comas')
+    enqueue_parser.add_argument('--file', type=str,
+                                help="Archivo de texto, '-' para la entrada estándar, o catálogo CSV/Parquet")
+    enqueue_parser.add_argument('--column', type=str, help='Columna con los artistas en catálogos CSV/Parquet')
+    
+    worker_parser = subparsers.add_parser('worker', help='Procesar tareas de un coordinador')
+    worker_parser.add_argument('--coordinator', type=str, required=True, help='URL del coordinador')
+    worker_parser.add_argument('--worker-id', type=str, help='Identificador del worker (default: host-pid)')
+    worker_parser.add_argument('--batch-size', type=int, default=WORK_QUEUE_CONFIG['claim_batch'],
+                               help='Tareas por pedido')
+    worker_parser.add_argument('--delay', type=float, default=SCRAPER_CONFIG['delay_between_searches'],
+                               help='Delay entre búsquedas en segundos')
+    worker_parser.add_argument('--headless', action='store_true', default=SCRAPER_CONFIG['headless_mode'],
+                               help='Ejecutar en modo headless')
+    worker_parser.add_argument('--adaptive', action='store_true',
+                               help='Ajustar concurrencia y delay automáticamente según la respuesta de SoundExchange')
+    worker_parser.add_argument('--variants', action='store_true', help='Buscar también variantes del nombre')
+    worker_parser.add_argument('--exit-when-empty', action='store_true',
+                               help='Terminar cuando no queden tareas pendientes')
+    
+    subparsers.add_parser('status', help='Mostrar el estado de la cola y sus jobs')
+    
+    export_parser = subparsers.add_parser('export', help='Exportar los artistas completos de un job')
+    export_parser.add_argument('job_id', help='Identificador del job')
+    export_parser.add_argument('--output', type=str, help='Archivo CSV de salida')
+    export_parser.add_argument('--history', action='store_true', help='Agregar también los resultados al historial')
+    
+    args = parser.parse_args()
+    setup_logging('work_queue.log')
+    
+    if args.command == 'worker':
+        worker = QueueWorker(args.coordinator, args.worker_id, args.batch_size, args.headless,
+                             args.delay, args.adaptive, args.variants, args.token)
+        try:
+            worker.run(exit_when_empty=args.exit_when_empty)
+        except KeyboardInterrupt:
+            print(f"\n⏹️ Worker detenido por el usuario; las tareas en curso volverán a la cola al vencer su lease")
+        return
+        
+    store = SqliteTaskStore(args.db)
+    
+    if args.command == 'coordinator':
+        # Expuesto en la red sin token, cualquiera podría tomar tareas o enviar resultados
+        if not args.token and not is_loopback(args.host):
+            store.close()
+            parser.error(f"Para escuchar en {args.host} hace falta --token (o WORK_QUEUE_CONFIG['auth_token'])")
+        CoordinatorRequestHandler.store = store
+        CoordinatorRequestHandler.lease_seconds = args.lease_seconds
+        CoordinatorRequestHandler.auth_token = args.token
+        server = ThreadingHTTPServer((args.host, args.port), CoordinatorRequestHandler)
+        logger.info(f"🚀 Coordinador escuchando en http://{args.host}:{args.port} ({args.db})")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print(f"\n⏹️ Coordinador detenido por el usuario")
+        finally:
+            server.server_close()
+            store.close()
+            
+    elif args.command == 'enqueue':
+        from artist_input import iter_artist_source, unique_artists
+        
+        if args.artists:
+            artists = [artist.strip() for artist in args.artists.split(',') if artist.strip()]
+        elif args.file:
+            artists = iter_artist_source(args.file, args.column)
+        else:
+            enqueue_parser.error('Debes indicar --artists o --file')
+        job = store.create_job(unique_artists(artists))
+        print(f"✅ Job {job['job_id']}: {job['artists']} artistas encolados")
+        
+    elif args.command == 'status':
+        stats = store.stats()
+        print(f"📋 Tareas: {stats['tasks']} ({stats['expired_leases']} leases vencidos, "
+              f"{stats['active_workers']} workers activos)")
+        for job_id in stats['jobs']:
+            job = store.job_status(job_id)
+            print(f"  • {job_id}: {job['completed_artists']}/{job['artists']} artistas, "
+                  f"{job['failed_tasks']} tareas fallidas ({job['status']})")
+    
+    else:
+        job = store.job_status(args.job_id)
+        if job is None:
+            print(f"❌ Job {args.job_id} no encontrado")
+            return
+        filename = args.output or str(Path.home() / "Downloads" / f"soundexchange_queue_{args.job_id}.csv")
+        count = export_job(store, args.job_id, filename)
+        print(f"💾 {count} de {job['artists']} artistas exportados: {filename}")
+        if args.history and HISTORY_CONFIG['enabled']:
+            from result_history import append_history
+            append_history(store.job_results(args.job_id), HISTORY_CONFIG['directory'])
+            print(f"🗄️ Historial: {HISTORY_CONFIG['directory']}")
+
+
+if __name__ == "__main__":
+    main()